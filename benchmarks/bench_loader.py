@@ -0,0 +1,120 @@
+"""
+Benchmark: the parallel chunked CSV loader against RailwayNetwork.load_from_csv.
+
+A synthetic network (see benchmarks.synthetic_network) is written with
+extra parallel connections and some broken rows mixed in, as real
+exports have. It is then loaded with load_from_csv and with
+network_loader.load_edges at each worker count. Every load runs in a
+fresh process, so peak memory (max RSS, including the load's own
+workers) is that of the load alone.
+
+Reported per loader: seconds, rows per second, peak memory, and the
+connections kept and rows rejected.
+
+Run from the repository root:
+    python -m benchmarks.bench_loader [--stations 100000] [--workers 1,2,4] [--duplicates 0.2]
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks.synthetic_network import generate_connections
+from src import network_loader
+from src.railway_network import RailwayNetwork
+
+# Broken rows mixed in, per 10,000 rows
+BAD_ROWS_PER_10K = 5
+
+
+def write_noisy_csv(filename, stations, duplicates, seed):
+    """Write a synthetic network with parallel connections and broken rows. Returns the row count."""
+    rng = random.Random(seed)
+    rows = generate_connections(stations, seed)
+
+    # Parallel connections, some listed in the opposite direction
+    for station1, station2, cost, time in rng.sample(rows, int(len(rows) * duplicates)):
+        if rng.random() < 0.5:
+            station1, station2 = station2, station1
+        rows.append((station1, station2, max(1, cost + rng.randint(-3, 3)), max(1, time + rng.randint(-3, 3))))
+    rng.shuffle(rows)
+
+    bad_rows = [['Station A', 'Station B', 'free', '10'], ['Station A', 'Station B', '5'],
+                ['', 'Station B', '5', '10'], ['Station A', 'Station A', '5', '10']]
+    for _ in range(len(rows) * BAD_ROWS_PER_10K // 10000):
+        rows.insert(rng.randrange(len(rows)), rng.choice(bad_rows))
+
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['station1', 'station2', 'cost', 'time'])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def measure(loader, filename, workers, chunk_size, results):
+    """Run one load in this process and send its measurements back."""
+    started = time.perf_counter()
+    if loader == 'load_from_csv':
+        network = RailwayNetwork()
+        network.load_from_csv(filename)
+        elapsed = time.perf_counter() - started
+        rows = sum(1 for _ in open(filename))
+        result = {'connections': network.connection_count(), 'rejected': None}
+    else:
+        edges, report = network_loader.load_edges(filename, workers, chunk_size)
+        elapsed = time.perf_counter() - started
+        rows = report.rows
+        result = {'connections': len(edges), 'rejected': report.error_count, 'merged': report.merged}
+
+    result.update(seconds=elapsed, rows_per_second=rows / elapsed,
+                  peak_memory_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                  + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    results.send(result)
+
+
+def run_isolated(loader, filename, workers, chunk_size):
+    """Run measure() in a fresh process. Returns its measurements."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=measure, args=(loader, filename, workers, chunk_size, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def main():
+    """Run the loader benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Network CSV loader benchmark")
+    parser.add_argument('--stations', type=int, default=100000)
+    parser.add_argument('--workers', default='1,2,4', help="comma-separated worker counts")
+    parser.add_argument('--duplicates', type=float, default=0.2,
+                        help="extra parallel connections, as a share of the connections")
+    parser.add_argument('--chunk-mb', type=float, default=network_loader.CHUNK_SIZE / (1 << 20),
+                        help="CSV chunk size per task, in MB")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    chunk_size = int(args.chunk_mb * (1 << 20))
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, f"noisy_{args.stations}.csv")
+        rows = write_noisy_csv(filename, args.stations, args.duplicates, args.seed)
+        print(f" {rows} rows, {os.path.getsize(filename) / (1 << 20):.1f} MB, "
+              f"{os.cpu_count()} CPUs\n")
+
+        runs = [('load_from_csv', None)] + [('load_edges', int(workers)) for workers in args.workers.split(',')]
+        for loader, workers in runs:
+            result = run_isolated(loader, filename, workers, chunk_size)
+            name = loader if workers is None else f"{loader} ({workers} workers)"
+            print(f" • {name:>26}: {result['seconds']:6.2f}s, {result['rows_per_second']:>10,.0f} rows/s, "
+                  f"peak {result['peak_memory_kb'] / 1024:7.1f} MB, {result['connections']} connections"
+                  + (f", {result['merged']} merged, {result['rejected']} rejected"
+                     if result['rejected'] is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
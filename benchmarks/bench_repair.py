@@ -0,0 +1,129 @@
+"""
+Benchmark: incremental search-tree repair against full recomputation.
+
+Builds complete shortest path trees from a set of origins, then applies
+random closures, reopenings and fare/time changes. After each change the
+retained trees are repaired in place and, separately, rebuilt from
+scratch, and both timings are reported. Repaired trees are checked
+against the rebuilt ones.
+
+Partially settled trees, as RouteSearcher keeps between queries, are
+repaired alongside. After some changes, so that others pile up between
+queries, each of them is queried for a random station and resumed only
+as far as that needs, and the answer is checked against a fresh search.
+
+Run from the repository root:
+    python -m benchmarks.bench_repair [--csv railway_network.csv] [--origins 20] [--changes 200]
+"""
+import argparse
+import random
+import time
+
+from src.railway_network import RailwayNetwork
+from src.search_tree import SearchTree
+
+# Share of changes after which a partially settled tree is not queried
+SKIPPED_QUERY_SHARE = 0.6
+
+
+def settled_distances(tree):
+    """Return {station: distance} for the settled stations of a tree."""
+    return {station: tree.distances[station] for station in tree.settled}
+
+
+def random_change(network, rng, connections, stations):
+    """Apply one random closure, reopening, reweighting or new connection. Returns the stations changed."""
+    station1, station2 = rng.choice(connections)
+    choice = rng.random()
+
+    if choice < 0.4 and network.closed:
+        station1, station2 = rng.choice(sorted(network.closed))
+        network.reopen_connection(station1, station2)
+    elif choice < 0.4:
+        network.close_connection(station1, station2)
+    elif choice < 0.6:
+        network.update_connection(station1, station2, cost=rng.randint(1, 30))
+    elif choice < 0.8:
+        network.update_connection(station1, station2, time=rng.randint(1, 30))
+    else:
+        # A new connection, often a shortcut, to a random station
+        station2 = rng.choice([station for station in stations if station != station1])
+        network.add_connection(station1, station2, rng.randint(1, 30), rng.randint(1, 30))
+
+    return station1, station2
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Incremental repair benchmark")
+    parser.add_argument('--csv', default='railway_network.csv')
+    parser.add_argument('--origins', type=int, default=20)
+    parser.add_argument('--changes', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    network = RailwayNetwork()
+    network.load_from_csv(args.csv)
+
+    stations = sorted(network.stations)
+    connections = sorted({tuple(sorted((station, neighbor)))
+                          for station in stations for neighbor, _, _ in network.get_neighbors(station)})
+
+    # Complete and partially settled trees for every origin and metric
+    trees = []
+    partial_trees = []
+    for origin in rng.sample(stations, min(args.origins, len(stations))):
+        for metric in ('cost', 'time'):
+            tree = SearchTree(network, origin, metric)
+            tree.settle(None)
+            trees.append(tree)
+
+            tree = SearchTree(network, origin, metric)
+            tree.settle(rng.choice(stations))
+            partial_trees.append(tree)
+
+    repair_time = 0.0
+    rebuild_time = 0.0
+
+    for _ in range(args.changes):
+        change_station1, change_station2 = random_change(network, rng, connections, stations)
+
+        started = time.perf_counter()
+        for tree in trees:
+            tree.repair(change_station1, change_station2)
+            tree.settle(None)
+        repair_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        rebuilt = []
+        for tree in trees:
+            fresh = SearchTree(network, tree.origin, tree.optimize_for)
+            fresh.settle(None)
+            rebuilt.append(fresh)
+        rebuild_time += time.perf_counter() - started
+
+        for tree, fresh in zip(trees, rebuilt):
+            assert settled_distances(tree) == settled_distances(fresh), "repaired tree differs from rebuilt tree"
+
+        for tree, fresh in zip(partial_trees, rebuilt):
+            tree.repair(change_station1, change_station2)
+
+            # Often several changes pile up between two queries
+            if rng.random() < SKIPPED_QUERY_SHARE:
+                continue
+            target = rng.choice(stations)
+            tree.settle(target)
+            assert tree.distances.get(target) == fresh.distances.get(target), \
+                "repaired partial tree differs from a fresh search"
+
+    per_change = len(trees)
+    print(f"\n{len(trees)} complete and {len(partial_trees)} partial trees, "
+          f"{args.changes} changes ({len(stations)} stations)")
+    print(f" • Repair:  {repair_time / args.changes / per_change * 1e6:10.1f} µs per tree per change")
+    print(f" • Rebuild: {rebuild_time / args.changes / per_change * 1e6:10.1f} µs per tree per change")
+    print(f" • Speed-up: {rebuild_time / repair_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
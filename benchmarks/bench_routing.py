@@ -0,0 +1,262 @@
+"""
+Benchmark: RouteSearcher.find_route on synthetic networks of growing size.
+
+For each network size a rail-like network is generated (see
+benchmarks.synthetic_network), written to a temporary CSV and loaded the
+way the programs load it. Every selected algorithm then answers the
+same query workloads:
+
+    random   uniformly random origin/destination pairs
+    skewed   a few hundred popular pairs between busy junctions, drawn
+             with Zipf-like frequencies
+    bursts   runs of queries sharing one origin, as from a departure board
+
+Reported per (size, algorithm, workload): queries per second, latency
+percentiles, mean connections explored and peak traced memory of the
+searches; per (size, algorithm): preprocessing time (landmark tables for
+'astar', the contraction hierarchy for 'ch', hub labels for 'hl'). Results are written as
+JSON with stable ordering so runs can be diffed, and a previous result
+file can be given with --baseline to print the changes.
+
+Run from the repository root:
+    python -m benchmarks.bench_routing [--sizes 1000,10000] [--queries 200] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Unix only; without it peak memory is reported as null
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from benchmarks.synthetic_network import write_network_csv
+from src.contraction_hierarchy import ContractionHierarchy
+from src.hub_labels import HubLabels
+from src.landmarks import LandmarkIndex
+from src.railway_network import RailwayNetwork
+from src.route_cache import RouteCache
+from src.route_searcher import RouteSearcher
+
+ALGORITHMS = ['dijkstra', 'bidirectional', 'astar', 'ch', 'hl']
+WORKLOADS = ['random', 'skewed', 'bursts']
+
+# Number of popular pairs in the skewed workload, and queries per burst
+POPULAR_PAIRS = 200
+BURST_SIZE = 20
+
+# Queries replayed under tracemalloc to measure search memory
+MEMORY_SAMPLE = 20
+
+
+def make_workload(kind, network, count, rng):
+    """Return count (start, end) queries of the given kind."""
+    stations = sorted(network.stations)
+
+    if kind == 'random':
+        return [tuple(rng.sample(stations, 2)) for _ in range(count)]
+
+    if kind == 'skewed':
+        # Busy junctions are the best-connected stations
+        busy = sorted(stations, key=lambda station: (-len(network.get_neighbors(station)), station))
+        busy = busy[:max(2, len(stations) // 100)]
+        pairs = [tuple(rng.sample(busy, 2)) for _ in range(POPULAR_PAIRS)]
+        weights = [1 / rank ** 1.1 for rank in range(1, len(pairs) + 1)]
+        return rng.choices(pairs, weights, k=count)
+
+    if kind == 'bursts':
+        queries = []
+        while len(queries) < count:
+            origin = rng.choice(stations)
+            for _ in range(min(BURST_SIZE, count - len(queries))):
+                queries.append((origin, rng.choice(stations)))
+        return queries
+
+    raise ValueError(f"Unknown workload '{kind}'")
+
+
+def percentile(sorted_values, p):
+    """Return the p-th quantile (0-1) of an ascending list."""
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def run_queries(searcher, queries, algorithm, optimize_for):
+    """Answer queries one by one. Returns (latencies, connections explored)."""
+    latencies = []
+    explored = 0
+    for start, end in queries:
+        started = time.perf_counter()
+        _, _, _, connections_explored = searcher.find_route(start, end, optimize_for, algorithm)
+        latencies.append(time.perf_counter() - started)
+        explored += connections_explored
+    return latencies, explored
+
+
+def preprocess(searcher, network, algorithm, optimize_for, landmarks):
+    """Build what an algorithm needs before answering queries. Returns seconds taken."""
+    started = time.perf_counter()
+    if algorithm == 'astar':
+        searcher.use_landmarks(LandmarkIndex.build(network, landmarks))
+    elif algorithm == 'ch':
+        searcher.use_hierarchy(ContractionHierarchy.build(network, optimize_for))
+    elif algorithm == 'hl':
+        searcher.use_hub_labels(HubLabels.build(network, optimize_for))
+    return time.perf_counter() - started
+
+
+def benchmark_size(stations, args, rng):
+    """Run every algorithm and workload on one generated network. Returns result dicts."""
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, f"synthetic_{stations}.csv")
+
+        started = time.perf_counter()
+        write_network_csv(csv_path, stations, args.seed)
+        generate_s = time.perf_counter() - started
+
+        network = RailwayNetwork()
+        started = time.perf_counter()
+        network.load_from_csv(csv_path)
+        load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    network.compile()
+    compile_s = time.perf_counter() - started
+
+    workloads = {kind: make_workload(kind, network, args.queries, rng) for kind in args.workloads}
+    size = {
+        'stations': len(network.stations),
+        'connections': network.connection_count(),
+        'generate_s': round(generate_s, 3),
+        'load_s': round(load_s, 3),
+        'compile_s': round(compile_s, 3),
+    }
+
+    results = []
+    for algorithm in args.algorithms:
+        searcher = RouteSearcher(network, cache=RouteCache(args.cache) if args.cache else None,
+                                 max_trees=args.trees, queue=args.queue)
+        preprocess_s = preprocess(searcher, network, algorithm, args.optimize, args.landmarks)
+        print(f" {stations} stations, {algorithm}: preprocessing {preprocess_s:.2f}s")
+
+        for kind, queries in workloads.items():
+            # Each workload starts from empty caches and trees
+            if searcher.cache is not None:
+                searcher.cache.clear()
+            searcher.trees.clear()
+
+            latencies, explored = run_queries(searcher, queries, algorithm, args.optimize)
+            elapsed = sum(latencies)
+            latencies.sort()
+
+            # Replay a sample under tracemalloc for the searches' peak memory
+            if searcher.cache is not None:
+                searcher.cache.clear()
+            searcher.trees.clear()
+            tracemalloc.start()
+            run_queries(searcher, queries[:MEMORY_SAMPLE], algorithm, args.optimize)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results.append(dict(size, **{
+                'algorithm': algorithm,
+                'workload': kind,
+                'optimize': args.optimize,
+                'queue': args.queue,
+                'queries': len(queries),
+                'preprocess_s': round(preprocess_s, 3),
+                'qps': round(len(queries) / elapsed, 1) if elapsed else None,
+                'latency_ms': {name: round(percentile(latencies, p) * 1000, 3)
+                               for name, p in (('p50', 0.50), ('p90', 0.90), ('p99', 0.99), ('max', 1.0))},
+                'mean_explored': round(explored / len(queries), 1),
+                'peak_search_kb': round(peak / 1024, 1),
+            }))
+            print(f"   {kind:>8}: {results[-1]['qps']} q/s, p99 {results[-1]['latency_ms']['p99']} ms")
+
+    return results
+
+
+def result_key(result):
+    """Return the identity of a result row across runs."""
+    return result['stations'], result['algorithm'], result['workload'], result['optimize']
+
+
+def compare(baseline, results):
+    """Print queries-per-second and p99 changes against a baseline result file."""
+    previous = {result_key(result): result for result in baseline['results']}
+
+    print("\nChanges against baseline (q/s, p99 latency):")
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or not old['qps'] or not result['qps']:
+            continue
+        qps_change = (result['qps'] / old['qps'] - 1) * 100
+        p99_change = (result['latency_ms']['p99'] / old['latency_ms']['p99'] - 1) * 100 \
+            if old['latency_ms']['p99'] else 0.0
+        stations, algorithm, workload, _ = result_key(result)
+        print(f" • {stations:>8} {algorithm:>13} {workload:>8}: "
+              f"q/s {qps_change:+6.1f}%, p99 {p99_change:+6.1f}%")
+
+
+def main():
+    """Run the benchmark suite and write the JSON results."""
+    parser = argparse.ArgumentParser(description="Routing benchmark on synthetic networks")
+    parser.add_argument('--sizes', default='1000,10000',
+                        help="comma-separated station counts, e.g. 1000,10000,100000,1000000")
+    parser.add_argument('--algorithms', default=','.join(ALGORITHMS))
+    parser.add_argument('--workloads', default=','.join(WORKLOADS))
+    parser.add_argument('--queries', type=int, default=200, help="queries per workload")
+    parser.add_argument('--optimize', choices=['cost', 'time'], default='cost')
+    parser.add_argument('--landmarks', type=int, default=8, help="landmarks for 'astar'")
+    parser.add_argument('--cache', type=int, default=0, help="RouteCache size (0: no cache)")
+    parser.add_argument('--trees', type=int, default=0, help="retained search trees (max_trees)")
+    parser.add_argument('--queue', choices=['auto', 'heap', 'dial', 'radix'], default='auto',
+                        help="priority queue of Dijkstra searches")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    parser.add_argument('--baseline', help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    args.algorithms = args.algorithms.split(',')
+    args.workloads = args.workloads.split(',')
+    for name in args.algorithms:
+        if name not in ALGORITHMS:
+            parser.error(f"unknown algorithm '{name}'")
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload '{name}'")
+
+    results = []
+    for stations in (int(size) for size in args.sizes.split(',')):
+        # Same queries for every run with the same seed and size
+        results.extend(benchmark_size(stations, args, random.Random(f"{args.seed}-{stations}")))
+
+    report = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None,
+        'results': results,
+    }
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+        print(f"\n Results written to '{args.output}'")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark: worker processes sharing one network against each holding a copy.
+
+A synthetic network (see benchmarks.synthetic_network) is written to a
+CSV and searched by RouteSearcher process pools that get their network
+in one of three ways:
+
+    copy      the network is sent whole and unpickled into a dict graph
+    snapshot  each worker maps the compiled snapshot next to the CSV
+    shared    each worker attaches to one SharedNetwork segment
+
+Every worker reports its memory once it has the network, then answers
+the same random queries and reports again; searching touches more of
+the graph and adds the searcher's own state. Each mode runs in a fresh
+process, so workers do not inherit another mode's network.
+
+Reported per mode: pool start-up time, the mean seconds a worker took
+to load or attach the network, and mean memory per worker before and
+after the queries: proportional (shared pages divided among the
+processes mapping them) and private to the worker.
+
+Run from the repository root:
+    python -m benchmarks.bench_shared [--stations 100000] [--workers 4] [--queries 20]
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic_network import write_network_csv
+from src.railway_network import RailwayNetwork
+from src.route_searcher import RouteSearcher, route_in_worker, worker_status
+from src.shared_network import SharedNetwork
+
+# Seconds each worker holds on to its task, so every worker gets one
+HOLD_TIME = 0.5
+
+
+def search_and_report(queries):
+    """Worker task: return this worker's pid and its worker_status() before and after running the queries."""
+    before = worker_status()
+    for start, end in queries:
+        route_in_worker(start, end)
+    after = worker_status()
+    time.sleep(HOLD_TIME)
+    return os.getpid(), (before, after)
+
+
+def run_mode(mode, filename, workers, queries, results):
+    """Start a pool for one mode, collect one status per worker and send back (start-up seconds, statuses)."""
+    network = RailwayNetwork()
+    if mode == 'snapshot':
+        network.load_with_snapshot(filename)
+    else:
+        network.load_from_csv(filename)
+    if mode == 'copy':
+        # Networks without a source file are sent to the workers whole
+        network.source_file = None
+
+    searcher = RouteSearcher(network)
+    shared = SharedNetwork.publish(network) if mode == 'shared' else None
+
+    try:
+        started = time.perf_counter()
+        with searcher.create_pool(workers, shared) as pool:
+            statuses = {}
+            while len(statuses) < workers:
+                futures = [pool.submit(search_and_report, queries) for _ in range(workers)]
+                for future in futures:
+                    pid, status = future.result()
+                    # A worker's first report is the one taken before any search
+                    statuses.setdefault(pid, status)
+            startup = time.perf_counter() - started
+    finally:
+        if shared is not None:
+            shared.release()
+
+    results.send((startup, list(statuses.values())))
+
+
+def run_isolated(mode, filename, workers, queries):
+    """Run run_mode() in a fresh process. Returns its measurements."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_mode, args=(mode, filename, workers, queries, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def build_snapshot(filename):
+    """Write the network snapshot next to the CSV, so no mode pays for it."""
+    RailwayNetwork().load_with_snapshot(filename)
+
+
+def mean(values):
+    """Return the mean of values, or None if any is unknown."""
+    values = list(values)
+    return None if None in values else sum(values) / len(values)
+
+
+def format_memory(statuses):
+    """Return the mean pss and private memory of worker statuses as text."""
+    pss = mean(status['pss'] for status in statuses)
+    private = mean(status['private'] for status in statuses)
+    if pss is None:
+        rss = mean(status['rss'] for status in statuses)
+        return "memory n/a" if rss is None else f"peak rss {rss / 1024:6.1f} MB"
+    return f"pss {pss / 1024:6.1f} MB (private {private / 1024:6.1f} MB)"
+
+
+def main():
+    """Run the shared network benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Shared memory network benchmark")
+    parser.add_argument('--stations', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--queries', type=int, default=20, help="random queries per worker task")
+    parser.add_argument('--modes', default='copy,snapshot,shared', help="comma-separated modes")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, f"synthetic_{args.stations}.csv")
+        connections = write_network_csv(filename, args.stations, args.seed)
+
+        process = multiprocessing.Process(target=build_snapshot, args=(filename,))
+        process.start()
+        process.join()
+
+        with open(filename, newline='') as file:
+            stations = sorted({station for row in list(csv.reader(file))[1:] for station in row[:2]})
+        queries = [tuple(rng.sample(stations, 2)) for _ in range(args.queries)]
+        print(f" {len(stations)} stations, {connections} connections, {args.workers} workers, "
+              f"{os.cpu_count()} CPUs\n")
+
+        for mode in args.modes.split(','):
+            startup, statuses = run_isolated(mode, filename, args.workers, queries)
+            before = [status[0] for status in statuses]
+            after = [status[1] for status in statuses]
+            print(f" • {mode:>8}: start-up {startup - HOLD_TIME:6.2f}s, "
+                  f"load {mean(status['load_time'] for status in before):6.3f}s per worker, "
+                  f"loaded {format_memory(before)}, after queries {format_memory(after)}")
+
+
+if __name__ == "__main__":
+    main()
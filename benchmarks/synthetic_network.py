@@ -0,0 +1,204 @@
+"""
+Deterministic generator of rail-like networks for benchmarks.
+
+Stations are scattered over a square map, most of them clustered around
+towns and a few in open country. Each station is linked to its nearest
+neighbours (usually two, sometimes one or several, like through stations,
+termini and junctions), town centres are linked by longer inter-city
+lines, and any pieces left over are joined to their nearest neighbour so
+the network is connected. Journey time follows distance at a line speed
+plus a short stop, and fares follow distance at a varying rate per km.
+
+The same (stations, seed) always gives the same network.
+
+Run from the repository root to write a CSV:
+    python -m benchmarks.synthetic_network 100000 synthetic_100k.csv [--seed 1]
+"""
+import argparse
+import csv
+import math
+import random
+
+# Average map area per station (km²), and the share of stations around towns
+AREA_PER_STATION = 400.0
+TOWN_SHARE = 0.75
+
+# Stations per town, and the spread of a town around its centre (km)
+STATIONS_PER_TOWN = 150
+TOWN_RADIUS = 25.0
+
+# Probabilities of linking a station to its 1, 2, 3 or 4 nearest neighbours
+NEIGHBOUR_WEIGHTS = (0.4, 0.45, 0.1, 0.05)
+
+# Inter-city lines from each town centre
+INTERCITY_LINKS = 3
+
+# Stations of a disconnected piece tried when joining it to the rest
+JOIN_CANDIDATES = 8
+
+
+def station_name(index):
+    """Return the name of the index-th generated station."""
+    return f"Station {index:07d}"
+
+
+class _Grid:
+    """Uniform grid of station positions for nearest-neighbour lookups."""
+
+    def __init__(self, positions, cell):
+        """Bucket positions into square cells of the given size."""
+        self.positions = positions
+        self.cell = cell
+        self.cells = {}
+        for index, (x, y) in enumerate(positions):
+            self.cells.setdefault((int(x // cell), int(y // cell)), []).append(index)
+        columns = [key[0] for key in self.cells]
+        rows = [key[1] for key in self.cells]
+        self.max_radius = max(max(columns) - min(columns), max(rows) - min(rows)) + 1
+
+    def nearest(self, index, count, accept=None):
+        """
+        Return up to count stations nearest to station index, closest first.
+
+        accept, if given, filters the candidates.
+        """
+        x, y = self.positions[index]
+        cx, cy = int(x // self.cell), int(y // self.cell)
+        found = []
+
+        for radius in range(self.max_radius + 1):
+            # Visit the ring of cells at this Chebyshev distance
+            for gx in range(cx - radius, cx + radius + 1):
+                for gy in (range(cy - radius, cy + radius + 1) if gx in (cx - radius, cx + radius)
+                           else (cy - radius, cy + radius)):
+                    for other in self.cells.get((gx, gy), ()):
+                        if other != index and (accept is None or accept(other)):
+                            ox, oy = self.positions[other]
+                            found.append((math.hypot(ox - x, oy - y), other))
+
+            # Anything outside the rings seen so far is at least this far away
+            if len(found) >= count:
+                found.sort()
+                if found[count - 1][0] <= radius * self.cell:
+                    return [other for _, other in found[:count]]
+
+        found.sort()
+        return [other for _, other in found[:count]]
+
+
+def _find(parents, index):
+    """Return the root of index in a union-find forest, halving the path."""
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def generate_connections(stations, seed=1):
+    """
+    Generate a connected rail-like network.
+
+    Returns a sorted list of (station1, station2, cost, time) rows, one per
+    connection, with station1 < station2.
+    """
+    rng = random.Random(seed)
+    side = math.sqrt(stations * AREA_PER_STATION)
+
+    # Place towns, then stations around them or in open country
+    towns = [(rng.uniform(0, side), rng.uniform(0, side))
+             for _ in range(max(1, stations // STATIONS_PER_TOWN))]
+    positions = []
+    for index in range(stations):
+        if index < len(towns):
+            positions.append(towns[index])
+        elif rng.random() < TOWN_SHARE:
+            tx, ty = rng.choice(towns)
+            positions.append((min(side, max(0.0, rng.gauss(tx, TOWN_RADIUS))),
+                              min(side, max(0.0, rng.gauss(ty, TOWN_RADIUS)))))
+        else:
+            positions.append((rng.uniform(0, side), rng.uniform(0, side)))
+
+    grid = _Grid(positions, math.sqrt(AREA_PER_STATION))
+    edges = set()
+
+    # Local lines: link every station to a few of its nearest neighbours
+    for index in range(stations):
+        count = rng.choices(range(1, len(NEIGHBOUR_WEIGHTS) + 1), NEIGHBOUR_WEIGHTS)[0]
+        for other in grid.nearest(index, count):
+            edges.add((min(index, other), max(index, other)))
+
+    # Inter-city lines between nearby town centres (stations 0 .. towns-1)
+    if len(towns) > 1:
+        town_grid = _Grid(towns, side / math.sqrt(len(towns)))
+        for index in range(len(towns)):
+            for other in town_grid.nearest(index, min(INTERCITY_LINKS, len(towns) - 1)):
+                edges.add((min(index, other), max(index, other)))
+
+    # Join each disconnected piece to the nearest station in another piece,
+    # looking from a few of its stations
+    parents = list(range(stations))
+    for a, b in edges:
+        parents[_find(parents, a)] = _find(parents, b)
+
+    while True:
+        pieces = {}
+        for index in range(stations):
+            pieces.setdefault(_find(parents, index), []).append(index)
+        if len(pieces) <= 1:
+            break
+
+        largest = max(pieces.values(), key=len)
+        for members in pieces.values():
+            if members is largest:
+                continue
+            root = _find(parents, members[0])
+            best = None
+            for member in members[:JOIN_CANDIDATES]:
+                nearest = grid.nearest(member, 1, lambda other: _find(parents, other) != root)
+                if nearest:
+                    x, y = positions[member]
+                    ox, oy = positions[nearest[0]]
+                    distance = math.hypot(ox - x, oy - y)
+                    if best is None or distance < best[0]:
+                        best = (distance, member, nearest[0])
+            _, a, b = best
+            edges.add((min(a, b), max(a, b)))
+            parents[_find(parents, a)] = _find(parents, b)
+
+    # Weights: track is longer than the straight line; inter-city lines are faster
+    rows = []
+    for a, b in sorted(edges):
+        (ax, ay), (bx, by) = positions[a], positions[b]
+        track = math.hypot(bx - ax, by - ay) * rng.uniform(1.1, 1.4)
+        speed = 140 if a < len(towns) and b < len(towns) else rng.choice((60, 80, 100))
+        time = max(1, round(track / speed * 60 + rng.uniform(1, 3)))
+        cost = max(1, round(track * rng.uniform(0.12, 0.3) + 2))
+        rows.append((station_name(a), station_name(b), cost, time))
+
+    return rows
+
+
+def write_network_csv(filename, stations, seed=1):
+    """Write a generated network in the railway_network.csv format. Returns the row count."""
+    rows = generate_connections(stations, seed)
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['station1', 'station2', 'cost', 'time'])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def main():
+    """Write a synthetic network CSV."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic rail network CSV")
+    parser.add_argument('stations', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    count = write_network_csv(args.output, args.stations, args.seed)
+    print(f" Wrote {args.stations} stations, {count} connections to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,44 @@ Finds optimal train routes using Dijkstra's shortest path algorithm
 with a graphical user interface.
 """
 import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import difflib
 from src.railway_network import RailwayNetwork
-from src.route_searcher import RouteSearcher
+from src.route_searcher import RouteSearcher, SearchCancelled
+from src.landmarks import LandmarkIndex
+from src.station_resolver import StationResolver
 
 class TrainSearchGUI:
-    def __init__(self, root, network, searcher):
+    # Milliseconds between checks for a finished background search
+    POLL_INTERVAL = 50
+    
+    # Milliseconds of typing pause before station suggestions are refreshed
+    COMPLETION_DELAY = 150
+    
+    # Most stations shown in a combobox drop-down while typing
+    COMPLETION_LIMIT = 100
+    
+    def __init__(self, root, network, searcher, resolver=None):
         self.root = root
         self.network = network
         self.searcher = searcher
-        self.all_stations = sorted(list(self.network.stations))
+        self.resolver = resolver or StationResolver(self.network.stations)
+        self.all_stations = self.resolver.names
+        
+        # Background search state: its thread, cancel flag and result hand-off
+        self.search_thread = None
+        self.cancel_event = None
+        self.search_results = queue.Queue()
+        
+        # Pending debounced suggestion refreshes, by combobox
+        self.completion_jobs = {}
         
         self.root.title("Train Ticket Search System")
-        self.root.geometry("700x650")
+        self.root.geometry("700x680")
         self.root.resizable(False, False)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         self.setup_ui()
     
@@ -64,6 +86,7 @@ class TrainSearchGUI:
             font=("Arial", 10)
         )
         self.departure_combo.grid(row=0, column=1, pady=5, padx=(10, 0))
+        self.departure_combo.bind("<KeyRelease>", self.schedule_completion)
         
         # Destination station
         tk.Label(input_frame, text="Destination Station:", font=("Arial", 10)).grid(row=1, column=0, sticky=tk.W, pady=5)
@@ -76,6 +99,7 @@ class TrainSearchGUI:
             font=("Arial", 10)
         )
         self.destination_combo.grid(row=1, column=1, pady=5, padx=(10, 0))
+        self.destination_combo.bind("<KeyRelease>", self.schedule_completion)
         
         # Optimization type
         tk.Label(input_frame, text="Optimize for:", font=("Arial", 10)).grid(row=2, column=0, sticky=tk.W, pady=5)
@@ -97,11 +121,22 @@ class TrainSearchGUI:
             variable=self.optimize_var,
             value="time",
             font=("Arial", 9)
+        ).pack(side=tk.LEFT, padx=(0, 15))
+        
+        tk.Radiobutton(
+            optimize_frame,
+            text="All Trade-offs",
+            variable=self.optimize_var,
+            value="pareto",
+            font=("Arial", 9)
         ).pack(side=tk.LEFT)
         
-        # Search button
-        search_btn = tk.Button(
-            main_frame,
+        # Search and cancel buttons
+        search_frame = tk.Frame(main_frame)
+        search_frame.pack(pady=(0, 5))
+        
+        self.search_btn = tk.Button(
+            search_frame,
             text="SEARCH ROUTE",
             command=self.search_route,
             bg="#27ae60",
@@ -111,7 +146,27 @@ class TrainSearchGUI:
             pady=10,
             cursor="hand2"
         )
-        search_btn.pack(pady=(0, 15))
+        self.search_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = tk.Button(
+            search_frame,
+            text="Cancel",
+            command=self.cancel_search,
+            bg="#c0392b",
+            fg="white",
+            font=("Arial", 11, "bold"),
+            padx=15,
+            pady=10,
+            state=tk.DISABLED,
+            cursor="hand2"
+        )
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Progress indicator shown while a search runs
+        self.progress = ttk.Progressbar(main_frame, mode="indeterminate", length=300)
+        self.progress.pack(pady=(0, 2))
+        self.status_var = tk.StringVar()
+        tk.Label(main_frame, textvariable=self.status_var, font=("Arial", 8), fg="#666").pack(pady=(0, 8))
         
         # Results frame
         results_frame = tk.LabelFrame(main_frame, text="Route Results", font=("Arial", 10, "bold"), padx=15, pady=15)
@@ -159,7 +214,7 @@ class TrainSearchGUI:
         clear_btn.pack(side=tk.LEFT, padx=5)
         
         # Network info at bottom
-        info_text = f"Network loaded: {len(self.network.stations)} stations, {sum(len(neighbors) for neighbors in self.network.graph.values()) // 2} connections"
+        info_text = f"Network loaded: {len(self.network.stations)} stations, {self.network.connection_count()} connections"
         info_bottom = tk.Label(
             self.root,
             text=info_text,
@@ -169,27 +224,47 @@ class TrainSearchGUI:
         )
         info_bottom.pack(side=tk.BOTTOM, fill=tk.X)
     
+    def schedule_completion(self, event):
+        """Refresh a combobox's suggestions once the user pauses typing."""
+        # Keys that move through the list rather than edit the text
+        if event.keysym in ("Up", "Down", "Return", "Tab", "Escape"):
+            return
+        
+        combo = event.widget
+        job = self.completion_jobs.pop(combo, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        self.completion_jobs[combo] = self.root.after(
+            self.COMPLETION_DELAY, lambda: self.update_completions(combo)
+        )
+    
+    def update_completions(self, combo):
+        """Narrow a combobox's drop-down list to the stations matching its text."""
+        self.completion_jobs.pop(combo, None)
+        text = combo.get().strip()
+        
+        if not text:
+            combo['values'] = self.all_stations
+            return
+        
+        # Stations starting with the text, else close matches for a typo
+        matches = self.resolver.complete(text, limit=self.COMPLETION_LIMIT)
+        if not matches:
+            matches = self.resolver.suggest(text, n=10, cutoff=0.6)
+        combo['values'] = matches
+    
     def validate_station(self, station_input):
         """Validate and correct station name with fuzzy matching."""
         if not station_input:
             return None
         
-        # Exact match
-        if self.network.station_exists(station_input):
-            return station_input
-        
-        # Case-insensitive match
-        for s in self.all_stations:
-            if s.lower() == station_input.lower():
-                return s
+        # Exact or case-insensitive match
+        station = self.resolver.resolve(station_input)
+        if station is not None:
+            return station
         
         # Fuzzy matching
-        matches = difflib.get_close_matches(
-            station_input,
-            self.all_stations,
-            n=3,
-            cutoff=0.6
-        )
+        matches = self.resolver.suggest(station_input, n=3, cutoff=0.6)
         
         if matches:
             result = messagebox.askquestion(
@@ -228,10 +303,71 @@ class TrainSearchGUI:
         
         optimize_for = self.optimize_var.get()
         
-        # Search for route
-        path, total_cost, total_time, connections_explored = self.searcher.find_route(
-            departure, destination, optimize_for
-        )
+        # Run the search on a background thread so the window stays responsive
+        self.start_search(departure, destination, optimize_for)
+    
+    def start_search(self, departure, destination, optimize_for):
+        """Start a search on a worker thread and show progress until it reports back."""
+        if self.search_thread is not None:
+            return
+        
+        cancel_event = threading.Event()
+        self.cancel_event = cancel_event
+        
+        def run():
+            try:
+                # Search for every cost/time trade-off
+                if optimize_for == 'pareto':
+                    result = self.searcher.find_pareto_routes(departure, destination, cancel=cancel_event)
+                else:
+                    result = self.searcher.find_route(
+                        departure, destination, optimize_for, algorithm='astar', cancel=cancel_event
+                    )
+                self.search_results.put(('done', optimize_for, result))
+            except SearchCancelled:
+                self.search_results.put(('cancelled', optimize_for, None))
+            except Exception as e:
+                self.search_results.put(('error', optimize_for, e))
+        
+        self.search_thread = threading.Thread(target=run, daemon=True)
+        self.search_thread.start()
+        
+        self.search_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.status_var.set(f"Searching {departure} → {destination}...")
+        self.progress.start(10)
+        
+        self.root.after(self.POLL_INTERVAL, self.poll_search)
+    
+    def poll_search(self):
+        """Check for the background search's result; keep polling until it arrives."""
+        try:
+            outcome, optimize_for, result = self.search_results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.POLL_INTERVAL, self.poll_search)
+            return
+        
+        self.finish_search()
+        
+        if outcome == 'cancelled':
+            self.status_var.set("Search cancelled.")
+            return
+        if outcome == 'error':
+            messagebox.showerror("Error", f"Search failed: {result}")
+            return
+        
+        if optimize_for == 'pareto':
+            routes, connections_explored = result
+            
+            if not routes:
+                messagebox.showwarning("No Route", "No route found between these stations!")
+                self.clear_results()
+                return
+            
+            self.display_pareto_routes(routes, connections_explored)
+            return
+        
+        path, total_cost, total_time, connections_explored = result
         
         if path is None:
             messagebox.showwarning("No Route", "No route found between these stations!")
@@ -241,6 +377,26 @@ class TrainSearchGUI:
         # Display results
         self.display_route(path, total_cost, total_time, optimize_for, connections_explored)
     
+    def finish_search(self):
+        """Return the controls to their idle state after a search ends."""
+        self.search_thread = None
+        self.cancel_event = None
+        self.progress.stop()
+        self.status_var.set("")
+        self.search_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+    
+    def cancel_search(self):
+        """Ask the running search to stop at its next step."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.status_var.set("Cancelling...")
+    
+    def close(self):
+        """Stop any running search and close the window."""
+        self.cancel_search()
+        self.root.destroy()
+    
     def display_route(self, path, total_cost, total_time, optimize_for, connections_explored):
         """Display route in results text area."""
         self.results_text.config(state=tk.NORMAL)
@@ -279,6 +435,36 @@ class TrainSearchGUI:
         # Store current route for saving
         self.current_route = "\n".join(output)
     
+    def display_pareto_routes(self, routes, connections_explored):
+        """Display every route on the cost/time trade-off front."""
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        
+        output = []
+        output.append("=" * 70)
+        output.append("ROUTE OPTIONS FOUND".center(70))
+        output.append("=" * 70)
+        output.append("")
+        output.append(f"{len(routes)} route(s) where no other is both cheaper and faster")
+        
+        for number, (path, total_cost, total_time) in enumerate(routes, 1):
+            output.append("")
+            output.append(f"Option {number}: £{total_cost}, "
+                          f"{total_time} minutes ({total_time // 60}h {total_time % 60}m), "
+                          f"{len(path)} stations")
+            output.append("-" * 70)
+            output.append(" " + " → ".join(path))
+        
+        output.append("")
+        output.append(f" • Connections Explored: {connections_explored}")
+        output.append("=" * 70)
+        
+        self.results_text.insert(1.0, "\n".join(output))
+        self.results_text.config(state=tk.DISABLED)
+        
+        # Store current routes for saving
+        self.current_route = "\n".join(output)
+    
     def save_route(self):
         """Save current route to file."""
         if not hasattr(self, 'current_route'):
@@ -313,15 +499,21 @@ def main():
     base_dir = os.path.dirname(__file__)
     csv_path = os.path.join(base_dir, "railway_network.csv")
     
-    # Load CSV
-    network.load_from_csv(csv_path)
+    # Load the compiled snapshot, or the CSV if it has changed
+    network.load_with_snapshot(csv_path)
     
     # Create route searcher
     searcher = RouteSearcher(network)
+
+    # Load (or build once and save) the landmark tables used by A* search
+    searcher.use_landmarks(LandmarkIndex.load_or_build(network))
+    
+    # Index station names once for lookups and type-ahead
+    resolver = StationResolver(network.stations)
     
     # Create and run GUI
     root = tk.Tk()
-    app = TrainSearchGUI(root, network, searcher)
+    app = TrainSearchGUI(root, network, searcher, resolver)
     root.mainloop()
 
 
@@ -0,0 +1,277 @@
+"""
+Train Ticket Search System (Task 1.3) - HTTP Service Version
+
+Serves optimal train routes over HTTP using asyncio. The railway network
+is loaded once, searches run in a pool of worker processes, and identical
+requests that arrive together share a single search.
+
+Endpoints:
+    GET /route?from=<station>&to=<station>&optimize=<cost|time>
+    GET /distance?from=<station>&to=<station>&optimize=<cost|time>
+    GET /stats
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+from src.railway_network import RailwayNetwork
+from src.route_searcher import RouteSearcher, distance_in_worker, route_in_worker
+from src.landmarks import LandmarkIndex
+from src.hub_labels import HubLabels
+
+
+class RoutingService:
+    """
+    Asyncio HTTP front end for a RouteSearcher.
+    """
+    # Number of recent request latencies kept for the percentiles
+    LATENCY_WINDOW = 10000
+
+    # Largest request body read (and discarded); larger ones close the connection
+    MAX_BODY = 1 << 20
+
+    def __init__(self, network, searcher, workers=None, algorithm='astar'):
+        """Initialize with a loaded network, its searcher and the worker count."""
+        self.network = network
+        self.searcher = searcher
+        self.algorithm = algorithm
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+        self.server = None
+
+        # In-flight searches by (task, from, to, optimize, ...), shared by identical requests
+        self.in_flight = {}
+
+        # Statistics
+        self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.requests = 0
+        self.searches = 0
+        self.coalesced = 0
+        self.queue_depth = 0
+        self.started = time.monotonic()
+
+    async def start(self, host, port):
+        """Start the worker pool and the HTTP server."""
+        self.pool = self.searcher.create_pool(self.workers)
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    def close(self):
+        """Stop the server and the worker pool."""
+        if self.server is not None:
+            self.server.close()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, with keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                # Read headers until the blank line
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    await self.send(writer, 400, {'error': 'Malformed request line'}, keep_alive=False)
+                    break
+
+                method, target, version = parts
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                # No endpoint takes a body, but it must be consumed to find the next request
+                if 'transfer-encoding' in headers:
+                    await self.send(writer, 400, {'error': 'Chunked request bodies are not supported'},
+                                    keep_alive=False)
+                    break
+                length = headers.get('content-length', '0')
+                if not length.isdigit() or int(length) > self.MAX_BODY:
+                    await self.send(writer, 400, {'error': 'Invalid or too large Content-Length'}, keep_alive=False)
+                    break
+                await reader.readexactly(int(length))
+
+                started = time.perf_counter()
+                status, body = await self.dispatch(method, target)
+                self.latencies.append(time.perf_counter() - started)
+                self.requests += 1
+
+                await self.send(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, keep_alive):
+        """Write a JSON response."""
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+        payload = json.dumps(body).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {reasons.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+    async def dispatch(self, method, target):
+        """Route a request to its handler. Returns (status, body)."""
+        if method != 'GET':
+            return 405, {'error': 'Only GET is supported'}
+
+        url = urlsplit(target)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == '/route':
+            return await self.route(params)
+        if url.path == '/distance':
+            return await self.distance(params)
+        if url.path == '/stats':
+            return 200, self.stats()
+        return 404, {'error': f"Unknown path '{url.path}'"}
+
+    def parse_query(self, params):
+        """Read and check from, to and optimize. Returns (start, end, optimize_for, error)."""
+        start = params.get('from', '').strip()
+        end = params.get('to', '').strip()
+        optimize_for = params.get('optimize', 'cost')
+
+        if optimize_for not in ['cost', 'time']:
+            return start, end, optimize_for, (400, {'error': "optimize must be 'cost' or 'time'"})
+        for station in (start, end):
+            if not self.network.station_exists(station):
+                return start, end, optimize_for, (400, {'error': f"Station '{station}' not found in network"})
+
+        return start, end, optimize_for, None
+
+    async def route(self, params):
+        """Handle /route?from=&to=&optimize=."""
+        start, end, optimize_for, error = self.parse_query(params)
+        if error is not None:
+            return error
+
+        path, total_cost, total_time, connections_explored = await self.search(
+            route_in_worker, start, end, optimize_for, self.algorithm)
+
+        if path is None:
+            return 404, {'error': 'No route found between these stations'}
+
+        return 200, {
+            'from': start,
+            'to': end,
+            'optimize': optimize_for,
+            'path': path,
+            'total_cost': total_cost,
+            'total_time': total_time,
+            'connections_explored': connections_explored,
+        }
+
+    async def distance(self, params):
+        """Handle /distance?from=&to=&optimize=, from the hub labels if the workers have them."""
+        start, end, optimize_for, error = self.parse_query(params)
+        if error is not None:
+            return error
+
+        total = await self.search(distance_in_worker, start, end, optimize_for)
+        if total is None:
+            return 404, {'error': 'No route found between these stations'}
+
+        return 200, {'from': start, 'to': end, 'optimize': optimize_for, 'total': total}
+
+    async def search(self, task, *args):
+        """Run a worker task in the pool, sharing it with identical concurrent requests."""
+        key = (task.__name__,) + args
+
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, task, *args)
+        self.in_flight[key] = future
+        self.searches += 1
+        self.queue_depth += 1
+
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.queue_depth -= 1
+            self.in_flight.pop(key, None)
+
+    def stats(self):
+        """Return request counts, latency percentiles and queue depth."""
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            'requests': self.requests,
+            'searches': self.searches,
+            'coalesced': self.coalesced,
+            'queue_depth': self.queue_depth,
+            'workers': self.workers,
+            'latency_ms': {'p50': percentile(0.50), 'p99': percentile(0.99)},
+            'uptime_s': round(time.monotonic() - self.started, 1),
+        }
+
+
+async def serve(host, port, workers):
+    """Load the network once and serve until interrupted."""
+    print("Loading railway network...")
+
+    network = RailwayNetwork()
+    base_dir = os.path.dirname(__file__)
+    csv_path = os.path.join(base_dir, "railway_network.csv")
+    network.load_with_snapshot(csv_path)
+
+    searcher = RouteSearcher(network)
+    searcher.use_landmarks(LandmarkIndex.load_or_build(network))
+
+    # Hub labels answer /distance without searching
+    for metric in ('cost', 'time'):
+        searcher.use_hub_labels(HubLabels.load_or_build(network, metric))
+
+    service = RoutingService(network, searcher, workers)
+    server = await service.start(host, port)
+    print(f" Serving routes on http://{host}:{port}/route with {service.workers} workers")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    """Parse command line options and start the routing service."""
+    parser = argparse.ArgumentParser(description="Train route HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        print("\n Service stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ and provides a console-based and Tkinter user interface.
 import os
 from src.railway_network import RailwayNetwork
 from src.route_searcher import RouteSearcher
+from src.landmarks import LandmarkIndex
+from src.station_resolver import StationResolver
+from src.timetable import Timetable
+from src.connection_scan import ConnectionScanRouter
 from src.user_interface import UserInterface
 
 def main():
@@ -20,14 +24,27 @@ def main():
     base_dir = os.path.dirname(__file__)
     csv_path = os.path.join(base_dir, "railway_network.csv")
 
-    # Load CSV
-    network.load_from_csv(csv_path)
+    # Load the compiled snapshot, or the CSV if it has changed
+    network.load_with_snapshot(csv_path)
 
     # Create route searcher
     searcher = RouteSearcher(network)
 
+    # Load (or build once and save) the landmark tables used by A* search
+    searcher.use_landmarks(LandmarkIndex.load_or_build(network))
+
+    # Index station names once for console lookups
+    resolver = StationResolver(network.stations)
+
+    # Departure-time searches need real timed connections, so they are
+    # only offered when timetable.csv is present
+    timetable_path = os.path.join(base_dir, "timetable.csv")
+    router = None
+    if os.path.exists(timetable_path):
+        router = ConnectionScanRouter(Timetable.load_csv(timetable_path))
+
     # Run user interface
-    ui = UserInterface(network, searcher)
+    ui = UserInterface(network, searcher, resolver, router)
     ui.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+# src/compact_graph.py
+
+from array import array
+
+class CompactGraph:
+    """
+    Integer-indexed CSR (compressed sparse row) form of a railway network.
+
+    Station names are interned to dense integers in sorted order, so
+    comparing two indices gives the same result as comparing the names.
+    The connections of station i are stored in the slice
+    offsets[i]:offsets[i + 1] of the targets, costs and times arrays.
+    """
+    def __init__(self, names, offsets, targets, costs, times):
+        """
+        Initialize from a name table and the four CSR arrays.
+        """
+
+        # Index -> station name, and station name -> index
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+
+        # Packed adjacency arrays
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.times = times
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a compact graph from a {station: [(neighbor, cost, time), ...]} dict.
+        """
+        names = sorted(graph)
+        index = {name: i for i, name in enumerate(names)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        costs = array('i')
+        times = array('i')
+
+        # Keep each adjacency list in its original order so searches
+        # relax edges in the same sequence as on the dict graph
+        for name in names:
+            for neighbor, cost, time in graph[name]:
+                targets.append(index[neighbor])
+                costs.append(cost)
+                times.append(time)
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, costs, times)
+
+    def __len__(self):
+        """
+        Return the number of stations.
+        """
+        return len(self.names)
+
+    def edge_count(self):
+        """
+        Return the number of directed edges (twice the number of connections).
+        """
+        return len(self.targets)
+
+    def weights(self, optimize_for):
+        """
+        Return the weight array for 'cost' or 'time'.
+        """
+        return self.costs if optimize_for == 'cost' else self.times
+
+    def get_neighbors(self, station):
+        """
+        Return a list of (neighbor, cost, time) tuples, like RailwayNetwork.get_neighbors.
+        """
+        i = self.index.get(station)
+        if i is None:
+            return []
+
+        names = self.names
+        return [(names[self.targets[e]], self.costs[e], self.times[e])
+                for e in range(self.offsets[i], self.offsets[i + 1])]
+
+    def neighbor_indices(self, i):
+        """
+        Return (neighbor index, cost, time) for the connections of station index i.
+
+        Read straight from the packed arrays, without looking up any names.
+        """
+        first, last = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[first:last], self.costs[first:last], self.times[first:last])
+
+    def to_graph(self):
+        """
+        Expand back into a {station: [(neighbor, cost, time), ...]} dict.
+        """
+        return {name: self.get_neighbors(name) for name in self.names}
+
+    def nbytes(self):
+        """
+        Return the approximate memory used by the packed adjacency arrays.
+        """
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.targets, self.costs, self.times))
@@ -0,0 +1,249 @@
+# src/connection_scan.py
+
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# One train ridden without changing: its stops from boarding to alighting
+Leg = namedtuple('Leg', ['trip', 'stations', 'departure', 'arrival', 'cost'])
+
+
+class Journey:
+    """
+    A timetabled route: the legs ridden, in order.
+    """
+    def __init__(self, legs, departure, arrival):
+        """
+        Initialize from legs and the journey's first departure and final arrival.
+        """
+        self.legs = legs
+        self.departure = departure
+        self.arrival = arrival
+        self.cost = sum(leg.cost for leg in legs)
+
+    @property
+    def duration(self):
+        """
+        Return the minutes from the first departure to the final arrival.
+        """
+        return self.arrival - self.departure
+
+    @property
+    def changes(self):
+        """
+        Return the number of changes of train.
+        """
+        return max(0, len(self.legs) - 1)
+
+    def path(self):
+        """
+        Return every station passed, from origin to destination.
+        """
+        path = self.legs[0].stations[:1] if self.legs else []
+        for leg in self.legs:
+            path.extend(leg.stations[1:])
+        return path
+
+
+class ConnectionScanRouter:
+    """
+    Departure-time queries over a Timetable with the Connection Scan Algorithm.
+
+    An earliest arrival query scans the departure-sorted connections once,
+    from the first departing at the requested time, and stops as soon as
+    connections leave after the best arrival found. No priority queue is
+    needed: a connection is taken if its train is already being ridden
+    or its station is reached in time to board it.
+
+    A profile query scans the connections once backwards and returns
+    every departure in a time window that is not beaten by a later one.
+    """
+    def __init__(self, timetable):
+        """
+        Initialize with the timetable to route over.
+        """
+        self.timetable = timetable
+
+    def earliest_arrival(self, start, end, departure):
+        """
+        Find the journey reaching end earliest when leaving start at departure or later.
+
+        departure is in minutes after midnight. Returns the Journey (None
+        if end cannot be reached that day) and the number of connections
+        scanned.
+        """
+        timetable = self.timetable
+        source = timetable.index.get(start)
+        target = timetable.index.get(end)
+        connections_scanned = 0
+
+        if source is None or target is None:
+            return None, connections_scanned
+        if source == target:
+            return Journey([], departure, departure), connections_scanned
+
+        departures_from = timetable.departures_from
+        arrivals_at = timetable.arrivals_at
+        departure_times = timetable.departure_times
+        arrival_times = timetable.arrival_times
+        trips = timetable.trips
+        change_time = timetable.change_time
+
+        infinity = float('infinity')
+        count = len(timetable.names)
+        earliest = [infinity] * count
+        earliest[source] = departure
+
+        # Time from which a train can be boarded at each station: after
+        # arriving plus the change time, or the departure time at the origin
+        ready = [infinity] * count
+        ready[source] = departure
+
+        # Connection each trip was boarded at, and (boarding, alighting)
+        # connections of the best way found to each station
+        boarded = [-1] * len(timetable.trip_names)
+        journey = [None] * count
+
+        for c in range(bisect_left(departure_times, departure), len(departure_times)):
+            # Nothing leaving from here on can arrive earlier
+            if departure_times[c] >= earliest[target]:
+                break
+            connections_scanned += 1
+
+            trip = trips[c]
+            if boarded[trip] < 0:
+                if ready[departures_from[c]] > departure_times[c]:
+                    continue
+                boarded[trip] = c
+
+            station = arrivals_at[c]
+            arrival = arrival_times[c]
+            if arrival < earliest[station]:
+                earliest[station] = arrival
+                ready[station] = arrival + change_time
+                journey[station] = (boarded[trip], c)
+
+        if journey[target] is None:
+            return None, connections_scanned
+
+        # Follow the legs back from the destination
+        legs = []
+        station = target
+        while station != source:
+            boarding, alighting = journey[station]
+            legs.append(self._leg(boarding, alighting))
+            station = departures_from[boarding]
+        legs.reverse()
+
+        return Journey(legs, legs[0].departure, legs[-1].arrival), connections_scanned
+
+    def _leg(self, boarding, alighting):
+        """
+        Return the Leg riding one trip from connection boarding to connection alighting.
+        """
+        timetable = self.timetable
+        names = timetable.names
+        trip = timetable.trips[boarding]
+
+        connections = timetable.trip_legs(trip)
+        connections = connections[timetable.trip_positions[boarding]:timetable.trip_positions[alighting] + 1]
+
+        stations = [names[timetable.departures_from[boarding]]]
+        stations.extend(names[timetable.arrivals_at[c]] for c in connections)
+
+        return Leg(timetable.trip_names[trip], stations, timetable.departure_times[boarding],
+                   timetable.arrival_times[alighting], sum(timetable.costs[c] for c in connections))
+
+    def profile(self, start, end, window_start, window_end):
+        """
+        Find the best arrival for every useful departure in a time window.
+
+        Returns a list of (departure, arrival) pairs, in minutes after
+        midnight and ordered by departure, in which leaving later always
+        means arriving later: a departure is left out if a later one in
+        the window arrives as early. Departures after the window never
+        push one out. Also returns the number of connections scanned.
+        """
+        timetable = self.timetable
+        source = timetable.index.get(start)
+        target = timetable.index.get(end)
+        connections_scanned = 0
+
+        if source is None or target is None or source == target:
+            return [], connections_scanned
+
+        departures_from = timetable.departures_from
+        arrivals_at = timetable.arrivals_at
+        departure_times = timetable.departure_times
+        arrival_times = timetable.arrival_times
+        trips = timetable.trips
+        change_time = timetable.change_time
+
+        infinity = float('infinity')
+        count = len(timetable.names)
+
+        # Each station's profile, built from its latest departures backwards:
+        # negated departure times (ascending) and the arrivals they give
+        # (descending), so the best onward arrival is found by bisection
+        negated_departures = [[] for _ in range(count)]
+        best_arrivals = [[] for _ in range(count)]
+
+        # Best arrival at the destination while riding each trip
+        trip_arrival = [infinity] * len(timetable.trip_names)
+
+        # The answer: the origin's profile over departures in the window
+        # only, kept apart because a departure after the window must not
+        # push out one inside it. Changes at the origin use the full profile.
+        window_departures, window_arrivals = [], []
+
+        first = bisect_left(departure_times, window_start)
+        for c in range(len(departure_times) - 1, first - 1, -1):
+            connections_scanned += 1
+            station = arrivals_at[c]
+            arrival = arrival_times[c]
+
+            # Alight at the destination, stay on the train, or change
+            best = arrival if station == target else trip_arrival[trips[c]]
+            profile = negated_departures[station]
+            if profile:
+                i = bisect_right(profile, -(arrival + change_time)) - 1
+                if i >= 0 and best_arrivals[station][i] < best:
+                    best = best_arrivals[station][i]
+
+            if best == infinity:
+                continue
+            if best < trip_arrival[trips[c]]:
+                trip_arrival[trips[c]] = best
+
+            # Keep the departure only if it beats every later one from its station
+            station = departures_from[c]
+            self._add_to_profile(negated_departures[station], best_arrivals[station], departure_times[c], best)
+            if station == source and departure_times[c] <= window_end:
+                self._add_to_profile(window_departures, window_arrivals, departure_times[c], best)
+
+        pairs = [(-negated, arrival) for negated, arrival in zip(window_departures, window_arrivals)]
+        pairs.reverse()
+        return pairs, connections_scanned
+
+    @staticmethod
+    def _add_to_profile(negated_departures, arrivals, departure, arrival):
+        """
+        Add a departure, scanned latest first, to a profile unless a later one arrives as early.
+        """
+        if not arrivals or arrival < arrivals[-1]:
+            if negated_departures and negated_departures[-1] == -departure:
+                arrivals[-1] = arrival
+            else:
+                negated_departures.append(-departure)
+                arrivals.append(arrival)
+
+    def find_route(self, start, end, departure):
+        """
+        Find the earliest arrival journey, in the form RouteSearcher.find_route returns.
+
+        Returns path, total cost, journey time in minutes (from the first
+        departure) and connections scanned.
+        """
+        journey, connections_scanned = self.earliest_arrival(start, end, departure)
+        if journey is None:
+            return None, None, None, connections_scanned
+        return journey.path(), journey.cost, journey.duration, connections_scanned
@@ -0,0 +1,323 @@
+# src/contraction_hierarchy.py
+
+import heapq
+import json
+import os
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies index for one metric ('cost' or 'time').
+
+    Stations are contracted one at a time in order of importance. When a
+    station is removed, a shortcut is added between two of its neighbours
+    whenever the path through it is the only shortest one. Queries then run
+    a bidirectional search that only climbs to more important stations,
+    and shortcuts are unpacked back into the real stations they replace.
+    """
+    FORMAT_VERSION = 1
+
+    # Settled stations allowed in one witness search before giving up
+    # and adding the shortcut anyway (extra shortcuts never hurt correctness)
+    WITNESS_LIMIT = 500
+
+    def __init__(self, metric, rank, upward, middles, checksum=None):
+        """
+        Initialize from a built hierarchy.
+
+        rank maps station -> contraction order, upward maps station ->
+        [(higher station, weight), ...], and middles maps a shortcut
+        (station_a, station_b), with station_a < station_b, to the station it skips.
+        """
+        self.metric = metric
+        self.rank = rank
+        self.upward = upward
+        self.middles = middles
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, network, metric='cost'):
+        """
+        Contract every station of the network and return the hierarchy for metric.
+        """
+        if metric not in ['cost', 'time']:
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        # Undirected adjacency keeping the cheapest of any parallel connections
+        adjacency = {station: {} for station in network.stations}
+        for station in network.stations:
+            for neighbor, cost, time in network.get_neighbors(station):
+                weight = cost if metric == 'cost' else time
+                if neighbor != station and weight < adjacency[station].get(neighbor, float('infinity')):
+                    adjacency[station][neighbor] = weight
+
+        middles = {}
+        contracted_neighbors = {station: 0 for station in adjacency}
+
+        # Lazily updated queue of (priority, station)
+        queue = [(cls._priority(adjacency, station, contracted_neighbors), station)
+                 for station in sorted(adjacency)]
+        heapq.heapify(queue)
+
+        rank = {}
+        upward = {}
+
+        while queue:
+            _, station = heapq.heappop(queue)
+
+            # Re-check the priority; contract only if it is still the smallest
+            priority = cls._priority(adjacency, station, contracted_neighbors)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, station))
+                continue
+
+            neighbors = adjacency.pop(station)
+            rank[station] = len(rank)
+            upward[station] = sorted(neighbors.items())
+
+            for neighbor in neighbors:
+                del adjacency[neighbor][station]
+                contracted_neighbors[neighbor] += 1
+
+            for first, second, weight in cls._shortcuts(adjacency, station, neighbors):
+                if weight < adjacency[first].get(second, float('infinity')):
+                    adjacency[first][second] = weight
+                    adjacency[second][first] = weight
+                    middles[(min(first, second), max(first, second))] = station
+
+        return cls(metric, rank, upward, middles, network.checksum)
+
+    @classmethod
+    def _shortcuts(cls, adjacency, station, neighbors):
+        """
+        Return the (u, w, weight) shortcuts needed when station is removed.
+
+        neighbors must already be detached from adjacency, so witness
+        searches never pass through the station itself.
+        """
+        shortcuts = []
+        ordered = sorted(neighbors)
+
+        for i, first in enumerate(ordered):
+            targets = {second: neighbors[first] + neighbors[second] for second in ordered[i + 1:]}
+            if not targets:
+                continue
+
+            witnesses = cls._witness_search(adjacency, first, targets, max(targets.values()))
+            for second, weight in targets.items():
+                if witnesses.get(second, float('infinity')) > weight:
+                    shortcuts.append((first, second, weight))
+
+        return shortcuts
+
+    @classmethod
+    def _witness_search(cls, adjacency, source, targets, limit):
+        """
+        Dijkstra from source in the remaining graph, bounded by distance and WITNESS_LIMIT.
+        """
+        distances = {source: 0}
+        visited = set()
+        priority_queue = [(0, source)]
+        remaining = len(targets)
+
+        while priority_queue and len(visited) < cls.WITNESS_LIMIT:
+            current_distance, current = heapq.heappop(priority_queue)
+            if current in visited:
+                continue
+            visited.add(current)
+
+            if current_distance > limit:
+                break
+            if current in targets:
+                remaining -= 1
+                if remaining == 0:
+                    break
+
+            for neighbor, weight in adjacency[current].items():
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = new_distance
+                    heapq.heappush(priority_queue, (new_distance, neighbor))
+
+        return distances
+
+    @classmethod
+    def _priority(cls, adjacency, station, contracted_neighbors):
+        """
+        Contraction priority: edge difference plus already contracted neighbours.
+        """
+        neighbors = adjacency[station]
+
+        # Simulate the contraction without changing the graph
+        for neighbor in neighbors:
+            del adjacency[neighbor][station]
+        shortcuts = cls._shortcuts(adjacency, station, neighbors)
+        for neighbor, weight in neighbors.items():
+            adjacency[neighbor][station] = weight
+
+        return len(shortcuts) - len(neighbors) + contracted_neighbors[station]
+
+    @staticmethod
+    def path_for(csv_path, metric):
+        """
+        Return the hierarchy file for one metric, stored next to a network CSV.
+        """
+        return os.path.splitext(csv_path)[0] + f'.ch-{metric}.json'
+
+    def save(self, filename):
+        """
+        Write the hierarchy to a JSON file.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'format': self.FORMAT_VERSION,
+                'metric': self.metric,
+                'checksum': self.checksum,
+                'rank': self.rank,
+                'upward': self.upward,
+                'middles': [[a, b, middle] for (a, b), middle in self.middles.items()],
+            }, file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a hierarchy written by save().
+        """
+        with open(filename, 'r') as file:
+            data = json.load(file)
+
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported hierarchy file format in '{filename}'")
+
+        upward = {station: [tuple(edge) for edge in edges] for station, edges in data['upward'].items()}
+        middles = {(a, b): middle for a, b, middle in data['middles']}
+        return cls(data['metric'], data['rank'], upward, middles, data.get('checksum'))
+
+    @classmethod
+    def load_or_build(cls, network, metric='cost'):
+        """
+        Reuse the saved hierarchy if the network CSV is unchanged, else rebuild and save it.
+
+        A network edited since loading no longer matches its CSV, so its
+        hierarchy is built in memory and neither loaded nor saved.
+        """
+        if network.source_file is None or network.modified:
+            return cls.build(network, metric)
+
+        filename = cls.path_for(network.source_file, metric)
+
+        if os.path.exists(filename):
+            try:
+                hierarchy = cls.load(filename)
+                if hierarchy.checksum == network.checksum and hierarchy.metric == metric:
+                    return hierarchy
+            except (OSError, ValueError, KeyError) as e:
+                print(f" Ignoring hierarchy file '{filename}': {e}")
+
+        hierarchy = cls.build(network, metric)
+        try:
+            hierarchy.save(filename)
+        except OSError as e:
+            print(f" Could not save hierarchy file '{filename}': {e}")
+
+        return hierarchy
+
+    def query(self, start, end, stats=None):
+        """
+        Find the shortest route between two stations.
+
+        Returns the unpacked path (or None), its distance and the number of
+        upward edges explored. If stats (a SearchStats) is given, the queue
+        work of both upward searches is added to it.
+        """
+        connections_explored = 0
+        relaxations = 0
+        pops = 0
+
+        if start not in self.rank or end not in self.rank:
+            return None, None, connections_explored
+
+        infinity = float('infinity')
+
+        # Index 0 searches upward from start, index 1 upward from end
+        distances = ({start: 0}, {end: 0})
+        parents = ({start: None}, {end: None})
+        visited = (set(), set())
+        queues = ([(0, start)], [(0, end)])
+
+        best_distance = 0 if start == end else infinity
+        meeting = start
+
+        while queues[0] or queues[1]:
+            # Expand the side with the smaller frontier key
+            if not queues[1] or (queues[0] and queues[0][0][0] <= queues[1][0][0]):
+                side = 0
+            else:
+                side = 1
+
+            current_distance, current = heapq.heappop(queues[side])
+            pops += 1
+
+            # Neither side can improve once its frontier passes the best route
+            if current_distance >= best_distance:
+                queues[side].clear()
+                continue
+            if current in visited[side]:
+                continue
+            visited[side].add(current)
+
+            other_distance = distances[1 - side].get(current)
+            if other_distance is not None and current_distance + other_distance < best_distance:
+                best_distance = current_distance + other_distance
+                meeting = current
+
+            for neighbor, weight in self.upward[current]:
+                connections_explored += 1
+                new_distance = current_distance + weight
+                if new_distance < distances[side].get(neighbor, infinity):
+                    distances[side][neighbor] = new_distance
+                    parents[side][neighbor] = current
+                    heapq.heappush(queues[side], (new_distance, neighbor))
+                    relaxations += 1
+
+        # Entries discarded when a side stops early are not counted as pops
+        if stats is not None:
+            stats.add_search(relaxations + 2, pops, len(visited[0]) + len(visited[1]), relaxations)
+
+        if best_distance == infinity:
+            return None, None, connections_explored
+
+        # Walk both parent chains back from the meeting station
+        forward = []
+        current = meeting
+        while current is not None:
+            forward.append(current)
+            current = parents[0][current]
+        forward.reverse()
+
+        current = parents[1][meeting]
+        while current is not None:
+            forward.append(current)
+            current = parents[1][current]
+
+        return self.unpack(forward), best_distance, connections_explored
+
+    def unpack(self, path):
+        """
+        Replace every shortcut in a path with the stations it skips.
+        """
+        stations = [path[0]]
+        stack = []
+
+        for station in path[1:]:
+            stack.append((stations[-1], station))
+            while stack:
+                first, second = stack.pop()
+                middle = self.middles.get((min(first, second), max(first, second)))
+                if middle is None:
+                    stations.append(second)
+                else:
+                    # Expand first -> middle before middle -> second
+                    stack.append((middle, second))
+                    stack.append((first, middle))
+
+        return stations
@@ -0,0 +1,166 @@
+# src/distance_matrix.py
+
+import json
+import mmap
+import struct
+from array import array
+
+class DistanceMatrix:
+    """
+    Dense source x target matrix of route costs and times.
+
+    Values are stored row-major in two flat float64 buffers (costs and
+    times), with infinity for unreachable pairs. The buffers support the
+    buffer protocol, so numpy.asarray(matrix.costs).reshape(matrix.shape)
+    gives a NumPy view without copying. Matrices can be saved to a file
+    that other processes memory-map and read any pair from without searching.
+    """
+    MAGIC = b'RDMX'
+    FORMAT_VERSION = 1
+
+    # magic, format version, rows, columns, length of the JSON name table
+    HEADER = struct.Struct('<4sI3Q')
+
+    def __init__(self, sources, targets, optimize_for='cost', costs=None, times=None):
+        """
+        Initialize an in-memory matrix, or wrap existing buffers.
+        """
+        self.sources = list(sources)
+        self.targets = list(targets)
+        self.optimize_for = optimize_for
+        self.source_index = {station: i for i, station in enumerate(self.sources)}
+        self.target_index = {station: j for j, station in enumerate(self.targets)}
+
+        size = len(self.sources) * len(self.targets)
+        self.costs = costs if costs is not None else array('d', [float('infinity')]) * size
+        self.times = times if times is not None else array('d', [float('infinity')]) * size
+
+        # Set when the matrix is backed by a memory-mapped file
+        self._file = None
+        self._mmap = None
+
+    @property
+    def shape(self):
+        """
+        Return (number of sources, number of targets).
+        """
+        return len(self.sources), len(self.targets)
+
+    def __getitem__(self, key):
+        """
+        Return (cost, time) for the (row, column) index pair.
+        """
+        row, column = key
+        k = row * len(self.targets) + column
+        return self.costs[k], self.times[k]
+
+    def get(self, source, target):
+        """
+        Return (cost, time) between two stations, or None if either is not in the matrix.
+        """
+        row = self.source_index.get(source)
+        column = self.target_index.get(target)
+        if row is None or column is None:
+            return None
+        return self[row, column]
+
+    def set_row(self, row, costs, times):
+        """
+        Store one full row of costs and times.
+        """
+        columns = len(self.targets)
+        self.costs[row * columns:(row + 1) * columns] = array('d', costs)
+        self.times[row * columns:(row + 1) * columns] = array('d', times)
+
+    def rows(self, metric='cost'):
+        """
+        Return the matrix for one metric as a list of row lists.
+        """
+        values = self.costs if metric == 'cost' else self.times
+        columns = len(self.targets)
+        return [list(values[r * columns:(r + 1) * columns]) for r in range(len(self.sources))]
+
+    @classmethod
+    def _layout(cls, sources, targets, optimize_for):
+        """
+        Return the encoded name table and the byte offset of the cost buffer.
+        """
+        names = json.dumps({'sources': sources, 'targets': targets, 'optimize_for': optimize_for}).encode('utf-8')
+
+        # Align the float64 data on an 8-byte boundary
+        data_offset = cls.HEADER.size + len(names)
+        data_offset += -data_offset % 8
+        return names, data_offset
+
+    @classmethod
+    def create(cls, filename, sources, targets, optimize_for='cost'):
+        """
+        Create a matrix file of the right size; rows are filled in later.
+        """
+        sources, targets = list(sources), list(targets)
+        names, data_offset = cls._layout(sources, targets, optimize_for)
+        size = len(sources) * len(targets) * 8
+
+        with open(filename, 'wb') as file:
+            file.write(cls.HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION, len(sources), len(targets), len(names)))
+            file.write(names)
+            file.truncate(data_offset + 2 * size)
+
+    def save(self, filename):
+        """
+        Write this matrix to a file readable with DistanceMatrix.open().
+        """
+        self.create(filename, self.sources, self.targets, self.optimize_for)
+        _, data_offset = self._layout(self.sources, self.targets, self.optimize_for)
+
+        with open(filename, 'r+b') as file:
+            file.seek(data_offset)
+            file.write(memoryview(self.costs).cast('B'))
+            file.write(memoryview(self.times).cast('B'))
+
+    @classmethod
+    def open(cls, filename, writable=False):
+        """
+        Memory-map a matrix file. Values are read from the file on demand.
+        """
+        file = open(filename, 'r+b' if writable else 'rb')
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except ValueError:
+            file.close()
+            raise
+
+        magic, version, rows, columns, names_length = cls.HEADER.unpack_from(mapped, 0)
+        if magic != cls.MAGIC or version != cls.FORMAT_VERSION:
+            mapped.close()
+            file.close()
+            raise ValueError(f"'{filename}' is not a distance matrix file")
+
+        names = json.loads(mapped[cls.HEADER.size:cls.HEADER.size + names_length].decode('utf-8'))
+        _, data_offset = cls._layout(names['sources'], names['targets'], names['optimize_for'])
+        size = rows * columns * 8
+
+        view = memoryview(mapped)
+        costs = view[data_offset:data_offset + size].cast('d')
+        times = view[data_offset + size:data_offset + 2 * size].cast('d')
+
+        matrix = cls(names['sources'], names['targets'], names['optimize_for'], costs, times)
+        matrix._file = file
+        matrix._mmap = mapped
+        return matrix
+
+    def close(self):
+        """
+        Release the memory map of a file-backed matrix.
+        """
+        if self._mmap is None:
+            return
+
+        # Views must be released before the map can be closed
+        self.costs.release()
+        self.times.release()
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+        self._file = None
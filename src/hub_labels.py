@@ -0,0 +1,292 @@
+# src/hub_labels.py
+
+import heapq
+import json
+import os
+from array import array
+
+class HubLabels:
+    """
+    Hub labeling index for one metric ('cost' or 'time').
+
+    Every station keeps a label: a short list of hub stations with its
+    exact distance to each. Labels are built with pruned landmark
+    labeling, so any two stations share a hub on one of their shortest
+    routes, and the distance between them is the smallest sum over their
+    common hubs. Hubs are stored by rank, so both labels are sorted and a
+    query is a single merge of two lists.
+    """
+    FORMAT_VERSION = 1
+
+    # Shortest path trees sampled to rank stations by how many routes pass them
+    ORDER_SAMPLES = 16
+
+    def __init__(self, metric, order, labels, checksum=None):
+        """
+        Initialize from built labels.
+
+        order lists the stations from most to least important, and labels
+        maps station -> (hub ranks, distances), two parallel arrays sorted
+        by rank.
+        """
+        self.metric = metric
+        self.order = order
+        self.labels = labels
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, network, metric='cost'):
+        """
+        Build the labels of every station of the network for metric.
+        """
+        if metric not in ['cost', 'time']:
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        # Undirected adjacency keeping the cheapest of any parallel connections
+        infinity = float('infinity')
+        adjacency = {station: {} for station in network.stations}
+        for station in network.stations:
+            for neighbor, cost, time in network.get_neighbors(station):
+                weight = cost if metric == 'cost' else time
+                if neighbor != station and weight < adjacency[station].get(neighbor, infinity):
+                    adjacency[station][neighbor] = weight
+
+        order = cls._order(adjacency)
+        hubs = {station: [] for station in adjacency}
+        distances = {station: [] for station in adjacency}
+
+        # Distances from the current root to its own hubs, indexed by hub rank
+        root_distances = [infinity] * len(order)
+
+        for rank, root in enumerate(order):
+            for hub, distance in zip(hubs[root], distances[root]):
+                root_distances[hub] = distance
+
+            # Dijkstra from the root that stops wherever the labels so far
+            # already give a route at least as short
+            tentative = {root: 0}
+            settled = set()
+            priority_queue = [(0, root)]
+
+            while priority_queue:
+                distance, station = heapq.heappop(priority_queue)
+                if station in settled:
+                    continue
+                settled.add(station)
+
+                covered = False
+                for hub, hub_distance in zip(hubs[station], distances[station]):
+                    if root_distances[hub] + hub_distance <= distance:
+                        covered = True
+                        break
+                if covered:
+                    continue
+
+                hubs[station].append(rank)
+                distances[station].append(distance)
+
+                for neighbor, weight in adjacency[station].items():
+                    new_distance = distance + weight
+                    if new_distance < tentative.get(neighbor, infinity):
+                        tentative[neighbor] = new_distance
+                        heapq.heappush(priority_queue, (new_distance, neighbor))
+
+            for hub in hubs[root]:
+                root_distances[hub] = infinity
+
+        labels = {station: cls._pack(hubs[station], distances[station]) for station in adjacency}
+        return cls(metric, order, labels, network.checksum)
+
+    @classmethod
+    def _order(cls, adjacency):
+        """
+        Rank stations by how many sampled shortest routes pass through them.
+
+        Junctions on many routes make good hubs: ranking them first keeps
+        every label short. Ties, and stations no sample passes, are ranked
+        by degree and then by name.
+        """
+        infinity = float('infinity')
+        stations = sorted(adjacency)
+        through = dict.fromkeys(stations, 0)
+
+        step = max(1, len(stations) // cls.ORDER_SAMPLES)
+        for source in stations[::step]:
+            distances = {source: 0}
+            parents = {}
+            settled = []
+            priority_queue = [(0, source)]
+            while priority_queue:
+                distance, station = heapq.heappop(priority_queue)
+                if distance > distances[station]:
+                    continue
+                settled.append(station)
+                for neighbor, weight in adjacency[station].items():
+                    if distance + weight < distances.get(neighbor, infinity):
+                        distances[neighbor] = distance + weight
+                        parents[neighbor] = station
+                        heapq.heappush(priority_queue, (distance + weight, neighbor))
+
+            # Count the descendants of every station in the shortest path tree
+            below = dict.fromkeys(settled, 1)
+            for station in reversed(settled):
+                if station in parents:
+                    below[parents[station]] += below[station]
+            for station, count in below.items():
+                through[station] += count
+
+        return sorted(stations, key=lambda station: (-through[station], -len(adjacency[station]), station))
+
+    @staticmethod
+    def _pack(hubs, distances):
+        """
+        Return a label as compact arrays: int32 ranks and int64 (or float) distances.
+        """
+        integral = all(type(distance) is int for distance in distances)
+        return array('i', hubs), array('q' if integral else 'd', distances)
+
+    def distance(self, start, end):
+        """
+        Return the shortest distance between two stations, or None if unreachable.
+        """
+        if start == end:
+            return 0 if start in self.labels else None
+
+        start_label = self.labels.get(start)
+        end_label = self.labels.get(end)
+        if start_label is None or end_label is None:
+            return None
+
+        # Merge the two rank-sorted hub lists
+        start_hubs, start_distances = start_label
+        end_hubs, end_distances = end_label
+        i, j = 0, 0
+        i_end, j_end = len(start_hubs), len(end_hubs)
+        best = None
+
+        while i < i_end and j < j_end:
+            start_hub, end_hub = start_hubs[i], end_hubs[j]
+            if start_hub == end_hub:
+                total = start_distances[i] + end_distances[j]
+                if best is None or total < best:
+                    best = total
+                i += 1
+                j += 1
+            elif start_hub < end_hub:
+                i += 1
+            else:
+                j += 1
+
+        return best
+
+    def path(self, network, start, end):
+        """
+        Recover a shortest route by walking along neighbours that keep to it.
+
+        At each station the walk moves to a neighbour whose connection
+        weight plus its label distance to end equals the remaining
+        distance. Returns the list of stations, or None if unreachable.
+        """
+        remaining = self.distance(start, end)
+        if remaining is None:
+            return None
+
+        path = [start]
+        seen = {start}
+        current = start
+
+        while current != end:
+            for neighbor, cost, time in network.get_neighbors(current):
+                if neighbor in seen:
+                    continue
+                weight = cost if self.metric == 'cost' else time
+                rest = self.distance(neighbor, end)
+                if rest is not None and weight + rest == remaining:
+                    break
+            else:
+                # Labels no longer match the network
+                return None
+
+            path.append(neighbor)
+            seen.add(neighbor)
+            current = neighbor
+            remaining = rest
+
+        return path
+
+    def entry_count(self):
+        """
+        Return the total number of (hub, distance) entries over all labels.
+        """
+        return sum(len(hubs) for hubs, _ in self.labels.values())
+
+    def nbytes(self):
+        """
+        Return the approximate memory used by the label arrays.
+        """
+        return sum(hubs.itemsize * len(hubs) + distances.itemsize * len(distances)
+                   for hubs, distances in self.labels.values())
+
+    @staticmethod
+    def path_for(csv_path, metric):
+        """
+        Return the label file for one metric, stored next to a network CSV.
+        """
+        return os.path.splitext(csv_path)[0] + f'.hl-{metric}.json'
+
+    def save(self, filename):
+        """
+        Write the labels to a JSON file.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'format': self.FORMAT_VERSION,
+                'metric': self.metric,
+                'checksum': self.checksum,
+                'order': self.order,
+                'labels': {station: [hubs.tolist(), distances.tolist()]
+                           for station, (hubs, distances) in self.labels.items()},
+            }, file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read labels written by save().
+        """
+        with open(filename, 'r') as file:
+            data = json.load(file)
+
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported hub label file format in '{filename}'")
+
+        labels = {station: cls._pack(hubs, distances) for station, (hubs, distances) in data['labels'].items()}
+        return cls(data['metric'], data['order'], labels, data.get('checksum'))
+
+    @classmethod
+    def load_or_build(cls, network, metric='cost'):
+        """
+        Reuse the saved labels if the network CSV is unchanged, else rebuild and save them.
+
+        A network edited since loading no longer matches its CSV, so its
+        labels are built in memory and neither loaded nor saved.
+        """
+        if network.source_file is None or network.modified:
+            return cls.build(network, metric)
+
+        filename = cls.path_for(network.source_file, metric)
+
+        if os.path.exists(filename):
+            try:
+                labels = cls.load(filename)
+                if labels.checksum == network.checksum and labels.metric == metric:
+                    return labels
+            except (OSError, ValueError, KeyError) as e:
+                print(f" Ignoring hub label file '{filename}': {e}")
+
+        labels = cls.build(network, metric)
+        try:
+            labels.save(filename)
+        except OSError as e:
+            print(f" Could not save hub label file '{filename}': {e}")
+
+        return labels
@@ -0,0 +1,169 @@
+# src/landmarks.py
+
+import json
+import os
+
+from src.route_searcher import RouteSearcher
+
+class LandmarkIndex:
+    """
+    Precomputed landmark distance tables for A* search with ALT heuristics.
+
+    For every landmark L and station v the index stores d(L, v) for both
+    cost and time. Because every connection runs in both directions, the
+    triangle inequality gives |d(L, t) - d(L, v)| <= d(v, t), a lower bound
+    on the remaining distance that never overestimates.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, landmarks, tables, checksum=None):
+        """
+        Initialize with landmark names and {metric: {station: [distance, ...]}} tables.
+
+        Unreachable entries are stored as None.
+        """
+        self.landmarks = landmarks
+        self.tables = tables
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, network, k=8):
+        """
+        Pick k landmarks by farthest-point selection and compute their distance tables.
+        """
+        searcher = RouteSearcher(network)
+        stations = sorted(network.stations)
+        if not stations:
+            return cls([], {'cost': {}, 'time': {}}, network.checksum)
+
+        landmarks = []
+        cost_trees = []
+
+        # Closest distance from any chosen landmark, used to pick the next one
+        closest = {station: float('infinity') for station in stations}
+
+        # Start from the station farthest from an arbitrary first station
+        seed_distances, _ = searcher.shortest_path_tree(stations[0], 'cost')
+        candidate = max(stations, key=lambda s: (seed_distances.get(s, -1), s))
+
+        while len(landmarks) < min(k, len(stations)):
+            landmarks.append(candidate)
+            distances, _ = searcher.shortest_path_tree(candidate, 'cost')
+            cost_trees.append(distances)
+
+            for station in stations:
+                closest[station] = min(closest[station], distances.get(station, float('infinity')))
+
+            # Next landmark: the station farthest from all chosen ones.
+            # Stations in other components count as infinitely far away.
+            remaining = [s for s in stations if s not in landmarks]
+            if not remaining:
+                break
+            candidate = max(remaining, key=lambda s: (closest[s], s))
+
+        time_trees = [searcher.shortest_path_tree(landmark, 'time')[0] for landmark in landmarks]
+
+        tables = {
+            'cost': {s: [tree.get(s) for tree in cost_trees] for s in stations},
+            'time': {s: [tree.get(s) for tree in time_trees] for s in stations},
+        }
+        return cls(landmarks, tables, network.checksum)
+
+    @staticmethod
+    def path_for(csv_path):
+        """
+        Return the landmark table file stored next to a network CSV.
+        """
+        return os.path.splitext(csv_path)[0] + '.landmarks.json'
+
+    def save(self, filename):
+        """
+        Write the landmark tables to a JSON file.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'format': self.FORMAT_VERSION,
+                'checksum': self.checksum,
+                'landmarks': self.landmarks,
+                'tables': self.tables,
+            }, file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read landmark tables written by save().
+        """
+        with open(filename, 'r') as file:
+            data = json.load(file)
+
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported landmark file format in '{filename}'")
+
+        return cls(data['landmarks'], data['tables'], data.get('checksum'))
+
+    @classmethod
+    def load_or_build(cls, network, k=8):
+        """
+        Reuse the saved landmark tables if the network CSV is unchanged, else rebuild.
+
+        Rebuilt tables are saved next to the CSV for the next start. A
+        network edited since loading no longer matches its CSV, so its
+        tables are built in memory and neither loaded nor saved.
+        """
+        if network.source_file is None or network.modified:
+            return cls.build(network, k)
+
+        filename = cls.path_for(network.source_file)
+
+        # Reuse only if built from the same CSV contents with enough landmarks
+        if os.path.exists(filename):
+            try:
+                index = cls.load(filename)
+                if index.checksum == network.checksum and len(index.landmarks) >= min(k, len(network.stations)):
+                    return index
+            except (OSError, ValueError, KeyError) as e:
+                print(f" Ignoring landmark file '{filename}': {e}")
+
+        index = cls.build(network, k)
+        try:
+            index.save(filename)
+        except OSError as e:
+            print(f" Could not save landmark file '{filename}': {e}")
+
+        return index
+
+    def heuristic(self, target, optimize_for):
+        """
+        Return a function giving a lower bound on the distance from a station to target.
+        """
+        table = self.tables[optimize_for]
+        target_row = table.get(target)
+
+        # No information about the target: fall back to plain Dijkstra
+        if target_row is None:
+            return lambda station: 0
+
+        infinity = float('infinity')
+
+        def lower_bound(station):
+            row = table.get(station)
+            if row is None:
+                return 0
+
+            bound = 0
+            for to_station, to_target in zip(row, target_row):
+                if to_station is None or to_target is None:
+                    # A landmark reaching exactly one of them means they are
+                    # in different components, so the target is unreachable
+                    if to_station is not to_target:
+                        return infinity
+                    continue
+
+                difference = to_target - to_station
+                if difference < 0:
+                    difference = -difference
+                if difference > bound:
+                    bound = difference
+            return bound
+
+        return lower_bound
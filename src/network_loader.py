@@ -0,0 +1,287 @@
+# src/network_loader.py
+
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Unix only; without it peak memory is not reported
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Bytes of CSV parsed per task
+CHUNK_SIZE = 16 << 20
+
+# Chunks parsed or waiting to be merged, per worker
+CHUNKS_IN_FLIGHT = 2
+
+# Row errors kept with their text; further errors are only counted
+MAX_ERRORS = 1000
+
+
+class LoadReport:
+    """
+    Outcome of loading a network CSV with load_edges().
+
+    Counts every row read, the connections kept and the parallel
+    connections dropped in favour of them, and records invalid rows (line number,
+    reason and text) instead of stopping at the first one.
+    """
+    def __init__(self, filename):
+        """
+        Initialize an empty report for a file.
+        """
+        self.filename = filename
+        self.rows = 0
+        self.connections = 0
+        self.merged = 0
+        self.error_count = 0
+
+        # Rows rejected, by reason, and the first MAX_ERRORS of them in full
+        self.error_reasons = {}
+        self.errors = []
+
+        self.elapsed = 0.0
+
+        # Peak memory of the load and its workers, None where it cannot be measured
+        self.peak_memory_kb = None
+
+    def add_error(self, line, reason, text):
+        """
+        Record one rejected row.
+        """
+        self.error_count += 1
+        self.error_reasons[reason] = self.error_reasons.get(reason, 0) + 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, reason, text))
+
+    @property
+    def rows_per_second(self):
+        """
+        Return the number of rows read per second of loading.
+        """
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        """
+        Return the report as a plain dict, e.g. for JSON export.
+        """
+        return {
+            'filename': self.filename,
+            'rows': self.rows,
+            'connections': self.connections,
+            'merged': self.merged,
+            'error_count': self.error_count,
+            'error_reasons': dict(self.error_reasons),
+            'errors': [{'line': line, 'reason': reason, 'text': text} for line, reason, text in self.errors],
+            'elapsed': self.elapsed,
+            'rows_per_second': self.rows_per_second,
+            'peak_memory_kb': self.peak_memory_kb,
+        }
+
+    def summary(self):
+        """
+        Return a short human-readable summary.
+        """
+        memory = "" if self.peak_memory_kb is None else f", peak memory {self.peak_memory_kb / 1024:.1f} MB"
+        lines = [f" Read {self.rows} rows in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s{memory})",
+                 f" • Connections: {self.connections} ({self.merged} parallel connections merged)",
+                 f" • Rejected rows: {self.error_count}"]
+        for reason, count in sorted(self.error_reasons.items()):
+            lines.append(f"   - {reason}: {count}")
+        for line, reason, text in self.errors[:5]:
+            lines.append(f"   line {line}: {reason}: {text!r}")
+        return "\n".join(lines)
+
+
+def chunk_ranges(filename, chunk_size=CHUNK_SIZE):
+    """
+    Split a file into byte ranges of about chunk_size that end at line breaks.
+    """
+    size = os.path.getsize(filename)
+    ranges = []
+
+    with open(filename, 'rb') as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def parse_row(row):
+    """
+    Validate one CSV row. Returns ((station1, station2, cost, time), None) or (None, reason).
+    """
+    if len(row) != 4:
+        return None, "expected 4 columns"
+
+    station1, station2 = row[0].strip(), row[1].strip()
+    cost, time = row[2].strip(), row[3].strip()
+
+    if not station1 or not station2:
+        return None, "empty station name"
+    if station1 == station2:
+        return None, "connection from a station to itself"
+    if not cost.isdigit():
+        return None, "cost is not a whole number"
+    if not time.isdigit():
+        return None, "time is not a whole number"
+
+    return (station1, station2, int(cost), int(time)), None
+
+
+def best_edges(edges):
+    """
+    Return the (cost, time) connections worth keeping among parallel ones.
+
+    That is the cheapest and the fastest (the cheaper of equally fast
+    ones, and vice versa), or just one if a connection is both. Every
+    search metric keeps its optimum without combining the cost of one
+    train with the time of another.
+    """
+    cheapest = min(edges)
+    fastest = min(edges, key=lambda edge: (edge[1], edge[0]))
+    return (cheapest,) if cheapest == fastest else (cheapest, fastest)
+
+
+def parse_chunk(filename, start, end, merge_parallel=True):
+    """
+    Parse the rows in one byte range of a network CSV.
+
+    Returns (edges, rows, merged, errors). With merge_parallel, edges maps
+    each station pair (sorted) to its best_edges() and merged counts the
+    connections dropped; otherwise it is a list of (station1, station2, cost, time). errors
+    holds (line within the chunk, reason, text) for every rejected row.
+    """
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    lines = data.decode('utf-8').splitlines()
+    edges = {} if merge_parallel else []
+    merged = 0
+    errors = []
+
+    for line_number, row in enumerate(csv.reader(lines), 1):
+        if not row:
+            continue
+
+        # The header may only be the first line of the file
+        if start == 0 and line_number == 1 and row[0].strip().lower() == 'station1':
+            continue
+
+        parsed, reason = parse_row(row)
+        if parsed is None:
+            errors.append((line_number, reason, lines[line_number - 1]))
+            continue
+
+        station1, station2, cost, time = parsed
+        if not merge_parallel:
+            edges.append(parsed)
+            continue
+
+        key = (station1, station2) if station1 < station2 else (station2, station1)
+        previous = edges.get(key)
+        if previous is None:
+            edges[key] = ((cost, time),)
+        else:
+            edges[key] = best_edges(previous + ((cost, time),))
+            merged += len(previous) + 1 - len(edges[key])
+
+    return edges, len(lines), merged, errors
+
+
+def _parse_task(task):
+    """
+    Worker entry point for parse_chunk().
+    """
+    return parse_chunk(*task)
+
+
+def load_edges(filename, workers=None, chunk_size=CHUNK_SIZE, merge_parallel=True):
+    """
+    Read and validate every connection of a network CSV, in parallel chunks.
+
+    The file is split into line-aligned chunks that worker processes
+    parse independently. At most CHUNKS_IN_FLIGHT chunks per worker are
+    being parsed or waiting at a time, and results are merged in file
+    order as they arrive, so memory holds the merged connections plus a
+    few chunks, not the whole file. With merge_parallel, only the cheapest and the
+    fastest of the parallel connections between two stations are kept
+    (see best_edges()), so each search metric's optimal routes are
+    unchanged.
+
+    Returns (edges, LoadReport), where edges is a list of
+    (station1, station2, cost, time). Raises FileNotFoundError if the
+    file does not exist; invalid rows are only reported.
+    """
+    started = time.perf_counter()
+    report = LoadReport(os.path.abspath(filename))
+    tasks = [(filename, start, end, merge_parallel) for start, end in chunk_ranges(filename, chunk_size)]
+
+    workers = workers or os.cpu_count() or 1
+    merged_edges = {}
+    edge_list = []
+    lines_before = 0
+
+    def merge(result):
+        nonlocal lines_before
+        edges, lines, merged, errors = result
+
+        report.rows += lines
+        report.merged += merged
+        for line, reason, text in errors:
+            report.add_error(lines_before + line, reason, text)
+        lines_before += lines
+
+        if not merge_parallel:
+            edge_list.extend(edges)
+            return
+
+        for key, kept in edges.items():
+            previous = merged_edges.get(key)
+            if previous is None:
+                merged_edges[key] = kept
+            else:
+                merged_edges[key] = best_edges(previous + kept)
+                report.merged += len(previous) + len(kept) - len(merged_edges[key])
+
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            merge(_parse_task(task))
+    else:
+        workers = min(workers, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = iter(tasks)
+            in_flight = deque()
+            for task in pending:
+                in_flight.append(pool.submit(_parse_task, task))
+                if len(in_flight) >= workers * CHUNKS_IN_FLIGHT:
+                    break
+
+            # Merge the oldest chunk, then hand its worker the next one
+            while in_flight:
+                merge(in_flight.popleft().result())
+                task = next(pending, None)
+                if task is not None:
+                    in_flight.append(pool.submit(_parse_task, task))
+
+    if merge_parallel:
+        edge_list = [(station1, station2, cost, time)
+                     for (station1, station2), kept in merged_edges.items() for cost, time in kept]
+
+    report.connections = len(edge_list)
+    report.elapsed = time.perf_counter() - started
+    if resource is not None:
+        report.peak_memory_kb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                 + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    return edge_list, report
@@ -0,0 +1,127 @@
+# src/network_snapshot.py
+
+import mmap
+import os
+import struct
+
+from src.compact_graph import CompactGraph
+
+# magic, format version, SHA-256 of the source CSV, stations, directed edges, name table bytes
+HEADER = struct.Struct('<4sI32sQQQ')
+MAGIC = b'RNSN'
+FORMAT_VERSION = 1
+
+# Station names are stored as one UTF-8 blob separated by NUL bytes
+SEPARATOR = b'\0'
+
+
+def snapshot_layout(station_count, edge_count, names_length):
+    """
+    Return the byte offsets of the four packed arrays and the total size.
+
+    Arrays are stored in native byte order: offsets as int64, then
+    targets, costs and times as int32.
+    """
+    offsets_start = HEADER.size + names_length
+    offsets_start += -offsets_start % 8
+    targets_start = offsets_start + 8 * (station_count + 1)
+    costs_start = targets_start + 4 * edge_count
+    times_start = costs_start + 4 * edge_count
+    total = times_start + 4 * edge_count
+    return offsets_start, targets_start, costs_start, times_start, total
+
+
+def pack_snapshot(graph, checksum):
+    """
+    Encode a CompactGraph and the hex checksum of its source CSV as bytes.
+    """
+    names = SEPARATOR.join(name.encode('utf-8') for name in graph.names)
+    station_count, edge_count = len(graph.names), graph.edge_count()
+    offsets_start, targets_start, costs_start, times_start, total = snapshot_layout(
+        station_count, edge_count, len(names))
+
+    buffer = bytearray(total)
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, bytes.fromhex(checksum or '0' * 64),
+                     station_count, edge_count, len(names))
+    buffer[HEADER.size:HEADER.size + len(names)] = names
+
+    for start, values in ((offsets_start, graph.offsets), (targets_start, graph.targets),
+                          (costs_start, graph.costs), (times_start, graph.times)):
+        raw = memoryview(values).cast('B')
+        buffer[start:start + len(raw)] = raw
+
+    return buffer
+
+
+def unpack_snapshot(buffer):
+    """
+    Decode a snapshot without copying its arrays.
+
+    Returns (CompactGraph, hex checksum). The graph's arrays are
+    memoryviews into buffer, which must stay alive as long as the graph.
+    """
+    magic, version, checksum, station_count, edge_count, names_length = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a railway network snapshot")
+
+    offsets_start, targets_start, costs_start, times_start, total = snapshot_layout(
+        station_count, edge_count, names_length)
+    if len(buffer) < total:
+        raise ValueError("Railway network snapshot is truncated")
+
+    view = memoryview(buffer)
+    names_blob = bytes(view[HEADER.size:HEADER.size + names_length])
+    names = names_blob.decode('utf-8').split(SEPARATOR.decode()) if station_count else []
+
+    graph = CompactGraph(
+        names,
+        view[offsets_start:targets_start].cast('q'),
+        view[targets_start:costs_start].cast('i'),
+        view[costs_start:times_start].cast('i'),
+        view[times_start:total].cast('i'),
+    )
+    return graph, checksum.hex()
+
+
+def snapshot_path(csv_path):
+    """
+    Return the snapshot file stored next to a network CSV.
+    """
+    return os.path.splitext(csv_path)[0] + '.snapshot'
+
+
+def save_snapshot(graph, checksum, filename):
+    """
+    Write a snapshot file.
+
+    The file is written under a temporary name and then renamed, so
+    processes starting at the same time never map a half-written snapshot.
+    """
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(pack_snapshot(graph, checksum))
+    os.replace(temporary, filename)
+
+
+def read_snapshot_checksum(filename):
+    """
+    Return the source checksum recorded in a snapshot file without mapping it.
+    """
+    with open(filename, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Railway network snapshot is truncated")
+
+    magic, version, checksum, _, _, _ = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a railway network snapshot")
+    return checksum.hex()
+
+
+def load_snapshot(filename):
+    """
+    Memory-map a snapshot file. Returns (CompactGraph, hex checksum).
+    """
+    with open(filename, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return unpack_snapshot(mapped)
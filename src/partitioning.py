@@ -0,0 +1,519 @@
+# src/partitioning.py
+
+import heapq
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Passes of boundary refinement after each bisection
+REFINE_PASSES = 4
+
+# Smallest share of a bisected part each side may keep during refinement
+BALANCE = 0.45
+
+
+def partition_network(network, region_count):
+    """
+    Split the network's stations into region_count regions with few boundary stations.
+
+    Uses recursive bisection: the largest region is split in two along
+    a breadth-first ordering from one of its most outlying stations, so
+    each half is a connected block. Stations on the cut are then moved
+    to the side holding most of their neighbours while the halves stay
+    balanced. Returns {station: region number}.
+    """
+    neighbors = {station: {neighbor for neighbor, _, _ in network.get_neighbors(station) if neighbor != station}
+                 for station in network.stations}
+
+    parts = [sorted(network.stations)]
+    while len(parts) < region_count:
+        largest = max(range(len(parts)), key=lambda i: len(parts[i]))
+        if len(parts[largest]) < 2:
+            break
+        first, second = _bisect(parts[largest], neighbors)
+        parts[largest:largest + 1] = [first, second]
+
+    return {station: region for region, part in enumerate(parts) for station in part}
+
+
+def _bisect(part, neighbors):
+    """
+    Split a list of stations into two balanced, mostly connected halves.
+    """
+    members = set(part)
+    order = _breadth_first_order(part, members, neighbors)
+    first = set(order[:len(order) // 2])
+    second = members - first
+
+    minimum = int(len(part) * BALANCE)
+    for _ in range(REFINE_PASSES):
+        moved = False
+        for station in order:
+            own, other = (first, second) if station in first else (second, first)
+            if len(own) <= minimum:
+                continue
+
+            inside = sum(1 for neighbor in neighbors[station] if neighbor in own)
+            across = sum(1 for neighbor in neighbors[station] if neighbor in other)
+            if across > inside:
+                own.remove(station)
+                other.add(station)
+                moved = True
+        if not moved:
+            break
+
+    return sorted(first), sorted(second)
+
+
+def _breadth_first_order(part, members, neighbors):
+    """
+    Return the stations of part in breadth-first order, component by component.
+
+    Each component is searched from a station at the far end of a first
+    search, so the ordering sweeps across it from one side.
+    """
+    def sweep(root, seen):
+        order = [root]
+        seen.add(root)
+        queue = deque([root])
+        while queue:
+            station = queue.popleft()
+            for neighbor in sorted(neighbors[station]):
+                if neighbor in members and neighbor not in seen:
+                    seen.add(neighbor)
+                    order.append(neighbor)
+                    queue.append(neighbor)
+        return order
+
+    order = []
+    visited = set()
+    for station in part:
+        if station in visited:
+            continue
+        far_end = sweep(station, set())[-1]
+        order.extend(sweep(far_end, visited))
+    return order
+
+
+def _restricted_search(adjacency, start, metric, targets=None):
+    """
+    Dijkstra's algorithm over one region's own connections, carrying the other metric.
+
+    Stops once every station in targets is settled. Returns
+    ({station: (primary, secondary)}, parents, connections explored).
+    """
+    use_cost = metric == 'cost'
+    distances = {start: 0}
+    others = {start: 0}
+    parents = {start: None}
+    settled = {}
+    remaining = set(targets) if targets is not None else None
+    connections_explored = 0
+    priority_queue = [(0, start)]
+
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        if current in settled:
+            continue
+        settled[current] = (current_distance, others[current])
+
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+
+        for neighbor, cost, time in adjacency[current]:
+            connections_explored += 1
+            if neighbor in settled:
+                continue
+
+            weight, other_weight = (cost, time) if use_cost else (time, cost)
+            new_distance = current_distance + weight
+            if new_distance < distances.get(neighbor, float('infinity')):
+                distances[neighbor] = new_distance
+                others[neighbor] = others[current] + other_weight
+                parents[neighbor] = current
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+
+    return settled, parents, connections_explored
+
+
+class Region:
+    """
+    One shard of a partitioned network: a region's stations and the connections inside it.
+
+    Connections leaving the region belong to the Overlay, so a region
+    can be saved, loaded and searched on its own, in another process
+    or on another node. PartitionedRouter only calls distances() and
+    path(), so any object offering those two methods can stand in for a
+    Region.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, number, adjacency, boundary, checksum=None):
+        """
+        Initialize from {station: [(neighbor, cost, time), ...]} and the region's boundary stations.
+        """
+        self.number = number
+        self.adjacency = adjacency
+        self.boundary = boundary
+        self.checksum = checksum
+
+    @classmethod
+    def build_all(cls, network, region_of):
+        """
+        Build every region of a partition from {station: region number}.
+        """
+        adjacency = [{} for _ in range(max(region_of.values(), default=-1) + 1)]
+        boundary = [set() for _ in adjacency]
+
+        for station, region in region_of.items():
+            inside = adjacency[region].setdefault(station, [])
+            for neighbor, cost, time in network.get_neighbors(station):
+                if region_of[neighbor] == region:
+                    inside.append((neighbor, cost, time))
+                else:
+                    boundary[region].add(station)
+
+        return [cls(number, adjacency[number], sorted(boundary[number]), network.checksum)
+                for number in range(len(adjacency))]
+
+    def __len__(self):
+        """
+        Return the number of stations in the region.
+        """
+        return len(self.adjacency)
+
+    def distances(self, station, metric, also=None):
+        """
+        Return {target: (primary, secondary)} from station, staying inside the region.
+
+        The targets are the boundary stations plus any stations in also;
+        unreachable ones are left out. Also returns the number of
+        connections explored.
+        """
+        if station not in self.adjacency:
+            return {}, 0
+
+        targets = list(self.boundary)
+        if also is not None:
+            targets.extend(target for target in also if target in self.adjacency)
+        settled, _, connections_explored = _restricted_search(self.adjacency, station, metric, targets)
+        return {target: settled[target] for target in targets if target in settled}, connections_explored
+
+    def path(self, start, end, metric):
+        """
+        Return the best route from start to end inside the region, or None.
+        """
+        if start not in self.adjacency or end not in self.adjacency:
+            return None
+
+        settled, parents, _ = _restricted_search(self.adjacency, start, metric, [end])
+        if end not in settled:
+            return None
+
+        path = []
+        station = end
+        while station is not None:
+            path.append(station)
+            station = parents[station]
+        path.reverse()
+        return path
+
+    def save(self, filename):
+        """
+        Write the region to a JSON file.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'format': self.FORMAT_VERSION,
+                'region': self.number,
+                'checksum': self.checksum,
+                'boundary': self.boundary,
+                'adjacency': self.adjacency,
+            }, file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a region written by save().
+        """
+        with open(filename, 'r') as file:
+            data = json.load(file)
+
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported region file format in '{filename}'")
+
+        adjacency = {station: [tuple(edge) for edge in edges] for station, edges in data['adjacency'].items()}
+        return cls(data['region'], adjacency, data['boundary'], data.get('checksum'))
+
+
+class Overlay:
+    """
+    Boundary-to-boundary distances of a partitioned network, for both metrics.
+
+    The overlay graph's vertices are the boundary stations. Its edges are
+    the connections between regions, plus, within each region, the
+    shortest distance between every two of its boundary stations. Any
+    route leaving its origin region runs origin region → overlay →
+    destination region, so queries search only those two regions and
+    this graph. The overlay also maps every station to its region.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, region_of, edges, checksum=None):
+        """
+        Initialize from {station: region} and {metric: {boundary station: [edge, ...]}}.
+
+        Each edge is (neighbor, primary, secondary, region): region is the
+        region whose inside the edge summarises, or None for a connection
+        between two regions.
+        """
+        self.region_of = region_of
+        self.edges = edges
+        self.checksum = checksum
+
+    @classmethod
+    def build(cls, network, region_of, regions):
+        """
+        Precompute the overlay of a partition for 'cost' and 'time'.
+        """
+        edges = {'cost': {}, 'time': {}}
+
+        for metric, metric_edges in edges.items():
+            # Connections between regions, the best one for the metric per pair
+            for region in regions:
+                for station in region.boundary:
+                    best = {}
+                    for neighbor, cost, time in network.get_neighbors(station):
+                        if region_of[neighbor] == region.number:
+                            continue
+                        weight, other = (cost, time) if metric == 'cost' else (time, cost)
+                        if neighbor not in best or weight < best[neighbor][0]:
+                            best[neighbor] = (weight, other)
+                    metric_edges[station] = [(neighbor, weight, other, None)
+                                             for neighbor, (weight, other) in best.items()]
+
+            # Shortcuts across each region between its boundary stations
+            for region in regions:
+                for station in region.boundary:
+                    distances, _ = region.distances(station, metric)
+                    metric_edges[station].extend((target, weight, other, region.number)
+                                                 for target, (weight, other) in distances.items()
+                                                 if target != station)
+
+        return cls(region_of, edges, network.checksum)
+
+    def boundary_count(self):
+        """
+        Return the number of boundary stations.
+        """
+        return len(self.edges['cost'])
+
+    def edge_count(self, metric='cost'):
+        """
+        Return the number of (directed) overlay edges for a metric.
+        """
+        return sum(len(edges) for edges in self.edges[metric].values())
+
+    def save(self, filename):
+        """
+        Write the overlay to a JSON file.
+        """
+        with open(filename, 'w') as file:
+            json.dump({
+                'format': self.FORMAT_VERSION,
+                'checksum': self.checksum,
+                'region_of': self.region_of,
+                'edges': self.edges,
+            }, file)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read an overlay written by save().
+        """
+        with open(filename, 'r') as file:
+            data = json.load(file)
+
+        if data.get('format') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported overlay file format in '{filename}'")
+
+        edges = {metric: {station: [tuple(edge) for edge in station_edges]
+                          for station, station_edges in metric_edges.items()}
+                 for metric, metric_edges in data['edges'].items()}
+        return cls(data['region_of'], edges, data.get('checksum'))
+
+
+class PartitionedRouter:
+    """
+    Route queries over an Overlay and region shards.
+
+    A query searches the origin's region to its boundary, the overlay
+    from there, and the destination's region from its boundary, and
+    returns the same tuple as RouteSearcher.find_route. shards maps
+    each region number to a Region, a RegionProcess, or anything else
+    with their distances() and path() methods.
+    """
+    def __init__(self, overlay, shards):
+        """
+        Initialize with the overlay and {region number: shard}.
+        """
+        self.overlay = overlay
+        self.shards = shards
+
+    def find_route(self, start, end, optimize_for='cost'):
+        """
+        Find the best route from start to end.
+
+        Returns path, total cost, total time and connections explored.
+        """
+        region_of = self.overlay.region_of
+        if optimize_for not in ['cost', 'time'] or start not in region_of or end not in region_of:
+            return None, None, None, 0
+
+        start_region, end_region = region_of[start], region_of[end]
+        start_shard, end_shard = self.shards[start_region], self.shards[end_region]
+
+        # Origin region: to its boundary, and to the destination if it is local
+        also = [end] if start_region == end_region else None
+        from_start, connections_explored = start_shard.distances(start, optimize_for, also)
+        to_end, explored = end_shard.distances(end, optimize_for)
+        connections_explored += explored
+
+        # A route staying inside the region is the first candidate
+        best = from_start.pop(end, None) if start_region == end_region else None
+        best_exit = None
+
+        # Dijkstra over the overlay, seeded with the origin's boundary stations
+        infinity = float('infinity')
+        overlay_edges = self.overlay.edges[optimize_for]
+        distances = dict(from_start)
+        parents = {station: None for station in from_start}
+        settled = set()
+        priority_queue = [(primary, station) for station, (primary, _) in from_start.items()]
+        heapq.heapify(priority_queue)
+        bound = best[0] if best is not None else infinity
+
+        while priority_queue:
+            current_distance, current = heapq.heappop(priority_queue)
+            if current_distance >= bound:
+                break
+            if current in settled:
+                continue
+            settled.add(current)
+            current_other = distances[current][1]
+
+            # Leave the overlay into the destination region
+            if current in to_end:
+                primary, other = to_end[current]
+                if current_distance + primary < bound:
+                    bound = current_distance + primary
+                    best = (bound, current_other + other)
+                    best_exit = current
+
+            for neighbor, weight, other, region in overlay_edges.get(current, []):
+                connections_explored += 1
+                if neighbor in settled:
+                    continue
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, (infinity,))[0]:
+                    distances[neighbor] = (new_distance, current_other + other)
+                    parents[neighbor] = (current, region)
+                    heapq.heappush(priority_queue, (new_distance, neighbor))
+
+        if best is None:
+            return None, None, None, connections_explored
+
+        path = self._unpack(start, end, start_region, end_region, best_exit, parents, optimize_for)
+        total_cost, total_time = best if optimize_for == 'cost' else (best[1], best[0])
+        return path, total_cost, total_time, connections_explored
+
+    def _unpack(self, start, end, start_region, end_region, exit_station, parents, optimize_for):
+        """
+        Expand a route found on the overlay into the full list of stations.
+        """
+        if exit_station is None:
+            return self.shards[start_region].path(start, end, optimize_for)
+
+        # Overlay hops from the origin's boundary to the exit station
+        hops = []
+        station = exit_station
+        while parents[station] is not None:
+            previous, region = parents[station]
+            hops.append((previous, station, region))
+            station = previous
+        hops.reverse()
+
+        path = self.shards[start_region].path(start, station, optimize_for)
+        for previous, station, region in hops:
+            if region is None:
+                path.append(station)
+            else:
+                path.extend(self.shards[region].path(previous, station, optimize_for)[1:])
+
+        # The destination's region was searched from the destination, so
+        # follow that search back to get the route its totals describe
+        path.extend(reversed(self.shards[end_region].path(end, exit_station, optimize_for)[:-1]))
+        return path
+
+    def distance(self, start, end, optimize_for='cost'):
+        """
+        Return the total cost or time of the best route, or None if there is none.
+        """
+        path, total_cost, total_time, _ = self.find_route(start, end, optimize_for)
+        if path is None:
+            return None
+        return total_cost if optimize_for == 'cost' else total_time
+
+
+# Region served by the current RegionProcess worker
+_worker_region = None
+
+
+def _load_region_worker(filename):
+    """
+    Load a region once when its worker process starts.
+    """
+    global _worker_region
+    _worker_region = Region.load(filename)
+
+
+def _region_call(method, *args):
+    """
+    Worker task: call a method of this process's region.
+    """
+    return getattr(_worker_region, method)(*args)
+
+
+class RegionProcess:
+    """
+    A Region served from its own process, loaded from its saved file.
+
+    Offers the same distances() and path() methods as Region, so it can
+    stand in for one in a PartitionedRouter; each call is a round trip
+    to the worker process.
+    """
+    def __init__(self, filename):
+        """
+        Start the worker process and load the region into it.
+        """
+        self.pool = ProcessPoolExecutor(max_workers=1, initializer=_load_region_worker, initargs=(filename,))
+
+    def distances(self, station, metric, also=None):
+        """
+        Region.distances() in the worker process.
+        """
+        return self.pool.submit(_region_call, 'distances', station, metric, also).result()
+
+    def path(self, start, end, metric):
+        """
+        Region.path() in the worker process.
+        """
+        return self.pool.submit(_region_call, 'path', start, end, metric).result()
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        self.pool.shutdown()
@@ -0,0 +1,163 @@
+# src/priority_queues.py
+
+import heapq
+
+class HeapQueue:
+    """
+    Binary heap priority queue (heapq), for any non-negative weights.
+
+    All queues share one interface: push(key, item), pop() -> (key, item),
+    len(), and truth testing for emptiness. Items are never updated in
+    place, so a station may be queued more than once and searches skip
+    the stale entries as they come out.
+    """
+    def __init__(self):
+        """
+        Initialize an empty queue.
+        """
+        self.heap = []
+
+    def push(self, key, item):
+        """
+        Add an item with the given key.
+        """
+        heapq.heappush(self.heap, (key, item))
+
+    def pop(self):
+        """
+        Remove and return the (key, item) with the smallest key.
+        """
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class DialQueue:
+    """
+    Dial's bucket queue for integer weights no larger than max_weight.
+
+    Keys must be pushed in Dijkstra order: never smaller than the last
+    key popped, nor more than max_weight above it. Then every queued key
+    falls in a window of max_weight + 1 values, which is kept as a
+    circular array of buckets, and the next key is found by walking
+    forward to the first non-empty bucket. Push and pop take O(1) time
+    apart from that walk, which covers at most max_weight buckets.
+    """
+    def __init__(self, max_weight):
+        """
+        Initialize an empty queue for weights in 0..max_weight.
+        """
+        self.size = max_weight + 1
+        self.buckets = [[] for _ in range(self.size)]
+        self.current = 0
+        self.count = 0
+
+    def push(self, key, item):
+        """
+        Add an item with the given key.
+        """
+        self.buckets[key % self.size].append(item)
+        self.count += 1
+
+    def pop(self):
+        """
+        Remove and return the (key, item) with the smallest key.
+        """
+        if not self.count:
+            raise IndexError("pop from an empty priority queue")
+
+        buckets, size, current = self.buckets, self.size, self.current
+        while not buckets[current % size]:
+            current += 1
+        self.current = current
+        self.count -= 1
+        return current, buckets[current % size].pop()
+
+    def __len__(self):
+        return self.count
+
+
+class RadixHeap:
+    """
+    Radix heap for monotone integer keys.
+
+    Like DialQueue, keys must never be smaller than the last key popped,
+    but they need no upper bound. Bucket i holds the keys that first
+    differ from the last popped key in bit i - 1, so there is one bucket
+    per bit of the largest key. Popping from an empty bucket 0 empties
+    the lowest non-empty bucket into the smaller ones; each entry moves
+    down at most once per bit, for O(log C) amortised work per entry.
+    """
+    def __init__(self, bits=64):
+        """
+        Initialize an empty queue for keys below 2 ** bits.
+        """
+        self.buckets = [[] for _ in range(bits + 1)]
+        self.last = 0
+        self.count = 0
+
+    def push(self, key, item):
+        """
+        Add an item with the given key.
+        """
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        self.count += 1
+
+    def pop(self):
+        """
+        Remove and return the (key, item) with the smallest key.
+        """
+        if not self.count:
+            raise IndexError("pop from an empty priority queue")
+
+        buckets = self.buckets
+        if not buckets[0]:
+            # Redistribute the lowest non-empty bucket around its minimum
+            index = 1
+            while not buckets[index]:
+                index += 1
+            entries = buckets[index]
+            buckets[index] = []
+            last = self.last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ last).bit_length()].append(entry)
+
+        self.count -= 1
+        return buckets[0].pop()
+
+    def __len__(self):
+        return self.count
+
+
+# Backends selectable by name through RouteSearcher(queue=...)
+QUEUES = ('heap', 'dial', 'radix')
+
+# Largest weight for which 'auto' picks Dial's buckets over the radix heap
+DIAL_MAX_WEIGHT = 1 << 12
+
+
+def choose_queue(max_weight):
+    """
+    Return the queue kind 'auto' selects for a metric's largest weight.
+
+    Integer weights get a bucket queue: Dial's when the weights are small
+    enough for its circular array, else a radix heap. Anything else
+    (None, floats or negative weights) falls back to the binary heap.
+    """
+    if not isinstance(max_weight, int) or max_weight < 0:
+        return 'heap'
+    if max_weight <= DIAL_MAX_WEIGHT:
+        return 'dial'
+    return 'radix'
+
+
+def make_queue(kind, max_weight=None):
+    """
+    Return an empty queue of the given kind ('heap', 'dial' or 'radix').
+    """
+    if kind == 'dial':
+        return DialQueue(max_weight)
+    if kind == 'radix':
+        return RadixHeap()
+    return HeapQueue()
@@ -1,7 +1,31 @@
 # src/railway_network.py
 
 import csv
+import hashlib
 import os
+import weakref
+from collections import namedtuple
+
+from src.compact_graph import CompactGraph
+from src import network_loader, network_snapshot
+
+def file_checksum(filename):
+    """
+    Return the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Passed to change listeners: the connection's (cost, time) pairs before and after
+ConnectionChange = namedtuple(
+    'ConnectionChange',
+    ['station1', 'station2', 'old_edges', 'new_edges', 'previous_version', 'version']
+)
+
 
 class RailwayNetwork:
     """
@@ -17,16 +41,43 @@ class RailwayNetwork:
 
         # Stores all station names
         self.stations = set()
+
+        # Optional integer-indexed CSR form, built by compile()
+        self.compact = None
+
+        # CSV the network was loaded from, and its checksum
+        self.source_file = None
+        self.checksum = None
+
+        # Incremented on every reload or change, so caches can detect stale results
+        self.version = 0
+
+        # Closed connections: {(station1, station2): [(cost, time), ...]}
+        self.closed = {}
+
+        # True once the network differs from its source file
+        self.modified = False
+
+        # Best connection per station pair and metric, built by get_edge()
+        self.edge_index = None
+        self.edge_index_version = None
+
+        # Weak references to callbacks told about every connection change
+        self.listeners = []
     
     def load_from_csv(self, filename):
         """
         Load railway stations and connections from a CSV file.
 
-        Each row in CSV should be: station1, station2, cost, time
+        Each row in CSV should be: station1, station2, cost, time. The
+        file replaces any stations and connections loaded before.
         """
         try:
             with open(filename, 'r') as file:
                 csv_reader = csv.reader(file)
+
+                # Start from an empty network, so reloading does not duplicate edges
+                self._reset()
                 
                 for row in csv_reader:
 
@@ -44,23 +95,17 @@ class RailwayNetwork:
                     cost = int(row[2].strip())
                     time = int(row[3].strip())
                     
-                    # Store station names
-                    self.stations.add(station1)
-                    self.stations.add(station2)
-                    
-                    # Create empty list if station not seen before
-                    if station1 not in self.graph:
-                        self.graph[station1] = []
-                    if station2 not in self.graph:
-                        self.graph[station2] = []
-                    
-                    # Add bidirectional edges
-                    # Each edge stores: (neighbor_station, cost, time)
-                    self.graph[station1].append((station2, cost, time))
-                    self.graph[station2].append((station1, cost, time))
+                    self._add_edge(station1, station2, cost, time)
             
+            # Remember the source so precomputed data can be matched to it
+            self.source_file = os.path.abspath(filename)
+            self.checksum = file_checksum(filename)
+            self.compact = None
+            self.modified = False
+            self.version += 1
+
             print(f" Network loaded: {len(self.stations)} stations, "
-                  f"{sum(len(neighbors) for neighbors in self.graph.values()) // 2} connections")
+                  f"{self.connection_count()} connections")
         
         except FileNotFoundError:
             print(f"Error: File '{filename}' not found!")
@@ -69,12 +114,314 @@ class RailwayNetwork:
             print(f"Error loading network: {e}")
             exit(1)
     
+    def load_streaming(self, filename, workers=None, merge_parallel=True):
+        """
+        Load the network with the parallel chunked loader (see network_loader).
+
+        Replaces the current stations and connections. Invalid rows are
+        reported rather than stopping the load, and of parallel
+        connections only the cheapest and the fastest are kept unless
+        merge_parallel is False. Returns the LoadReport, or None if the
+        file does not exist.
+        """
+        try:
+            edges, report = network_loader.load_edges(filename, workers, merge_parallel=merge_parallel)
+        except FileNotFoundError:
+            print(f"Error: File '{filename}' not found!")
+            return None
+
+        self._reset()
+        for station1, station2, cost, time in edges:
+            self._add_edge(station1, station2, cost, time)
+
+        self.source_file = os.path.abspath(filename)
+        self.checksum = file_checksum(filename)
+        self.compact = None
+        self.modified = False
+        self.version += 1
+
+        print(f" Network loaded: {len(self.stations)} stations, "
+              f"{self.connection_count()} connections")
+        print(report.summary())
+        return report
+
+    def _reset(self):
+        """
+        Drop all stations and connections, including closed ones, before a load.
+        """
+        self.graph = {}
+        self.stations = set()
+        self.closed = {}
+        self.edge_index = None
+        self.edge_index_version = None
+
+    def _add_edge(self, station1, station2, cost, time):
+        """
+        Add a connection in both directions without notifying listeners.
+        """
+        # Store station names
+        self.stations.add(station1)
+        self.stations.add(station2)
+        
+        # Create empty list if station not seen before
+        if station1 not in self.graph:
+            self.graph[station1] = []
+        if station2 not in self.graph:
+            self.graph[station2] = []
+        
+        # Add bidirectional edges
+        # Each edge stores: (neighbor_station, cost, time)
+        self.graph[station1].append((station2, cost, time))
+        self.graph[station2].append((station1, cost, time))
+
+    def load_with_snapshot(self, filename):
+        """
+        Load the network from its compiled snapshot, falling back to the CSV.
+
+        The snapshot next to the CSV is memory-mapped if it was built from
+        the CSV's current contents. Otherwise the CSV is parsed and a new
+        snapshot is written for the next start.
+        """
+        snapshot_file = network_snapshot.snapshot_path(filename)
+
+        try:
+            checksum = file_checksum(filename)
+        except FileNotFoundError:
+            print(f"Error: File '{filename}' not found!")
+            exit(1)
+
+        if os.path.exists(snapshot_file):
+            try:
+                if network_snapshot.read_snapshot_checksum(snapshot_file) == checksum:
+                    compact, _ = network_snapshot.load_snapshot(snapshot_file)
+                    self.use_compact(compact, checksum, filename)
+
+                    print(f" Network loaded from snapshot: {len(self.stations)} stations, "
+                          f"{self.connection_count()} connections")
+                    return
+            except (OSError, ValueError) as e:
+                print(f" Ignoring snapshot '{snapshot_file}': {e}")
+
+        # Snapshot missing or stale: parse the CSV and write a fresh one,
+        # then serve lookups from the packed arrays as a loaded snapshot would
+        self.load_from_csv(filename)
+        self.compile(release_graph=True)
+        try:
+            network_snapshot.save_snapshot(self.compact, self.checksum, snapshot_file)
+        except OSError as e:
+            print(f" Could not save snapshot '{snapshot_file}': {e}")
+
+    def use_compact(self, compact, checksum, source_file=None):
+        """
+        Replace the network with a CompactGraph, e.g. one mapped from a snapshot.
+
+        The dict graph is left empty, so lookups read the packed arrays
+        and nothing is copied out of them until the network is edited.
+        """
+        self._reset()
+        self.compact = compact
+        self.stations = set(compact.names)
+        self.source_file = os.path.abspath(source_file) if source_file is not None else None
+        self.checksum = checksum
+        self.modified = False
+        self.version += 1
+
+    def add_listener(self, callback):
+        """
+        Register a callback(change) run after every connection change.
+
+        Only a weak reference is kept, so listeners do not outlive their owners.
+        """
+        if hasattr(callback, '__self__'):
+            self.listeners.append(weakref.WeakMethod(callback))
+        else:
+            self.listeners.append(weakref.ref(callback))
+
+    def connection_edges(self, station1, station2):
+        """
+        Return the (cost, time) pairs of all open connections between two stations.
+        """
+        return [(cost, time) for neighbor, cost, time in self.get_neighbors(station1) if neighbor == station2]
+
+    def add_connection(self, station1, station2, cost, time):
+        """
+        Add a new connection between two stations.
+        """
+        self._change_connection(station1, station2, lambda edges: edges + [(cost, time)])
+
+    def close_connection(self, station1, station2):
+        """
+        Close every connection between two stations, e.g. for engineering works.
+
+        Returns False if there was no open connection to close.
+        """
+        if not self.connection_edges(station1, station2):
+            return False
+
+        def close(edges):
+            key = (station1, station2) if station1 <= station2 else (station2, station1)
+            self.closed.setdefault(key, []).extend(edges)
+            return []
+
+        self._change_connection(station1, station2, close)
+        return True
+
+    def reopen_connection(self, station1, station2):
+        """
+        Reopen connections closed with close_connection().
+
+        Returns False if nothing between the two stations was closed.
+        """
+        key = (station1, station2) if station1 <= station2 else (station2, station1)
+        if key not in self.closed:
+            return False
+
+        reopened = self.closed.pop(key)
+        self._change_connection(station1, station2, lambda edges: edges + reopened)
+        return True
+
+    def update_connection(self, station1, station2, cost=None, time=None):
+        """
+        Change the cost and/or time of the connections between two stations.
+
+        Returns False if the stations are not directly connected.
+        """
+        if not self.connection_edges(station1, station2):
+            return False
+
+        self._change_connection(station1, station2, lambda edges: [
+            (edge_cost if cost is None else cost, edge_time if time is None else time)
+            for edge_cost, edge_time in edges
+        ])
+        return True
+
+    def _change_connection(self, station1, station2, change):
+        """
+        Replace the connections between two stations with change(old_edges).
+
+        Keeps both directions in step, bumps the version and notifies listeners.
+        """
+        # Edits are made on the dict graph; the packed form is rebuilt on demand
+        if not self.graph and self.compact is not None:
+            self.graph = self.compact.to_graph()
+        self.compact = None
+
+        old_edges = self.connection_edges(station1, station2)
+        new_edges = change(old_edges)
+
+        for a, b in ((station1, station2), (station2, station1)):
+            kept = [edge for edge in self.graph.get(a, []) if edge[0] != b]
+            self.graph[a] = kept + [(b, cost, time) for cost, time in new_edges]
+            self.stations.add(a)
+
+        # Keep a current edge index current instead of rebuilding it
+        index_current = self.edge_index is not None and self.edge_index_version == self.version
+
+        self.modified = True
+        self.version += 1
+
+        if index_current:
+            key = (station1, station2) if station1 <= station2 else (station2, station1)
+            best = self._best_edges(new_edges)
+            if best is None:
+                self.edge_index.pop(key, None)
+            else:
+                self.edge_index[key] = best
+            self.edge_index_version = self.version
+
+        event = ConnectionChange(station1, station2, old_edges, new_edges, self.version - 1, self.version)
+        for reference in list(self.listeners):
+            callback = reference()
+            if callback is None:
+                self.listeners.remove(reference)
+            else:
+                callback(event)
+
+    def __getstate__(self):
+        """
+        Prepare the network for pickling (e.g. to send it to worker processes).
+
+        Listeners are not sent, and memory-mapped arrays are expanded.
+        """
+        state = self.__dict__.copy()
+        state['listeners'] = []
+        state['edge_index'] = None
+        if self.compact is not None and isinstance(self.compact.offsets, memoryview):
+            state['graph'] = self.graph or self.compact.to_graph()
+            state['compact'] = None
+        return state
+
+    def compile(self, release_graph=False):
+        """
+        Build the compact CSR representation of the network.
+
+        With release_graph=True the dict graph is dropped afterwards and
+        neighbour lookups are served from the packed arrays instead.
+        """
+        self.compact = CompactGraph.from_graph(self.graph)
+
+        if release_graph:
+            self.graph = {}
+
+        return self.compact
+
+    def connection_count(self):
+        """
+        Return the number of (undirected) connections in the network.
+        """
+        if not self.graph and self.compact is not None:
+            return self.compact.edge_count() // 2
+        return sum(len(neighbors) for neighbors in self.graph.values()) // 2
+
     def get_neighbors(self, station):
         """
         Return a list of neighboring stations with cost and time.
         """
+        # Fall back to the packed arrays once the dict graph is released
+        if not self.graph and self.compact is not None:
+            return self.compact.get_neighbors(station)
         return self.graph.get(station, [])
     
+    def get_edge(self, station1, station2, optimize_for='cost'):
+        """
+        Return the (cost, time) of the connection between two stations, or None.
+
+        Among parallel connections this is the one a search for
+        optimize_for relaxes: the smallest weight, the first listed on a
+        tie. The lookup is O(1): an index of every station pair is built
+        on first use and kept up to date through connection changes.
+        """
+        if self.edge_index is None or self.edge_index_version != self.version:
+            self._build_edge_index()
+
+        key = (station1, station2) if station1 <= station2 else (station2, station1)
+        best = self.edge_index.get(key)
+        if best is None:
+            return None
+        return best[0] if optimize_for == 'cost' else best[1]
+
+    def _build_edge_index(self):
+        """
+        Index the best connection for each metric of every connected station pair.
+        """
+        pairs = {}
+        for station in self.stations:
+            for neighbor, cost, time in self.get_neighbors(station):
+                if station < neighbor:
+                    pairs.setdefault((station, neighbor), []).append((cost, time))
+
+        self.edge_index = {key: self._best_edges(edges) for key, edges in pairs.items()}
+        self.edge_index_version = self.version
+
+    @staticmethod
+    def _best_edges(edges):
+        """
+        Return (cheapest, fastest) of a pair's (cost, time) connections, or None if there are none.
+        """
+        if not edges:
+            return None
+        return min(edges, key=lambda edge: edge[0]), min(edges, key=lambda edge: edge[1])
+
     def station_exists(self, station):
         """
         Check if a station exists in the network.
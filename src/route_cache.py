@@ -0,0 +1,166 @@
+# src/route_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+class RouteCache:
+    """
+    Bounded LRU cache of route search results.
+
+    Entries are keyed on (start, end, optimize_for). Because every
+    connection runs in both directions, a route cached for A -> B also
+    answers B -> A by reversing the path. The whole cache is dropped
+    whenever the network's version changes (reload or edit), unless the
+    change was passed to repair() first.
+    """
+    def __init__(self, max_size=1024, ttl=None, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        max_size bounds the number of entries and ttl (seconds, or None)
+        bounds their age.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+
+        # key -> (expiry time or None, path, total cost, total time)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Network version the entries were computed against
+        self.version = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.repairs = 0
+
+    @staticmethod
+    def _key(start, end, optimize_for):
+        """
+        Return the direction-independent key and whether the query is reversed.
+        """
+        if end < start:
+            return (end, start, optimize_for), True
+        return (start, end, optimize_for), False
+
+    def _check_version(self, network):
+        """
+        Drop every entry if the network has changed since they were stored.
+        """
+        if network.version != self.version:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.version = network.version
+
+    def get(self, network, start, end, optimize_for):
+        """
+        Return a cached (path, total cost, total time), or None on a miss.
+        """
+        key, reversed_query = self._key(start, end, optimize_for)
+
+        with self.lock:
+            self._check_version(network)
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # Expired entries count as misses
+            expires, path, total_cost, total_time = entry
+            if expires is not None and self.clock() >= expires:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        if path is not None and reversed_query:
+            path = path[::-1]
+        return path, total_cost, total_time
+
+    def put(self, network, start, end, optimize_for, path, total_cost, total_time):
+        """
+        Store a search result, evicting the least recently used entry if full.
+        """
+        if self.max_size <= 0:
+            return
+
+        key, reversed_query = self._key(start, end, optimize_for)
+        if path is not None and reversed_query:
+            path = path[::-1]
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+
+        with self.lock:
+            self._check_version(network)
+            self.entries[key] = (expires, path, total_cost, total_time)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def repair(self, change):
+        """
+        Drop only the entries a connection change can affect.
+
+        A route through the changed connection is always dropped. Other
+        routes stay correct when the connection got dearer or closed, and
+        are dropped only for a metric where it got cheaper or reopened.
+        """
+        infinity = float('infinity')
+
+        with self.lock:
+            # Already out of date: the next lookup will clear everything
+            if self.version != change.previous_version:
+                return
+
+            decreased = set()
+            for metric, i in (('cost', 0), ('time', 1)):
+                old = min((edge[i] for edge in change.old_edges), default=infinity)
+                new = min((edge[i] for edge in change.new_edges), default=infinity)
+                if new < old:
+                    decreased.add(metric)
+
+            pair = {change.station1, change.station2}
+            for key, (_, path, _, _) in list(self.entries.items()):
+                uses_connection = path is not None and any(
+                    {a, b} == pair for a, b in zip(path, path[1:]))
+                if uses_connection or key[2] in decreased:
+                    del self.entries[key]
+                    self.repairs += 1
+
+            self.version = change.version
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters as a dict.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'repairs': self.repairs,
+        }
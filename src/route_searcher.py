@@ -1,68 +1,459 @@
 # src/route_searcher.py
 
 import heapq
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import groupby, repeat
+from time import perf_counter
+
+from src.distance_matrix import DistanceMatrix
+from src.priority_queues import QUEUES, choose_queue, make_queue
+from src.railway_network import RailwayNetwork
+from src.search_stats import SearchCancelled, SearchStats
+from src.search_tree import SearchTree
+from src.shared_network import attach_network, memory_usage
 
 class RouteSearcher:
     """
     Finds routes in a railway network using Dijkstra's algorithm.
     """
-    def __init__(self, network):
+    def __init__(self, network, cache=None, max_trees=0, max_tree_entries=1000000, queue='auto'):
         """
         Initialize with a RailwayNetwork instance.
+
+        cache is an optional RouteCache consulted before every search.
+        max_trees > 0 keeps up to that many resumable Dijkstra searches,
+        one per (origin, metric), holding at most max_tree_entries
+        stations between them.
+
+        queue selects the priority queue of Dijkstra searches: 'heap',
+        'dial' (bucket queue), 'radix' (radix heap), or 'auto', which
+        picks a bucket queue when the metric's weights are bounded
+        integers and the binary heap otherwise.
         """
+        if queue != 'auto' and queue not in QUEUES:
+            raise ValueError(f"Unknown priority queue '{queue}'")
+
         self.network = network
+        self.cache = cache
+
+        # Priority queue backend, and the largest weight per metric it was chosen for
+        self.queue = queue
+        self.max_weights = {}
+        self.max_weights_version = None
+
+        # Resumable per-origin search trees, least recently used first
+        self.max_trees = max_trees
+        self.max_tree_entries = max_tree_entries
+        self.trees = OrderedDict()
+        self.trees_version = network.version
+
+        # Repair retained results when connections are closed or repriced
+        network.add_listener(self._on_network_change)
+
+        # Landmark tables for A* search, attached with use_landmarks()
+        self.landmarks = None
+
+        # Contraction hierarchies by metric, attached with use_hierarchy()
+        self.hierarchies = {}
+
+        # Hub labels by metric, attached with use_hub_labels()
+        self.hub_labels = {}
+
+        # Callbacks given the SearchStats of every find_route query
+        self.hooks = []
+
+        # SearchStats of the most recent find_route query
+        self.last_stats = None
+
+        # Search algorithms selectable through find_route(algorithm=...)
+        self.algorithms = {
+            'dijkstra': self._dijkstra,
+            'bidirectional': self._bidirectional_dijkstra,
+            'astar': self._astar,
+            'ch': self._contraction_hierarchy_search,
+            'hl': self._hub_label_search,
+        }
+
+    def use_landmarks(self, landmarks):
+        """
+        Attach a LandmarkIndex whose distance tables guide A* searches.
+        """
+        self.landmarks = landmarks
+
+    def use_hierarchy(self, hierarchy):
+        """
+        Attach a ContractionHierarchy used by 'ch' searches for its metric.
+        """
+        self.hierarchies[hierarchy.metric] = hierarchy
+
+    def use_hub_labels(self, labels):
+        """
+        Attach HubLabels used by distance() and 'hl' searches for their metric.
+        """
+        self.hub_labels[labels.metric] = labels
+
+    def add_hook(self, hook):
+        """
+        Register a callable run with the SearchStats of every find_route query.
+
+        With no hooks registered nothing is exported.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Unregister a hook added with add_hook().
+        """
+        self.hooks.remove(hook)
     
-    def find_route(self, start, end, optimize_for='cost'):
+    def _on_network_change(self, change):
+        """
+        Bring retained search state up to date after a connection change.
+
+        Search trees and cached routes are repaired incrementally.
+        Contraction hierarchies and hub labels for a metric whose weight changed are
+        dropped, and landmark tables are dropped if any weight fell,
+        because their lower bounds could then overestimate.
+        """
+        if self.trees_version == change.previous_version:
+            for tree in self.trees.values():
+                tree.repair(change.station1, change.station2)
+            self.trees_version = change.version
+
+        if self.cache is not None:
+            self.cache.repair(change)
+
+        infinity = float('infinity')
+        for metric, i in (('cost', 0), ('time', 1)):
+            old = min((edge[i] for edge in change.old_edges), default=infinity)
+            new = min((edge[i] for edge in change.new_edges), default=infinity)
+            if new != old:
+                self.hierarchies.pop(metric, None)
+                self.hub_labels.pop(metric, None)
+            if new < old:
+                self.landmarks = None
+
+    def find_route(self, start, end, optimize_for='cost', algorithm='dijkstra', cancel=None):
         """
         Find best route from start to end.
 
+        algorithm selects the search: 'dijkstra' (default),
+        'bidirectional', which searches from both ends and meets in the middle,
+        'astar', which is guided by the landmark tables from use_landmarks(),
+        'ch', which queries the contraction hierarchy from use_hierarchy(),
+        or 'hl', which follows the hub labels from use_hub_labels().
+
         Returns path, total cost, total time, and edges explored.
+        Results served from the cache report 0 edges explored.
+
+        The work and time of the query are recorded in a SearchStats,
+        kept as last_stats and passed to every hook from add_hook().
+
+        cancel is an optional threading.Event, for searches run on another
+        thread: once it is set the search stops at its next step and
+        raises SearchCancelled.
         """
-        # Prevent search if graph is empty
-        if not self.network.graph:
+        # Prevent search if network is empty
+        if not self.network.stations:
             print("Railway network is empty!")
-            return None, None, None
+            return None, None, None, 0
+
+        # Stop if algorithm is not known
+        if algorithm not in self.algorithms:
+            print(f"Unknown search algorithm '{algorithm}'!")
+            return None, None, None, 0
+
+        stats = SearchStats(start, end, optimize_for, algorithm)
+        self.last_stats = stats
+        
+        # Answer repeated queries from the cache without searching
+        if self.cache is not None:
+            started = perf_counter()
+            cached = self.cache.get(self.network, start, end, optimize_for)
+            if cached is not None:
+                path, total_cost, total_time = cached
+                stats.search_time = perf_counter() - started
+                stats.cached = True
+                stats.found = path is not None
+                self._report(stats)
+                return path, total_cost, total_time, 0
         
-        # Run Dijkstra's algorithm
-        distances, parents, connections_explored = self._dijkstra(start, end, optimize_for)
+        # Run the selected shortest path search
+        started = perf_counter()
+        distances, parents, secondary, connections_explored = self.algorithms[algorithm](
+            start, end, optimize_for, stats, cancel)
+        searched = perf_counter()
+        stats.search_time = searched - started
+        stats.connections_explored = connections_explored
         
         # Check if destination is reachable
         if end not in parents:
-            return None, None, None, connections_explored
-        
-        # Reconstruct path
-        path = self._reconstruct_path(parents, start, end)
-        
-        # Calculate total cost and time for the path
-        total_cost, total_time = self._calculate_route_details(path)
+            path, total_cost, total_time = None, None, None
+        else:
+            # Reconstruct path
+            path = self._reconstruct_path(parents, start, end)
+            reconstructed = perf_counter()
+            
+            # Searches that carry the other metric already know both totals
+            if secondary is None:
+                total_cost, total_time = self._calculate_route_details(path, optimize_for)
+            elif optimize_for == 'cost':
+                total_cost, total_time = distances[end], secondary
+            else:
+                total_cost, total_time = secondary, distances[end]
+            stats.reconstruct_time = reconstructed - searched
+            stats.details_time = perf_counter() - reconstructed
+            stats.found = True
+
+        if self.cache is not None and optimize_for in ['cost', 'time']:
+            self.cache.put(self.network, start, end, optimize_for, path, total_cost, total_time)
+
+        self._report(stats)
         
         return path, total_cost, total_time, connections_explored
+
+    def _report(self, stats):
+        """
+        Pass a query's statistics to the registered hooks.
+        """
+        if self.hooks:
+            for hook in self.hooks:
+                hook(stats)
     
-    def _dijkstra(self, start, end, optimize_for):
+    def find_routes(self, queries, workers=1, algorithm='dijkstra', ordered=True, group_size=64, shared=None):
+        """
+        Answer many (start, end[, optimize_for]) queries, optionally across processes.
+
+        Queries are grouped by origin so each group reuses one resumable
+        search tree. With workers > 1 the groups are spread over a process
+        pool whose workers load the network once, when they start, or
+        attach to it if shared (a SharedNetwork of this network) is given;
+        it must stay published until the results have been read.
+
+        Yields (index, result) pairs, where index is the query's position in
+        the input and result is what find_route returns. With ordered=True
+        results come in input order, otherwise as soon as they are ready.
+        """
+        # Normalise queries and sort them by origin, remembering their position
+        normalised = []
+        for index, query in enumerate(queries):
+            start, end = query[0], query[1]
+            optimize_for = query[2] if len(query) > 2 else 'cost'
+            normalised.append((index, start, end, optimize_for))
+        normalised.sort(key=lambda q: (q[1], q[3]))
+
+        # Split each origin's queries into groups of at most group_size
+        groups = []
+        for _, same_origin in groupby(normalised, key=lambda q: (q[1], q[3])):
+            same_origin = list(same_origin)
+            for i in range(0, len(same_origin), group_size):
+                groups.append(same_origin[i:i + group_size])
+
+        if workers <= 1:
+            results = self._run_groups_locally(groups, algorithm)
+        else:
+            results = self._run_groups_in_pool(groups, algorithm, workers, shared)
+
+        if not ordered:
+            yield from results
+            return
+
+        # Hold back results until every earlier query has been answered
+        waiting = {}
+        next_index = 0
+        for index, result in results:
+            waiting[index] = result
+            while next_index in waiting:
+                yield next_index, waiting.pop(next_index)
+                next_index += 1
+
+    def _batch_searcher_args(self, shared=None):
+        """
+        Return the arguments that let a worker process rebuild this searcher.
+
+        With a SharedNetwork, workers attach to its segment. Otherwise
+        networks loaded from a CSV are reloaded from it; others, including
+        networks edited since loading, are sent whole.
+        """
+        if shared is not None:
+            source_file, network, shared_name = None, None, shared.name
+        else:
+            network = self.network if self.network.source_file is None or self.network.modified else None
+            source_file, shared_name = self.network.source_file, None
+        return (source_file, network, shared_name, self.landmarks, self.hierarchies, self.hub_labels,
+                max(self.max_trees, 8), self.max_tree_entries, self.queue)
+
+    def create_pool(self, workers, shared=None):
+        """
+        Return a process pool whose workers each hold a copy of this searcher.
+
+        With shared (a SharedNetwork of this network), workers attach to
+        the published arrays instead of each loading their own copy; it
+        must stay published while the pool runs. Submit route_in_worker()
+        to the pool to search without blocking the caller, and
+        worker_status() to see a worker's load time and memory.
+        """
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                   initargs=self._batch_searcher_args(shared))
+
+    def _run_groups_locally(self, groups, algorithm):
+        """
+        Answer query groups in this process.
+        """
+        searcher = _make_batch_searcher(self.network, *self._batch_searcher_args()[3:])
+        for group in groups:
+            yield from _answer_group(searcher, group, algorithm)
+
+    def _run_groups_in_pool(self, groups, algorithm, workers, shared=None):
+        """
+        Answer query groups in a process pool, yielding results as groups finish.
+        """
+        # Bound the groups in flight so huge batches are not all queued at once
+        max_in_flight = workers * 4
+        remaining = iter(groups)
+
+        with self.create_pool(workers, shared) as pool:
+            in_flight = set()
+            for group in remaining:
+                in_flight.add(pool.submit(_run_batch_group, group, algorithm))
+                if len(in_flight) >= max_in_flight:
+                    break
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+                    group = next(remaining, None)
+                    if group is not None:
+                        in_flight.add(pool.submit(_run_batch_group, group, algorithm))
+
+    def _queue_for(self, optimize_for):
+        """
+        Return the (queue kind, largest weight) Dijkstra uses for a metric.
+
+        Bucket queues need non-negative integer weights; if the network
+        has any other weight, the binary heap is used instead.
+        """
+        # Weights are rescanned only after the network changes
+        if self.max_weights_version != self.network.version:
+            self.max_weights = {}
+            self.max_weights_version = self.network.version
+
+        if optimize_for not in self.max_weights:
+            if not self.network.graph and self.network.compact is not None:
+                weights = self.network.compact.weights(optimize_for)
+                max_weight = max(weights, default=0)
+            else:
+                position = 1 if optimize_for == 'cost' else 2
+                max_weight = 0
+                for neighbors in self.network.graph.values():
+                    for edge in neighbors:
+                        weight = edge[position]
+                        if type(weight) is not int or weight < 0:
+                            max_weight = None
+                            break
+                        max_weight = max(max_weight, weight)
+                    if max_weight is None:
+                        break
+            self.max_weights[optimize_for] = max_weight
+
+        max_weight = self.max_weights[optimize_for]
+        if self.queue == 'auto' or choose_queue(max_weight) == 'heap':
+            return choose_queue(max_weight), max_weight
+        return self.queue, max_weight
+
+    def _dijkstra(self, start, end, optimize_for, stats=None, cancel=None):
         """
         Internal Dijkstra algorithm to compute shortest paths.
+
+        The priority queue is chosen by _queue_for(). If stats (a
+        SearchStats) is given, the queue work is added to it.
+
+        Returns distances, parents, the other metric's total along the
+        route to end (None if end was not reached) and the number of
+        connections explored. Every search returns this tuple; those that
+        do not carry the other metric return None for it.
+        """
+        # Stop if invalid optimization choice
+        if optimize_for not in ['cost', 'time']:
+            return {}, {}, None, 0
+
+        # Resume a retained search from this origin when enabled
+        if self.max_trees > 0:
+            return self._tree_search(start, end, optimize_for, stats, cancel)
+
+        distances, parents, others, connections_explored = self._settle(
+            start, None if end is None else [end], optimize_for, stats=stats, cancel=cancel)
+        return distances, parents, others.get(end), connections_explored
+
+    def _settle(self, start, targets, optimize_for, budget=None, stats=None, cancel=None):
+        """
+        Grow a shortest path tree for optimize_for, carrying the other metric along.
+
+        Stops once every station in targets is settled; with targets None
+        the tree is grown until the queue is empty. A budget prunes every
+        route longer than it, so then the tree holds exactly the stations
+        within the budget. Dispatches to the dict, compact or bucket queue
+        loop (see _queue_for()).
+
+        Returns distances, parents and the other metric's totals, keyed by
+        station, and the number of connections explored. Distances and
+        parents cover every station reached; the other metric's totals
+        cover the reached targets, or every station reached without targets.
+
+        Of two equally short routes the one better by the other metric is
+        kept, whatever order the queue settles equal distances in, so every
+        queue backend gives the same totals (as long as no connection
+        weighs zero, which could tie a station with one settled before it).
+        """
+        kind, max_weight = self._queue_for(optimize_for)
+
+        # Use the integer-indexed search when the network is compiled
+        if self.network.compact is not None:
+            if kind == 'dial':
+                return self._dijkstra_buckets(start, targets, optimize_for, max_weight, budget, stats, cancel)
+            return self._dijkstra_compact(start, targets, optimize_for, kind, budget, stats, cancel)
+        return self._dijkstra_graph(start, targets, optimize_for, kind, max_weight, budget, stats, cancel)
+
+    def _dijkstra_graph(self, start, targets, optimize_for, kind, max_weight, budget=None, stats=None, cancel=None):
+        """
+        Dijkstra's algorithm over the dict graph. See _settle().
         """
 
         # counts explored edges
         connections_explored = 0 
+        relaxations = 0
 
-        # Stop if invalid optimization choice
-        if optimize_for not in ['cost', 'time']:
-            return {}, {}
+        # Stations still to settle before stopping; those not in the network never will be
+        remaining = None
+        if targets is not None:
+            remaining = {station for station in targets if self.network.station_exists(station)}
         
-        # Initialize data structures
-        distances = {station: float('infinity') for station in self.network.stations}
-        distances[start] = 0
+        # Initialize data structures; stations not yet reached are absent
+        infinity = float('infinity')
+        distances = {start: 0}
+        limit = infinity if budget is None else budget
+
+        # Total of the other metric along each station's best route
+        others = {start: 0}
+        use_cost = optimize_for == 'cost'
         
         parents = {start: None}
         visited = set()
         
-        # Min-heap to always pick smallest distance
-        priority_queue = [(0, start)]
+        # Priority queue to always pick smallest distance
+        priority_queue = make_queue(kind, max_weight)
+        push, pop = priority_queue.push, priority_queue.pop
+        push(0, start)
         
         while priority_queue:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
             # Get station with minimum distance
-            current_distance, current_station = heapq.heappop(priority_queue)
+            current_distance, current_station = pop()
             
             # Skip if already visited (handles duplicate entries in queue)
             if current_station in visited:
@@ -71,9 +462,11 @@ class RouteSearcher:
             # Mark as visited
             visited.add(current_station)
             
-            # Early termination: found destination
-            if current_station == end:
-                break
+            # Early termination: every destination found
+            if remaining is not None:
+                remaining.discard(current_station)
+                if not remaining:
+                    break
             
             # Explore neighbors
             for neighbor, cost, time in self.network.get_neighbors(current_station):
@@ -81,19 +474,891 @@ class RouteSearcher:
 
                 if neighbor not in visited:
                     # Choose weight based on optimization criterion
-                    weight = cost if optimize_for == 'cost' else time
+                    weight, other_weight = (cost, time) if use_cost else (time, cost)
                     
                     # Calculate new distance
                     new_distance = current_distance + weight
                     
-                    # Relaxation step: update if found a shorter path
-                    if new_distance < distances[neighbor]:
+                    # Relaxation step: update if found a shorter path within the budget
+                    old_distance = distances.get(neighbor, infinity)
+                    if new_distance <= limit and new_distance < old_distance:
                         distances[neighbor] = new_distance
+                        others[neighbor] = others[current_station] + other_weight
+                        parents[neighbor] = current_station
+                        push(new_distance, neighbor)
+                        relaxations += 1
+
+                    # Break ties on the other metric; the queued entry stays valid
+                    elif new_distance == old_distance and others[current_station] + other_weight < others[neighbor]:
+                        others[neighbor] = others[current_station] + other_weight
                         parents[neighbor] = current_station
-                        heapq.heappush(priority_queue, (new_distance, neighbor))
+
+        # Every relaxation pushed one entry after the start's
+        if stats is not None:
+            pushes = relaxations + 1
+            stats.add_search(pushes, pushes - len(priority_queue), len(visited), relaxations)
         
-        return distances, parents, connections_explored
+        return distances, parents, others, connections_explored
     
+    def _tree_search(self, start, end, optimize_for, stats=None, cancel=None):
+        """
+        Dijkstra's algorithm through the retained SearchTree for start.
+
+        A destination that is already settled costs no further work; any
+        other destination resumes the stored search.
+        """
+        # Trees built on an older version of the network are no longer valid
+        if self.network.version != self.trees_version:
+            self.trees.clear()
+            self.trees_version = self.network.version
+
+        key = (start, optimize_for)
+        tree = self.trees.get(key)
+        if tree is None:
+            tree = SearchTree(self.network, start, optimize_for)
+            self.trees[key] = tree
+        self.trees.move_to_end(key)
+
+        connections_explored = tree.settle(end, stats, cancel)
+        self._trim_trees()
+
+        return tree.distances, tree.parents, None, connections_explored
+
+    def _trim_trees(self):
+        """
+        Evict least recently used trees until both limits are respected.
+        """
+        total = sum(len(tree) for tree in self.trees.values())
+
+        # The tree just used is always kept, even if it alone exceeds the limit
+        while len(self.trees) > self.max_trees or (total > self.max_tree_entries and len(self.trees) > 1):
+            _, tree = self.trees.popitem(last=False)
+            total -= len(tree)
+
+    def _dijkstra_compact(self, start, targets, optimize_for, kind='heap', budget=None, stats=None, cancel=None):
+        """
+        Dijkstra's algorithm over the compact CSR arrays. See _settle().
+
+        Stations are handled as integers inside the loop and translated
+        back to names only for the stations that were reached.
+        """
+        graph = self.network.compact
+        names = graph.names
+        offsets = graph.offsets
+        targets_of = graph.targets
+        weights = graph.weights(optimize_for)
+        other_weights = graph.weights('time' if optimize_for == 'cost' else 'cost')
+
+        connections_explored = 0
+        relaxations = 0
+
+        source = graph.index.get(start)
+        if source is None:
+            return {}, {}, {}, connections_explored
+        goals = self._compact_targets(graph, targets)
+        remaining = None if goals is None else set(goals)
+
+        # State keyed by station index rather than name (see _compact_state())
+        distances, others, parents, visited = self._compact_state(len(names), budget is not None)
+        limit = float('infinity') if budget is None else budget
+        distances[source] = 0
+        reached = [source]
+
+        priority_queue = make_queue(kind)
+        push, pop = priority_queue.push, priority_queue.pop
+        push(0, source)
+
+        while priority_queue:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            current_distance, current = pop()
+
+            if visited[current]:
+                continue
+            visited[current] = 1
+
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            first, last = offsets[current], offsets[current + 1]
+            connections_explored += last - first
+
+            for e in range(first, last):
+                neighbor = targets_of[e]
+                if visited[neighbor]:
+                    continue
+
+                new_distance = current_distance + weights[e]
+                if new_distance <= limit and new_distance < distances[neighbor]:
+                    if parents[neighbor] == -1:
+                        reached.append(neighbor)
+                    distances[neighbor] = new_distance
+                    others[neighbor] = others[current] + other_weights[e]
+                    parents[neighbor] = current
+                    push(new_distance, neighbor)
+                    relaxations += 1
+
+                # Break ties on the other metric, as in _dijkstra_graph()
+                elif new_distance == distances[neighbor] and others[current] + other_weights[e] < others[neighbor]:
+                    others[neighbor] = others[current] + other_weights[e]
+                    parents[neighbor] = current
+
+        if stats is not None:
+            pushes = relaxations + 1
+            stats.add_search(pushes, pushes - len(priority_queue), self._settled_count(visited), relaxations)
+
+        return self._compact_result(names, distances, parents, others, visited, reached, goals, start, source,
+                                    connections_explored)
+
+    def _dijkstra_buckets(self, start, targets, optimize_for, max_weight, budget=None, stats=None, cancel=None):
+        """
+        Dijkstra's algorithm over the compact CSR arrays with Dial's buckets. See _settle().
+
+        The DialQueue is inlined: buckets hold bare station indices, one
+        bucket per distance modulo max_weight + 1, and the distance being
+        settled walks upward through them. An entry is stale when the
+        station's distance has since dropped below its bucket's distance.
+        """
+        graph = self.network.compact
+        names = graph.names
+        offsets = graph.offsets
+        targets_of = graph.targets
+        weights = graph.weights(optimize_for)
+        other_weights = graph.weights('time' if optimize_for == 'cost' else 'cost')
+
+        connections_explored = 0
+        relaxations = 0
+
+        source = graph.index.get(start)
+        if source is None:
+            return {}, {}, {}, connections_explored
+        goals = self._compact_targets(graph, targets)
+        remaining = None if goals is None else set(goals)
+
+        distances, others, parents, visited = self._compact_state(len(names), budget is not None)
+        limit = float('infinity') if budget is None else budget
+        distances[source] = 0
+        reached = [source]
+
+        size = max_weight + 1
+        buckets = [[] for _ in range(size)]
+        buckets[0].append(source)
+        queued = 1
+        current_distance = 0
+        found = False
+
+        while queued and not found:
+            bucket = buckets[current_distance % size]
+
+            while bucket:
+                if cancel is not None and cancel.is_set():
+                    raise SearchCancelled()
+                current = bucket.pop()
+                queued -= 1
+
+                if visited[current] or distances[current] != current_distance:
+                    continue
+                visited[current] = 1
+
+                if remaining is not None:
+                    remaining.discard(current)
+                    if not remaining:
+                        found = True
+                        break
+
+                first, last = offsets[current], offsets[current + 1]
+                connections_explored += last - first
+
+                for e in range(first, last):
+                    neighbor = targets_of[e]
+                    if visited[neighbor]:
+                        continue
+
+                    new_distance = current_distance + weights[e]
+                    if new_distance <= limit and new_distance < distances[neighbor]:
+                        if parents[neighbor] == -1:
+                            reached.append(neighbor)
+                        distances[neighbor] = new_distance
+                        others[neighbor] = others[current] + other_weights[e]
+                        parents[neighbor] = current
+                        buckets[new_distance % size].append(neighbor)
+                        queued += 1
+                        relaxations += 1
+
+                    # Break ties on the other metric, as in _dijkstra_graph()
+                    elif new_distance == distances[neighbor] and others[current] + other_weights[e] < others[neighbor]:
+                        others[neighbor] = others[current] + other_weights[e]
+                        parents[neighbor] = current
+
+            current_distance += 1
+
+        if stats is not None:
+            pushes = relaxations + 1
+            stats.add_search(pushes, pushes - queued, self._settled_count(visited), relaxations)
+
+        return self._compact_result(names, distances, parents, others, visited, reached, goals, start, source,
+                                    connections_explored)
+
+    @staticmethod
+    def _compact_state(count, sparse):
+        """
+        Return the distances, others, parents and visited state of a compact search.
+
+        Flat per-station arrays are fastest for searches that may cover
+        the network. Budget-bounded searches usually reach only a small
+        region, so they get dicts with the same defaults instead, and
+        their cost grows with the region rather than the network.
+        """
+        if sparse:
+            return (defaultdict(partial(float, 'infinity')), defaultdict(int),
+                    defaultdict(partial(int, -1)), defaultdict(int))
+        return [float('infinity')] * count, [0] * count, [-1] * count, bytearray(count)
+
+    @staticmethod
+    def _settled_count(visited):
+        """
+        Return the number of stations a compact search settled.
+        """
+        return sum(visited.values()) if isinstance(visited, dict) else visited.count(1)
+
+    @staticmethod
+    def _compact_targets(graph, targets):
+        """
+        Return the station indices of targets in the network (None for no targets).
+        """
+        if targets is None:
+            return None
+        index = graph.index
+        return [index[station] for station in targets if station in index]
+
+    @staticmethod
+    def _compact_result(names, distances, parents, others, visited, reached, goals, start, source,
+                        connections_explored):
+        """
+        Translate a compact search back to station names, for the reached stations only.
+
+        The other metric is translated for the settled goals only, or for
+        every reached station when there are no goals.
+        """
+        distance_map = {names[i]: distances[i] for i in reached}
+        parent_map = {start: None}
+        for i in reached:
+            if i != source:
+                parent_map[names[i]] = names[parents[i]]
+
+        if goals is None:
+            other_map = {names[i]: others[i] for i in reached}
+        else:
+            other_map = {names[i]: others[i] for i in goals if visited[i]}
+
+        return distance_map, parent_map, other_map, connections_explored
+
+    def _adjacency(self):
+        """
+        Return (index, names, neighbors) for searches that walk the network station by station.
+
+        On a compiled network stations are handled as integer indices:
+        index maps a name to its index, names maps back, and neighbors(i)
+        gives (neighbor, cost, time) read straight from the packed arrays,
+        without building names. Otherwise index and names are None and
+        stations are handled by name through the dict graph.
+        """
+        graph = self.network.compact
+        if graph is None:
+            return None, None, self.network.get_neighbors
+        return graph.index, graph.names, graph.neighbor_indices
+
+    @staticmethod
+    def _named_route(names, distances, parents, start, end, target):
+        """
+        Translate the result of a search run on station indices back to names.
+
+        As for the contraction hierarchy search, only what find_route
+        reads is translated: the route's parent chain and the distance
+        to end. A search run by name (names is None) is returned as is.
+        """
+        if names is None:
+            return distances, parents
+        if target not in parents:
+            return {}, {start: None}
+
+        route_parents = {}
+        station = target
+        while station is not None:
+            parent = parents[station]
+            route_parents[names[station]] = None if parent is None else names[parent]
+            station = parent
+        return {end: distances[target]}, route_parents
+
+    def _bidirectional_dijkstra(self, start, end, optimize_for, stats=None, cancel=None):
+        """
+        Bidirectional Dijkstra: search forward from start and backward from end.
+
+        Every connection is stored in both directions, so the backward search
+        walks the same neighbour lists. The search stops once the two frontiers
+        together can no longer improve on the best meeting point found.
+        On a compiled network it runs on station indices (see _adjacency()).
+        """
+        connections_explored = 0
+        relaxations = 0
+
+        # Stop if invalid optimization choice
+        if optimize_for not in ['cost', 'time']:
+            return {}, {}, None, connections_explored
+
+        index, names, neighbors = self._adjacency()
+        source, target = (start, end) if index is None else (index.get(start), index.get(end))
+        if source is None or target is None:
+            return {}, {start: None}, None, connections_explored
+
+        infinity = float('infinity')
+
+        # Index 0 is the forward search, index 1 the backward search
+        distances = ({source: 0}, {target: 0})
+        parents = ({source: None}, {target: None})
+        visited = (set(), set())
+        queues = ([(0, source)], [(0, target)])
+
+        # Best complete route seen so far, as the edge where the searches meet
+        best_distance = 0 if source == target else infinity
+        meeting = (source, target)
+
+        while queues[0] and queues[1]:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            # Stop when no meeting point can beat the best route found
+            if queues[0][0][0] + queues[1][0][0] >= best_distance:
+                break
+
+            # Expand the side whose frontier is closer to its origin
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            own_distances, own_parents = distances[side], parents[side]
+            other_distances = distances[1 - side]
+
+            current_distance, current_station = heapq.heappop(queues[side])
+
+            if current_station in visited[side]:
+                continue
+            visited[side].add(current_station)
+
+            for neighbor, cost, time in neighbors(current_station):
+                connections_explored += 1
+
+                weight = cost if optimize_for == 'cost' else time
+                new_distance = current_distance + weight
+
+                # Record a meeting point if the other search reached the neighbor
+                if neighbor in other_distances:
+                    total = new_distance + other_distances[neighbor]
+                    if total < best_distance:
+                        best_distance = total
+                        meeting = (current_station, neighbor) if side == 0 else (neighbor, current_station)
+
+                if neighbor in visited[side]:
+                    continue
+
+                if new_distance < own_distances.get(neighbor, infinity):
+                    own_distances[neighbor] = new_distance
+                    own_parents[neighbor] = current_station
+                    heapq.heappush(queues[side], (new_distance, neighbor))
+                    relaxations += 1
+
+        # Both origins were pushed before any relaxation
+        if stats is not None:
+            pushes = relaxations + 2
+            stats.add_search(pushes, pushes - len(queues[0]) - len(queues[1]),
+                             len(visited[0]) + len(visited[1]), relaxations)
+
+        # Destination not reachable
+        if best_distance == infinity:
+            return (distances[0] if names is None else {}), {start: None}, None, connections_explored
+
+        # Join both halves into one parent chain running start -> end
+        route_parents = {source: None}
+        forward = []
+        current = meeting[0]
+        while current is not None:
+            forward.append(current)
+            current = parents[0][current]
+        forward.reverse()
+
+        backward = []
+        current = meeting[1] if meeting[0] != meeting[1] else parents[1][meeting[1]]
+        while current is not None:
+            backward.append(current)
+            current = parents[1][current]
+
+        route = forward + backward
+        for previous, station in zip(route, route[1:]):
+            route_parents[station] = previous
+
+        route_distances = dict(distances[0])
+        route_distances[target] = best_distance
+
+        route_distances, route_parents = self._named_route(names, route_distances, route_parents, start, end, target)
+        return route_distances, route_parents, None, connections_explored
+
+    def _astar(self, start, end, optimize_for, stats=None, cancel=None):
+        """
+        A* search using landmark (ALT) lower bounds as the heuristic.
+
+        Without landmark tables the heuristic is zero and this behaves
+        like Dijkstra's algorithm. On a compiled network it runs on
+        station indices (see _adjacency()).
+        """
+        connections_explored = 0
+        relaxations = 0
+
+        # Stop if invalid optimization choice
+        if optimize_for not in ['cost', 'time']:
+            return {}, {}, None, connections_explored
+
+        index, names, neighbors = self._adjacency()
+        source, target = (start, end) if index is None else (index.get(start), index.get(end))
+        if source is None or target is None:
+            return {}, {start: None}, None, connections_explored
+
+        if self.landmarks is not None:
+            heuristic = self.landmarks.heuristic(end, optimize_for)
+            # The landmark tables are keyed by name
+            if names is not None:
+                heuristic = lambda station, by_name=heuristic: by_name(names[station])
+        else:
+            heuristic = lambda station: 0
+
+        infinity = float('infinity')
+        distances = {source: 0}
+        parents = {source: None}
+        visited = set()
+
+        # Queue ordered by distance so far plus lower bound to the destination
+        priority_queue = [(heuristic(source), 0, source)]
+
+        while priority_queue:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            _, current_distance, current_station = heapq.heappop(priority_queue)
+
+            if current_station in visited:
+                continue
+            visited.add(current_station)
+
+            if current_station == target:
+                break
+
+            for neighbor, cost, time in neighbors(current_station):
+                connections_explored += 1
+
+                if neighbor in visited:
+                    continue
+
+                weight = cost if optimize_for == 'cost' else time
+                new_distance = current_distance + weight
+
+                if new_distance < distances.get(neighbor, infinity):
+                    estimate = heuristic(neighbor)
+
+                    # Lower bound says the destination cannot be reached from here
+                    if estimate == infinity:
+                        continue
+
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = current_station
+                    heapq.heappush(priority_queue, (new_distance + estimate, new_distance, neighbor))
+                    relaxations += 1
+
+        if stats is not None:
+            pushes = relaxations + 1
+            stats.add_search(pushes, pushes - len(priority_queue), len(visited), relaxations)
+
+        distances, parents = self._named_route(names, distances, parents, start, end, target)
+        return distances, parents, None, connections_explored
+
+    def _contraction_hierarchy_search(self, start, end, optimize_for, stats=None, cancel=None):
+        """
+        Query the contraction hierarchy for optimize_for.
+
+        Falls back to Dijkstra's algorithm if no hierarchy is attached
+        for that metric.
+        """
+        hierarchy = self.hierarchies.get(optimize_for)
+        if hierarchy is None:
+            return self._dijkstra(start, end, optimize_for, stats, cancel)
+
+        path, distance, connections_explored = hierarchy.query(start, end, stats)
+        if path is None:
+            return {}, {start: None}, None, connections_explored
+
+        # Express the unpacked path as a parent chain for find_route
+        parents = {start: None}
+        for previous, station in zip(path, path[1:]):
+            parents[station] = previous
+
+        return {end: distance}, parents, None, connections_explored
+
+    def _hub_label_search(self, start, end, optimize_for, stats=None, cancel=None):
+        """
+        Recover the route from the hub labels for optimize_for.
+
+        No queue is used, so no connections are reported as explored.
+        Falls back to Dijkstra's algorithm if no labels are attached for
+        that metric.
+        """
+        labels = self.hub_labels.get(optimize_for)
+        if labels is None:
+            return self._dijkstra(start, end, optimize_for, stats, cancel)
+
+        path = labels.path(self.network, start, end)
+        if path is None:
+            return {}, {start: None}, None, 0
+
+        parents = {start: None}
+        for previous, station in zip(path, path[1:]):
+            parents[station] = previous
+
+        return {end: labels.distance(start, end)}, parents, None, 0
+
+    def distance(self, start, end, optimize_for='cost'):
+        """
+        Return the total cost or time of the best route, without the route.
+
+        Answered from the hub labels when attached for optimize_for (a
+        merge of two short lists), else by Dijkstra's algorithm. Returns
+        None if there is no route.
+        """
+        labels = self.hub_labels.get(optimize_for)
+        if labels is not None:
+            return labels.distance(start, end)
+
+        distances, parents, _, _ = self._dijkstra(start, end, optimize_for)
+        return distances.get(end) if end in parents else None
+
+    def find_pareto_routes(self, start, end, max_labels=None, cancel=None):
+        """
+        Find every route on the cost/time trade-off front in one search.
+
+        A route is kept unless another one is at least as cheap and at
+        least as fast. max_labels optionally caps the number of labels kept
+        per station, which bounds the work on large networks at the risk
+        of missing some trade-offs. Setting the optional cancel event
+        (a threading.Event) stops the search with SearchCancelled.
+
+        Returns a list of (path, total cost, total time) sorted from
+        cheapest to fastest, and the number of connections explored.
+        On a compiled network labels hold station indices (see _adjacency()).
+        """
+        connections_explored = 0
+
+        if not self.network.station_exists(start) or not self.network.station_exists(end):
+            return [], connections_explored
+
+        index, names, neighbors = self._adjacency()
+        if index is not None:
+            start, end = index[start], index[end]
+
+        infinity = float('infinity')
+
+        # Each label is (station, parent label id); the queue holds label ids
+        labels = [(start, None)]
+        priority_queue = [(0, 0, 0)]
+
+        # Labels are settled in (cost, time) order, so a new label at a station
+        # is dominated exactly when a settled one there is at least as fast
+        best_time = {}
+        label_counts = {}
+        routes = []
+
+        while priority_queue:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            cost, time, label_id = heapq.heappop(priority_queue)
+            station = labels[label_id][0]
+
+            # Dominated by a route already found to this station or to the destination
+            if time >= best_time.get(station, infinity) or time >= best_time.get(end, infinity):
+                continue
+            if max_labels is not None and label_counts.get(station, 0) >= max_labels:
+                continue
+
+            best_time[station] = time
+            label_counts[station] = label_counts.get(station, 0) + 1
+
+            if station == end:
+                routes.append((label_id, cost, time))
+                continue
+
+            for neighbor, edge_cost, edge_time in neighbors(station):
+                connections_explored += 1
+
+                new_time = time + edge_time
+                if new_time >= best_time.get(neighbor, infinity) or new_time >= best_time.get(end, infinity):
+                    continue
+
+                labels.append((neighbor, label_id))
+                heapq.heappush(priority_queue, (cost + edge_cost, new_time, len(labels) - 1))
+
+        # Rebuild each route by following its parent labels
+        pareto_routes = []
+        for label_id, cost, time in routes:
+            path = []
+            while label_id is not None:
+                station, label_id = labels[label_id]
+                path.append(station if names is None else names[station])
+            path.reverse()
+            pareto_routes.append((path, cost, time))
+
+        return pareto_routes, connections_explored
+
+    def find_k_routes(self, start, end, k, optimize_for='cost'):
+        """
+        Find up to k loopless routes from start to end, best first (Yen's algorithm).
+
+        One shortest path tree is grown backward from end. Its distances
+        are exact lower bounds for every spur search, so the spur searches
+        are A* searches that head straight for the destination, and each
+        one finishes as soon as it reaches a station whose tree path avoids
+        every removed station and connection. Removed stations and
+        connections are skipped during the search instead of copying the graph.
+
+        Returns a list of (path, total cost, total time) and the number of
+        connections explored.
+        """
+        connections_explored = 0
+
+        if k <= 0 or optimize_for not in ['cost', 'time']:
+            return [], connections_explored
+        if not self.network.station_exists(start) or not self.network.station_exists(end):
+            return [], connections_explored
+
+        # Reverse tree: distance to end and next station towards end
+        to_end, next_hop = self.shortest_path_tree(end, optimize_for)
+        if start not in to_end:
+            return [], connections_explored
+
+        found = [self._follow_tree(next_hop, start)]
+
+        # Spur searches run on station indices on a compiled network
+        index, _, _ = self._adjacency()
+        if index is not None:
+            to_end = {index[station]: distance for station, distance in to_end.items()}
+            next_hop = {index[station]: None if hop is None else index[hop] for station, hop in next_hop.items()}
+        candidates = []
+        seen = {tuple(found[0])}
+
+        while len(found) < k:
+            previous = found[-1]
+
+            for i in range(len(previous) - 1):
+                spur_station = previous[i]
+                root = previous[:i + 1]
+
+                # Block the next connection of every found route sharing this root
+                removed_connections = {(path[i], path[i + 1]) for path in found
+                                       if len(path) > i + 1 and path[:i + 1] == root}
+                removed_stations = set(root[:-1])
+
+                spur, explored = self._spur_path(spur_station, end, to_end, next_hop,
+                                                 removed_stations, removed_connections, optimize_for)
+                connections_explored += explored
+                if spur is None:
+                    continue
+
+                path = root[:-1] + spur
+                if tuple(path) in seen:
+                    continue
+                seen.add(tuple(path))
+                heapq.heappush(candidates, (self._path_weight(path, optimize_for), path))
+
+            if not candidates:
+                break
+
+            _, path = heapq.heappop(candidates)
+            found.append(path)
+
+        routes = []
+        for path in found:
+            total_cost, total_time = self._calculate_route_details(path, optimize_for)
+            routes.append((path, total_cost, total_time))
+
+        return routes, connections_explored
+
+    def _follow_tree(self, next_hop, station):
+        """
+        Follow a reverse shortest path tree from station to its root.
+        """
+        path = []
+        while station is not None:
+            path.append(station)
+            station = next_hop.get(station)
+        return path
+
+    def _path_weight(self, path, optimize_for):
+        """
+        Total weight of a path, using the lightest connection between each pair.
+        """
+        index = 0 if optimize_for == 'cost' else 1
+        get_edge = self.network.get_edge
+        return sum(get_edge(a, b, optimize_for)[index] for a, b in zip(path, path[1:]))
+
+    def _spur_path(self, start, end, to_end, next_hop, removed_stations, removed_connections, optimize_for):
+        """
+        Shortest path from start to end avoiding removed stations and connections.
+
+        Uses the exact distances to end from the unrestricted network as the
+        A* heuristic; removals only make paths longer, so it stays admissible.
+        On a compiled network to_end and next_hop are keyed by station index
+        (see _adjacency()); everything else is given by name.
+        """
+        connections_explored = 0
+
+        index, names, neighbors = self._adjacency()
+        if index is not None:
+            start, end = index[start], index[end]
+            removed_stations = {index[station] for station in removed_stations}
+            removed_connections = {(index[station1], index[station2]) for station1, station2 in removed_connections}
+
+        infinity = float('infinity')
+        distances = {start: 0}
+        parents = {start: None}
+        visited = set()
+        priority_queue = [(to_end.get(start, infinity), 0, start)]
+
+        # Whether a station's tree path to end avoids everything removed
+        tree_path_open = {end: end not in removed_stations}
+
+        def is_open(station):
+            chain = []
+            while station not in tree_path_open:
+                if station in removed_stations or (station, next_hop[station]) in removed_connections:
+                    tree_path_open[station] = False
+                    break
+                chain.append(station)
+                station = next_hop[station]
+            result = tree_path_open[station]
+            for link in chain:
+                tree_path_open[link] = result
+            return result
+
+        while priority_queue:
+            _, current_distance, current_station = heapq.heappop(priority_queue)
+
+            if current_station in visited:
+                continue
+            visited.add(current_station)
+
+            # With an exact heuristic, the first popped station whose tree path
+            # is intact can finish the route along that path
+            if is_open(current_station):
+                head = self._reconstruct_path(parents, start, current_station)
+                tail = self._follow_tree(next_hop, current_station)
+                if not set(head).intersection(tail[1:]):
+                    path = head + tail[1:]
+                    return (path if names is None else [names[i] for i in path]), connections_explored
+
+            for neighbor, cost, time in neighbors(current_station):
+                connections_explored += 1
+
+                if (neighbor in visited or neighbor in removed_stations
+                        or (current_station, neighbor) in removed_connections):
+                    continue
+
+                # Stations with no path to end in the full network can be skipped
+                estimate = to_end.get(neighbor)
+                if estimate is None:
+                    continue
+
+                new_distance = current_distance + (cost if optimize_for == 'cost' else time)
+                if new_distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = new_distance
+                    parents[neighbor] = current_station
+                    heapq.heappush(priority_queue, (new_distance + estimate, new_distance, neighbor))
+
+        return None, connections_explored
+
+    def shortest_path_tree(self, start, optimize_for='cost'):
+        """
+        Compute distances and parents from start to every reachable station.
+        """
+        distances, parents, _, _ = self._dijkstra(start, None, optimize_for)
+        return distances, parents
+
+    def distance_matrix(self, sources=None, targets=None, optimize_for='cost', filename=None):
+        """
+        Compute cost and time between every source and every target.
+
+        Each source's shortest path tree is grown once, until all targets
+        are settled, and reused for its whole row. sources and targets
+        default to every station. If filename is given, rows are written
+        straight into a memory-mapped matrix file and the returned
+        DistanceMatrix reads from it.
+        """
+        stations = sorted(self.network.stations)
+        sources = stations if sources is None else list(sources)
+        targets = stations if targets is None else list(targets)
+
+        if filename is not None:
+            DistanceMatrix.create(filename, sources, targets, optimize_for)
+            matrix = DistanceMatrix.open(filename, writable=True)
+        else:
+            matrix = DistanceMatrix(sources, targets, optimize_for)
+
+        for row, source in enumerate(sources):
+            if optimize_for in ['cost', 'time'] and self.network.station_exists(source):
+                primary, _, secondary, _ = self._settle(source, targets, optimize_for)
+            else:
+                primary, secondary = {}, {}
+            costs, times = (primary, secondary) if optimize_for == 'cost' else (secondary, primary)
+            matrix.set_row(row, [costs.get(t, float('infinity')) for t in targets],
+                           [times.get(t, float('infinity')) for t in targets])
+
+        if filename is not None:
+            matrix.close()
+            matrix = DistanceMatrix.open(filename)
+
+        return matrix
+
+    def reachable_within(self, start, budget, optimize_for='cost'):
+        """
+        Find every station reachable from start within a cost or time budget.
+
+        One Dijkstra search (_settle()) carries the other metric along
+        and never queues a station beyond the budget, so its work grows
+        with the reachable region rather than the network. Returns
+        {station: (cost, time)} of the best route by optimize_for to each
+        station whose cost (or time) is at most budget, start included.
+        """
+        if optimize_for not in ['cost', 'time'] or not self.network.station_exists(start) or budget < 0:
+            return {}
+
+        # With the budget as the limit every station reached is settled
+        distances, _, others, _ = self._settle(start, None, optimize_for, budget=budget)
+
+        if optimize_for == 'cost':
+            return {station: (distance, others[station]) for station, distance in distances.items()}
+        return {station: (others[station], distance) for station, distance in distances.items()}
+
+    def reachable_within_many(self, starts, budget, optimize_for='cost', workers=1, chunk_size=16, shared=None):
+        """
+        Run reachable_within() for many origins, optionally across processes.
+
+        With workers > 1 the origins are spread, chunk_size at a time,
+        over a pool from create_pool(), sharing the network if shared is
+        given. Yields (start, reachable) pairs in the order of starts.
+        """
+        starts = list(starts)
+
+        if workers <= 1:
+            for start in starts:
+                yield start, self.reachable_within(start, budget, optimize_for)
+            return
+
+        with self.create_pool(workers, shared) as pool:
+            results = pool.map(reachable_in_worker, starts, repeat(budget), repeat(optimize_for),
+                               chunksize=chunk_size)
+            yield from zip(starts, results)
+
     def _reconstruct_path(self, parents, start, end):
         """
         Reconstruct path from start to end using parent pointers.
@@ -113,23 +1378,108 @@ class RouteSearcher:
         
         return path
     
-    def _calculate_route_details(self, path):
+    def _calculate_route_details(self, path, optimize_for='cost'):
         """
         Calculate total cost and travel time for a given path.
+
+        Each hop uses the connection a search for optimize_for takes
+        between the two stations, looked up in the network's edge index.
         """
         total_cost = 0
         total_time = 0
+        get_edge = self.network.get_edge
         
         # Iterate through consecutive station pairs
-        for i in range(len(path) - 1):
-            current = path[i]
-            next_station = path[i + 1]
-            
-            # Find the edge between current and next station
-            for neighbor, cost, time in self.network.get_neighbors(current):
-                if neighbor == next_station:
-                    total_cost += cost
-                    total_time += time
-                    break
+        for current, next_station in zip(path, path[1:]):
+            edge = get_edge(current, next_station, optimize_for)
+            if edge is not None:
+                total_cost += edge[0]
+                total_time += edge[1]
         
         return total_cost, total_time
+
+
+# Searcher used by the current find_routes() worker process
+_worker_searcher = None
+
+# The worker's AttachedNetwork, when its network is shared, and the
+# seconds it took to load or attach the network
+_worker_attachment = None
+_worker_load_time = None
+
+
+def _make_batch_searcher(network, landmarks, hierarchies, hub_labels, max_trees, max_tree_entries, queue):
+    """
+    Build a tree-reusing searcher for batch queries.
+    """
+    searcher = RouteSearcher(network, max_trees=max_trees, max_tree_entries=max_tree_entries, queue=queue)
+    searcher.landmarks = landmarks
+    searcher.hierarchies = dict(hierarchies)
+    searcher.hub_labels = dict(hub_labels)
+    return searcher
+
+
+def _init_batch_worker(source_file, network, shared_name, landmarks, hierarchies, hub_labels,
+                       max_trees, max_tree_entries, queue):
+    """
+    Load, or attach to, the network once when a worker process starts.
+    """
+    global _worker_searcher, _worker_attachment, _worker_load_time
+
+    started = perf_counter()
+    if shared_name is not None:
+        _worker_attachment = attach_network(shared_name)
+        network = _worker_attachment.network
+    elif network is None:
+        network = RailwayNetwork()
+        network.load_with_snapshot(source_file)
+    _worker_load_time = perf_counter() - started
+
+    _worker_searcher = _make_batch_searcher(network, landmarks, hierarchies, hub_labels,
+                                            max_trees, max_tree_entries, queue)
+
+
+def _answer_group(searcher, group, algorithm):
+    """
+    Answer one group of (index, start, end, optimize_for) queries.
+    """
+    return [(index, searcher.find_route(start, end, optimize_for, algorithm))
+            for index, start, end, optimize_for in group]
+
+
+def _run_batch_group(group, algorithm):
+    """
+    Worker task: answer one query group with this process's searcher.
+    """
+    return _answer_group(_worker_searcher, group, algorithm)
+
+
+def route_in_worker(start, end, optimize_for='cost', algorithm='dijkstra'):
+    """
+    Worker task for pools from RouteSearcher.create_pool(): run one find_route.
+    """
+    return _worker_searcher.find_route(start, end, optimize_for, algorithm)
+
+
+def distance_in_worker(start, end, optimize_for='cost'):
+    """
+    Worker task for pools from RouteSearcher.create_pool(): run one distance.
+    """
+    return _worker_searcher.distance(start, end, optimize_for)
+
+
+def worker_status():
+    """
+    Worker task: report how this worker got its network and what it costs.
+
+    Returns memory_usage() plus 'attached' (True if the network is
+    shared) and 'load_time', the seconds taken to attach or load it.
+    """
+    return dict(memory_usage(), attached=_worker_attachment is not None, load_time=_worker_load_time)
+
+
+def reachable_in_worker(start, budget, optimize_for='cost'):
+    """
+    Worker task for pools from RouteSearcher.create_pool(): run one reachable_within.
+    """
+    return _worker_searcher.reachable_within(start, budget, optimize_for)
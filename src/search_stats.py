@@ -0,0 +1,168 @@
+# src/search_stats.py
+
+import json
+import threading
+
+class SearchCancelled(Exception):
+    """
+    Raised when a search is stopped through its cancel event.
+    """
+
+
+class SearchStats:
+    """
+    Work done and time spent answering one find_route query.
+
+    The search counters are:
+    - pushes: entries added to the priority queue
+    - pops: entries taken off it
+    - stale_pops: popped entries skipped because the station was already settled
+    - settled: stations whose distance became final
+    - relaxations: tentative distances improved
+    - connections_explored: connections looked at, as find_route reports
+
+    Times are wall-clock seconds spent in the search itself, in
+    reconstructing the path and in calculating its cost and time.
+    """
+    def __init__(self, start, end, optimize_for, algorithm):
+        """
+        Initialize empty statistics for one query.
+        """
+        self.start = start
+        self.end = end
+        self.optimize_for = optimize_for
+        self.algorithm = algorithm
+
+        # True when the answer came from the route cache
+        self.cached = False
+        self.found = False
+
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.settled = 0
+        self.relaxations = 0
+        self.connections_explored = 0
+
+        self.search_time = 0.0
+        self.reconstruct_time = 0.0
+        self.details_time = 0.0
+
+    def add_search(self, pushes, pops, settled, relaxations):
+        """
+        Add the queue work of one search (or one side of a bidirectional one).
+
+        Every pop that did not settle a station counts as stale.
+        """
+        self.pushes += pushes
+        self.pops += pops
+        self.settled += settled
+        self.stale_pops += pops - settled
+        self.relaxations += relaxations
+
+    @property
+    def total_time(self):
+        """
+        Return the total wall-clock time of the query in seconds.
+        """
+        return self.search_time + self.reconstruct_time + self.details_time
+
+    def as_dict(self):
+        """
+        Return the statistics as a plain dict, e.g. for JSON export.
+        """
+        return {
+            'start': self.start,
+            'end': self.end,
+            'optimize_for': self.optimize_for,
+            'algorithm': self.algorithm,
+            'cached': self.cached,
+            'found': self.found,
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'stale_pops': self.stale_pops,
+            'settled': self.settled,
+            'relaxations': self.relaxations,
+            'connections_explored': self.connections_explored,
+            'search_time': self.search_time,
+            'reconstruct_time': self.reconstruct_time,
+            'details_time': self.details_time,
+            'total_time': self.total_time,
+        }
+
+    def __repr__(self):
+        return (f"SearchStats({self.start!r} -> {self.end!r}, {self.algorithm}, "
+                f"settled={self.settled}, pops={self.pops}, {self.total_time * 1000:.3f} ms)")
+
+
+class StatsCounter:
+    """
+    Search hook that accumulates totals over many queries.
+
+    Register it with RouteSearcher.add_hook(); summary() returns the
+    totals per algorithm.
+    """
+    # Counters summed per algorithm
+    FIELDS = ('pushes', 'pops', 'stale_pops', 'settled', 'relaxations', 'connections_explored',
+              'search_time', 'reconstruct_time', 'details_time')
+
+    def __init__(self):
+        """
+        Initialize with no queries counted.
+        """
+        self.totals = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, stats):
+        """
+        Add one query's statistics to the totals.
+        """
+        with self.lock:
+            totals = self.totals.get(stats.algorithm)
+            if totals is None:
+                totals = self.totals[stats.algorithm] = dict.fromkeys(self.FIELDS, 0)
+                totals.update(queries=0, cached=0)
+
+            totals['queries'] += 1
+            totals['cached'] += stats.cached
+            for field in self.FIELDS:
+                totals[field] += getattr(stats, field)
+
+    def summary(self):
+        """
+        Return {algorithm: totals} including per-query means.
+        """
+        with self.lock:
+            summary = {}
+            for algorithm, totals in self.totals.items():
+                queries = totals['queries']
+                summary[algorithm] = dict(totals, mean_settled=totals['settled'] / queries,
+                                          mean_time=(totals['search_time'] + totals['reconstruct_time']
+                                                     + totals['details_time']) / queries)
+            return summary
+
+
+class StatsTraceWriter:
+    """
+    Search hook that writes one JSON line per query to a trace file.
+    """
+    def __init__(self, filename):
+        """
+        Open (and truncate) the trace file.
+        """
+        self.file = open(filename, 'w')
+        self.lock = threading.Lock()
+
+    def __call__(self, stats):
+        """
+        Append one query's statistics to the trace.
+        """
+        line = json.dumps(stats.as_dict())
+        with self.lock:
+            self.file.write(line + '\n')
+
+    def close(self):
+        """
+        Flush and close the trace file.
+        """
+        self.file.close()
@@ -0,0 +1,237 @@
+# src/search_tree.py
+
+import heapq
+
+from src.search_stats import SearchCancelled
+
+class SearchTree:
+    """
+    Resumable Dijkstra search from one origin for one metric.
+
+    The settled set, the priority queue and the parent pointers are kept
+    between queries. A query for a station that is already settled is
+    answered at once; otherwise the search resumes where it stopped.
+
+    After repair() a settled station is only known to be final while no
+    queued station is closer to the origin, since a queued one might
+    still lead to it more cheaply. Such a station is re-queued when
+    queried, and relaxing a connection that improves a settled station
+    puts it back in the queue.
+    """
+    def __init__(self, network, origin, optimize_for):
+        """
+        Start a new search from origin.
+        """
+        self.network = network
+        self.origin = origin
+        self.optimize_for = optimize_for
+
+        self.distances = {origin: 0}
+        self.parents = {origin: None}
+        self.settled = set()
+        self.priority_queue = [(0, origin)]
+
+        # Settled station whose connections have not been relaxed yet.
+        # Searches stop as soon as the destination is settled, like
+        # RouteSearcher._dijkstra, and expand it only when resumed.
+        self.pending = None
+
+    def __len__(self):
+        """
+        Return the number of stored entries, used to cap memory.
+        """
+        return len(self.distances) + len(self.priority_queue)
+
+    def is_complete(self):
+        """
+        Return True once every reachable station is settled.
+        """
+        return not self.priority_queue and self.pending is None
+
+    def settle(self, target, stats=None, cancel=None):
+        """
+        Advance the search until target is settled or nothing is left.
+
+        Returns the number of connections explored by this call. If stats
+        (a SearchStats) is given, the queue work of this call is added to it.
+        Setting the optional cancel event stops the search between two steps
+        with SearchCancelled, leaving the tree ready to be resumed.
+        """
+        connections_explored = 0
+
+        if target in self.settled:
+            if self.distances[target] <= self._frontier():
+                return connections_explored
+
+            # Settled before a repair and possibly improvable: search on
+            self.settled.discard(target)
+            heapq.heappush(self.priority_queue, (self.distances[target], target))
+            if target == self.pending:
+                self.pending = None
+
+        settled = self.settled
+        distances = self.distances
+        priority_queue = self.priority_queue
+        queued_before = len(priority_queue)
+        settled_before = len(settled)
+        pops = 0
+        use_cost = self.optimize_for == 'cost'
+        infinity = float('infinity')
+
+        # Finish expanding the station the previous query stopped at
+        if self.pending is not None:
+            current_station, self.pending = self.pending, None
+            connections_explored += self._relax(current_station, distances[current_station], use_cost, infinity)
+
+        while priority_queue:
+            if cancel is not None and cancel.is_set():
+                raise SearchCancelled()
+            current_distance, current_station = heapq.heappop(priority_queue)
+            pops += 1
+
+            # Skip duplicates, and entries left behind by repair()
+            if current_station in settled or current_distance != distances.get(current_station):
+                continue
+            settled.add(current_station)
+
+            if current_station == target:
+                self.pending = current_station
+                break
+
+            connections_explored += self._relax(current_station, current_distance, use_cost, infinity)
+
+        # Every push in this call came from a relaxation
+        if stats is not None:
+            pushes = len(priority_queue) - queued_before + pops
+            stats.add_search(pushes, pops, len(settled) - settled_before, pushes)
+
+        return connections_explored
+
+    def _relax(self, current_station, current_distance, use_cost, infinity):
+        """
+        Relax every connection of a settled station. Returns the number explored.
+
+        A settled neighbour is never improved in an untouched search; after
+        a repair one can be, and is then unsettled to be expanded again.
+        """
+        settled = self.settled
+        distances = self.distances
+        parents = self.parents
+        priority_queue = self.priority_queue
+
+        neighbors = self.network.get_neighbors(current_station)
+        for neighbor, cost, time in neighbors:
+            new_distance = current_distance + (cost if use_cost else time)
+            if new_distance < distances.get(neighbor, infinity):
+                if neighbor in settled:
+                    settled.discard(neighbor)
+                    if neighbor == self.pending:
+                        self.pending = None
+                distances[neighbor] = new_distance
+                parents[neighbor] = current_station
+                heapq.heappush(priority_queue, (new_distance, neighbor))
+
+        return len(neighbors)
+
+    def _weight(self, station1, station2):
+        """
+        Return the current weight of the cheapest connection between two stations.
+        """
+        use_cost = self.optimize_for == 'cost'
+        weights = [cost if use_cost else time for cost, time in self.network.connection_edges(station1, station2)]
+        return min(weights) if weights else float('infinity')
+
+    def repair(self, station1, station2):
+        """
+        Update the search after the connections between two stations changed.
+
+        Only the part of the tree the change can affect is recomputed:
+        a dearer or closed connection invalidates the subtree hanging
+        below it, and a cheaper or new connection from an expanded
+        station re-queues the station it improves, which the resumed
+        search spreads further. Nothing else is visited here.
+        """
+        weight = self._weight(station1, station2)
+        directions = ((station1, station2), (station2, station1))
+
+        # Connection got dearer: stations reached through it must be recomputed
+        for source, target in directions:
+            distance = self.distances.get(source)
+            if self.parents.get(target) == source and (distance is None or distance + weight > self.distances[target]):
+                self._invalidate_subtree(target)
+
+        # Connection got cheaper: re-queue the station it improves. Stations
+        # not yet expanded will use the new connection when they are.
+        for source, target in directions:
+            if source in self.settled and source != self.pending:
+                new_distance = self.distances[source] + weight
+                if new_distance < self.distances.get(target, float('infinity')):
+                    self.distances[target] = new_distance
+                    self.parents[target] = source
+                    heapq.heappush(self.priority_queue, (new_distance, target))
+                    self.settled.discard(target)
+                    if target == self.pending:
+                        self.pending = None
+
+    def _invalidate_subtree(self, root):
+        """
+        Forget every station whose path ran through root, then re-seed them.
+
+        Each forgotten station gets a fresh queue entry from its settled
+        neighbours, so resuming the search settles them again correctly.
+        A station's parent is always one of its neighbours, so the subtree
+        is found by walking the neighbours of its own stations: the work
+        grows with the subtree, not with the whole tree.
+        """
+        parents = self.parents
+        subtree = [root]
+        seen = {root}
+        stack = [root]
+        while stack:
+            station = stack.pop()
+            for neighbor, _, _ in self.network.get_neighbors(station):
+                if neighbor not in seen and parents.get(neighbor) == station:
+                    seen.add(neighbor)
+                    subtree.append(neighbor)
+                    stack.append(neighbor)
+
+        for station in subtree:
+            self.settled.discard(station)
+            self.distances.pop(station, None)
+            self.parents.pop(station, None)
+            if station == self.pending:
+                self.pending = None
+
+        # Best entry for each forgotten station from neighbours that keep their distance
+        use_cost = self.optimize_for == 'cost'
+        infinity = float('infinity')
+        for station in subtree:
+            for neighbor, cost, time in self.network.get_neighbors(station):
+                if neighbor not in self.settled or neighbor == self.pending:
+                    continue
+
+                new_distance = self.distances[neighbor] + (cost if use_cost else time)
+                if new_distance < self.distances.get(station, infinity):
+                    self.distances[station] = new_distance
+                    self.parents[station] = neighbor
+
+            if station in self.distances:
+                heapq.heappush(self.priority_queue, (self.distances[station], station))
+
+    def _frontier(self):
+        """
+        Return a lower bound on the distance of every unsettled station.
+        """
+        priority_queue = self.priority_queue
+
+        # Drop stale entries so the top of the queue is a live one
+        while priority_queue:
+            distance, station = priority_queue[0]
+            if station not in self.settled and distance == self.distances.get(station):
+                break
+            heapq.heappop(priority_queue)
+
+        frontier = priority_queue[0][0] if priority_queue else float('infinity')
+        if self.pending is not None:
+            frontier = min(frontier, self.distances[self.pending])
+        return frontier
@@ -0,0 +1,184 @@
+# src/shared_network.py
+
+import secrets
+import sys
+from multiprocessing import shared_memory
+from time import perf_counter
+
+# Unix only; without it memory_usage() reports nothing
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from src.network_snapshot import pack_snapshot, unpack_snapshot
+from src.railway_network import RailwayNetwork
+
+# Prefix of the shared memory segments created by publish()
+NAME_PREFIX = 'railway-network-'
+
+
+def memory_usage():
+    """
+    Return this process's resident memory in kB as {'rss', 'pss', 'private', 'shared'}.
+
+    'private' is memory only this process maps, 'shared' pages also
+    mapped by others (the shared network, libraries, and pages still
+    shared with a forking parent), and 'pss' the resident size with
+    each shared page divided among the processes mapping it. Read from
+    /proc/self/smaps_rollup where available; elsewhere only the peak
+    resident size is known, reported as 'rss', and on Windows nothing.
+    """
+    usage = {'rss': None, 'pss': None, 'private': None, 'shared': None}
+    fields = {'Rss:': 'rss', 'Pss:': 'pss', 'Private_Clean:': 'private', 'Private_Dirty:': 'private',
+              'Shared_Clean:': 'shared', 'Shared_Dirty:': 'shared'}
+
+    try:
+        with open('/proc/self/smaps_rollup') as rollup:
+            for line in rollup:
+                parts = line.split()
+                if parts and parts[0] in fields:
+                    key = fields[parts[0]]
+                    usage[key] = (usage[key] or 0) + int(parts[1])
+    except OSError:
+        if resource is not None:
+            usage['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return usage
+
+
+def _open_segment(name):
+    """
+    Open an existing shared memory segment without taking ownership of it.
+    """
+    # Before Python 3.13 every opener is tracked, which is harmless for
+    # workers started by the publisher: they share its resource tracker
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedNetwork:
+    """
+    A compiled network published in shared memory for worker processes.
+
+    The station table and the CSR adjacency arrays are packed once, in
+    the network snapshot format, into one shared memory segment. Workers
+    pass its name to attach_network() and search the same physical
+    pages, so adding a worker costs neither parsing nor a copy of the
+    graph. The publishing process owns the segment and must release()
+    it (or use the object as a context manager) once the workers are done.
+    """
+    def __init__(self, segment, checksum):
+        """
+        Initialize with a created segment. Use publish() instead.
+        """
+        self.segment = segment
+        self.checksum = checksum
+
+    @classmethod
+    def publish(cls, network, name=None):
+        """
+        Pack a network into a new shared memory segment.
+
+        The network is compiled first if needed. name defaults to a
+        random one with NAME_PREFIX.
+        """
+        compact = network.compact if network.compact is not None else network.compile()
+        data = pack_snapshot(compact, network.checksum)
+
+        segment = shared_memory.SharedMemory(name=name or NAME_PREFIX + secrets.token_hex(6),
+                                             create=True, size=max(1, len(data)))
+        segment.buf[:len(data)] = data
+        return cls(segment, network.checksum)
+
+    @property
+    def name(self):
+        """
+        Return the segment name workers attach to.
+        """
+        if self.segment is None:
+            raise ValueError("Shared network has been released")
+        return self.segment.name
+
+    @property
+    def size(self):
+        """
+        Return the size of the segment in bytes.
+        """
+        return self.segment.size
+
+    def release(self):
+        """
+        Close and remove the segment. Workers still attached keep their mapping until they release it.
+        """
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AttachedNetwork:
+    """
+    A worker's read-only view of a SharedNetwork.
+
+    network is a RailwayNetwork whose packed arrays are memoryviews into
+    the shared segment; only the station-name table is decoded into this
+    process. Edits are still possible: like a snapshot-loaded network,
+    it copies the arrays into its own dict graph first. release() must
+    be called before the segment can be closed here.
+    """
+    def __init__(self, name):
+        """
+        Attach to a published network by segment name.
+        """
+        started = perf_counter()
+
+        self.segment = _open_segment(name)
+        compact, checksum = unpack_snapshot(self.segment.buf.toreadonly())
+
+        self.network = RailwayNetwork()
+        self.network.use_compact(compact, checksum)
+
+        # Seconds taken to attach, and resident memory right after
+        self.attach_time = perf_counter() - started
+        self.memory = memory_usage()
+
+    def release(self):
+        """
+        Drop the views into the segment and close it in this process.
+
+        The network becomes empty; searchers built on it must not be used afterwards.
+        """
+        if self.segment is None:
+            return
+
+        compact = self.network.compact
+        if compact is not None:
+            for view in (compact.offsets, compact.targets, compact.costs, compact.times):
+                if isinstance(view, memoryview):
+                    view.release()
+            self.network.compact = None
+            self.network.stations = set()
+
+        self.segment.close()
+        self.segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def attach_network(name):
+    """
+    Attach to a published network. Returns an AttachedNetwork; its network attribute is ready for RouteSearcher.
+    """
+    return AttachedNetwork(name)
@@ -0,0 +1,117 @@
+# src/station_resolver.py
+
+import heapq
+from difflib import SequenceMatcher
+from math import ceil
+
+# Share of the input's trigrams a station must contain to be scored by suggest()
+MIN_TRIGRAM_OVERLAP = 0.2
+
+class StationResolver:
+    """
+    Indexed station-name lookups shared by the console and GUI.
+
+    Built once from the station names, it answers three kinds of query
+    without scanning every station:
+    - exact and case-insensitive matches, from a casefolded hash map
+    - fuzzy "did you mean" suggestions, from a character trigram index
+    - type-ahead completion, from a prefix trie
+    """
+    def __init__(self, stations):
+        """
+        Build the indexes for an iterable of station names.
+        """
+        self.names = sorted(stations)
+        self.exact = set(self.names)
+
+        # Casefolded name -> station; the first in sorted order wins a tie
+        self.folded = {}
+        for name in self.names:
+            self.folded.setdefault(name.casefold(), name)
+
+        # Trigram -> stations containing it
+        self.trigrams = {}
+        for name in self.names:
+            for trigram in self._trigrams(name):
+                self.trigrams.setdefault(trigram, []).append(name)
+
+        # Prefix trie over casefolded names; the '' key holds the names ending there
+        self.trie = {}
+        for name in self.names:
+            node = self.trie
+            for char in name.casefold():
+                node = node.setdefault(char, {})
+            node.setdefault('', []).append(name)
+
+    @staticmethod
+    def _trigrams(text):
+        """
+        Return the set of padded, casefolded character trigrams of a string.
+        """
+        padded = f"  {text.casefold()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def resolve(self, text):
+        """
+        Return the station matching text exactly or ignoring case, else None.
+        """
+        if text in self.exact:
+            return text
+        return self.folded.get(text.casefold())
+
+    def suggest(self, text, n=3, cutoff=0.6):
+        """
+        Return up to n close matches, best first.
+
+        Scores and ordering are those of difflib.get_close_matches; only
+        stations containing at least MIN_TRIGRAM_OVERLAP of the character
+        trigrams of text are scored. A typo spoils at most three trigrams,
+        so a misspelt name still shares most of its own, while a station
+        sharing one or two common trigrams by chance is skipped.
+        """
+        # Count the trigrams of text each station shares
+        trigrams = self._trigrams(text)
+        shared = {}
+        for trigram in trigrams:
+            for name in self.trigrams.get(trigram, ()):
+                shared[name] = shared.get(name, 0) + 1
+
+        # Score only the stations sharing enough of them
+        needed = max(1, ceil(MIN_TRIGRAM_OVERLAP * len(trigrams)))
+        candidates = [name for name, count in shared.items() if count >= needed]
+
+        # Same scoring and filtering as difflib.get_close_matches
+        matcher = SequenceMatcher()
+        matcher.set_seq2(text)
+        scored = []
+        for name in candidates:
+            matcher.set_seq1(name)
+            if (matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff
+                    and matcher.ratio() >= cutoff):
+                scored.append((matcher.ratio(), name))
+
+        return [name for _, name in heapq.nlargest(n, scored)]
+
+    def complete(self, prefix, limit=None):
+        """
+        Return the stations whose names start with prefix (ignoring case), sorted.
+        """
+        node = self.trie
+        for char in prefix.casefold():
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Collect every name stored below this node
+        matches = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == '':
+                    matches.extend(child)
+                else:
+                    stack.append(child)
+
+        matches.sort()
+        return matches if limit is None else matches[:limit]
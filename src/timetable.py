@@ -0,0 +1,188 @@
+# src/timetable.py
+
+import csv
+import zlib
+from array import array
+
+def parse_time(text):
+    """
+    Return minutes after midnight for 'HH:MM' or a whole number of minutes.
+
+    Hours past 23 are allowed for services running after midnight.
+    Raises ValueError for anything else.
+    """
+    text = text.strip()
+    if ':' in text:
+        hours, minutes = text.split(':')
+        if not hours.isdigit() or not minutes.isdigit() or int(minutes) > 59:
+            raise ValueError(f"Invalid time '{text}'")
+        return int(hours) * 60 + int(minutes)
+    if not text.isdigit():
+        raise ValueError(f"Invalid time '{text}'")
+    return int(text)
+
+
+def format_time(minutes):
+    """
+    Return minutes after midnight as 'HH:MM'.
+    """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class Timetable:
+    """
+    Timed train connections, packed for the Connection Scan Algorithm.
+
+    A connection is one train running non-stop between two stations:
+    it leaves one at a departure time and reaches the next at an
+    arrival time (minutes after midnight). Connections of the same train
+    share a trip. They are kept sorted by departure time in parallel
+    integer arrays, with stations and trips numbered, so a query is one
+    forward scan over plain arrays.
+    """
+    def __init__(self, connections, change_time=0):
+        """
+        Initialize from (from_station, to_station, departure, arrival, trip, cost) tuples.
+
+        change_time is the minimum number of minutes needed to change
+        trains at a station.
+        """
+        self.change_time = change_time
+
+        # Connections in departure order; ties by arrival keep each trip in order
+        connections = sorted(connections, key=lambda connection: (connection[2], connection[3]))
+
+        self.names = sorted({connection[0] for connection in connections}
+                            | {connection[1] for connection in connections})
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.trip_names = []
+        trip_index = {}
+
+        self.departures_from = array('i')
+        self.arrivals_at = array('i')
+        self.departure_times = array('i')
+        self.arrival_times = array('i')
+        self.trips = array('i')
+        self.costs = array('i')
+
+        for from_station, to_station, departure, arrival, trip, cost in connections:
+            if trip not in trip_index:
+                trip_index[trip] = len(self.trip_names)
+                self.trip_names.append(trip)
+
+            self.departures_from.append(self.index[from_station])
+            self.arrivals_at.append(self.index[to_station])
+            self.departure_times.append(departure)
+            self.arrival_times.append(arrival)
+            self.trips.append(trip_index[trip])
+            self.costs.append(cost)
+
+        # Connections grouped by trip, each group in departure order, and
+        # every connection's position within its trip
+        self.trip_connections = array('i', sorted(range(len(self.trips)), key=lambda c: self.trips[c]))
+        self.trip_starts = array('i', [0] * (len(self.trip_names) + 1))
+        for trip in self.trips:
+            self.trip_starts[trip + 1] += 1
+        for trip in range(len(self.trip_names)):
+            self.trip_starts[trip + 1] += self.trip_starts[trip]
+        self.trip_positions = array('i', [0] * len(self.trips))
+        for position, c in enumerate(self.trip_connections):
+            self.trip_positions[c] = position - self.trip_starts[self.trips[c]]
+
+    def __len__(self):
+        """
+        Return the number of connections.
+        """
+        return len(self.departure_times)
+
+    def station_exists(self, station):
+        """
+        Check if any connection serves a station.
+        """
+        return station in self.index
+
+    def trip_legs(self, trip):
+        """
+        Return the connection indices of a trip in departure order.
+        """
+        return self.trip_connections[self.trip_starts[trip]:self.trip_starts[trip + 1]]
+
+    @classmethod
+    def load_csv(cls, filename, change_time=0):
+        """
+        Load timed connections from a CSV file.
+
+        Each row should be: from_station, to_station, departure, arrival,
+        and optionally trip and cost. Times are 'HH:MM' or minutes after
+        midnight. Rows without a trip are trains of their own, and cost
+        defaults to 0. Invalid rows are skipped and counted.
+        """
+        connections = []
+        skipped = 0
+
+        with open(filename, 'r') as file:
+            for line_number, row in enumerate(csv.reader(file), 1):
+                if not row:
+                    continue
+
+                # Skip the header
+                if line_number == 1 and row[0].strip().lower() in ['from_station', 'station1', 'from']:
+                    continue
+
+                if len(row) not in [4, 5, 6]:
+                    skipped += 1
+                    continue
+
+                try:
+                    departure = parse_time(row[2])
+                    arrival = parse_time(row[3])
+                    cost = int(row[5]) if len(row) == 6 and row[5].strip() else 0
+                except ValueError:
+                    skipped += 1
+                    continue
+
+                from_station, to_station = row[0].strip(), row[1].strip()
+                if not from_station or not to_station or from_station == to_station or arrival < departure:
+                    skipped += 1
+                    continue
+
+                trip = row[4].strip() if len(row) >= 5 and row[4].strip() else f"row {line_number}"
+                connections.append((from_station, to_station, departure, arrival, trip, cost))
+
+        timetable = cls(connections, change_time)
+        print(f" Timetable loaded: {len(timetable.names)} stations, {len(timetable)} connections"
+              + (f" ({skipped} invalid rows skipped)" if skipped else ""))
+        return timetable
+
+    @classmethod
+    def from_network(cls, network, first='06:00', last='22:00', headway=30, change_time=0):
+        """
+        Synthesise a regular timetable from a network's connections, for benchmarks and tests.
+
+        Every connection gets a train in each direction every headway
+        minutes between first and last, taking the connection's time and
+        cost. Each connection's departures are offset by a fixed amount
+        derived from its station names, so changing trains involves some
+        waiting, as on a real clock-face timetable. The trains are made
+        up, so this must not be shown to users as a schedule.
+        """
+        first, last = parse_time(first), parse_time(last)
+        connections = []
+        trips = set()
+
+        for station in sorted(network.stations):
+            for neighbor, cost, time in network.get_neighbors(station):
+                offset = zlib.crc32(f"{station}|{neighbor}".encode()) % headway
+                for departure in range(first + offset, last + 1, headway):
+                    trip = f"{station} → {neighbor} {format_time(departure)}"
+
+                    # Parallel connections run separate trains
+                    number = 2
+                    while trip in trips:
+                        trip = f"{station} → {neighbor} {format_time(departure)} ({number})"
+                        number += 1
+                    trips.add(trip)
+
+                    connections.append((station, neighbor, departure, departure + time, trip, cost))
+
+        return cls(connections, change_time)
@@ -1,5 +1,6 @@
 # src/user_interface.py
-import difflib
+from src.station_resolver import StationResolver
+from src.timetable import format_time, parse_time
 
 
 class UserInterface:
@@ -7,12 +8,14 @@ class UserInterface:
     Handles user input, route selection, and output display.
     """
 
-    def __init__(self, network, searcher):
-        """Initialize with a railway network and route searcher."""
+    def __init__(self, network, searcher, resolver=None, router=None):
+        """Initialize with a railway network, route searcher, station resolver and optional timetable router."""
         self.network = network
         self.searcher = searcher
-        # Pre-process station list for quick case-insensitive lookups
-        self.all_stations = list(self.network.stations)
+        # Indexed station-name lookups, built once
+        self.resolver = resolver or StationResolver(self.network.stations)
+        # ConnectionScanRouter for departure-time searches, if a timetable is loaded
+        self.router = router
 
     def get_station_input(self, prompt):
         """Prompt user for a station name with fuzzy matching."""
@@ -23,23 +26,16 @@ class UserInterface:
                 print(" Station name cannot be empty!")
                 continue
 
-            # Exact match
-            if self.network.station_exists(station_input):
-                return station_input
-
-            # Case-insensitive match
-            for s in self.all_stations:
-                if s.lower() == station_input.lower():
-                    print(f" Assuming you meant: '{s}'")
-                    return s
+            # Exact or case-insensitive match
+            station = self.resolver.resolve(station_input)
+            if station == station_input:
+                return station
+            if station is not None:
+                print(f" Assuming you meant: '{station}'")
+                return station
 
             # Fuzzy matching suggestions
-            matches = difflib.get_close_matches(
-                station_input,
-                self.all_stations,
-                n=3,
-                cutoff=0.6
-            )
+            matches = self.resolver.suggest(station_input, n=3, cutoff=0.6)
 
             print(f" Station '{station_input}' not found in network.")
 
@@ -72,14 +68,30 @@ class UserInterface:
             print("\nOptimize for:")
             print("  1. Cheapest route (minimum cost)")
             print("  2. Fastest route (minimum time)")
-            choice = input("Enter choice (1 or 2): ").strip()
+            print("  3. All cost/time trade-offs")
+            if self.router is not None:
+                print("  4. Earliest arrival for a departure time (timetable)")
+            choices = "1, 2, 3 or 4" if self.router is not None else "1, 2 or 3"
+            choice = input(f"Enter choice ({choices}): ").strip()
 
             if choice == '1':
                 return 'cost'
             elif choice == '2':
                 return 'time'
+            elif choice == '3':
+                return 'pareto'
+            elif choice == '4' and self.router is not None:
+                return 'timetable'
             else:
-                print(" Invalid choice! Please enter 1 or 2.")
+                print(f" Invalid choice! Please enter {choices}.")
+
+    def get_departure_time(self):
+        """Ask user for a departure time as HH:MM."""
+        while True:
+            try:
+                return parse_time(input("Enter departure time (HH:MM): "))
+            except ValueError:
+                print(" Invalid time! Please enter a time such as 08:15.")
 
     def save_route_to_file(self, content):
         """Save route details to a file."""
@@ -120,6 +132,97 @@ class UserInterface:
 
         self.save_route_to_file(route_text)
 
+    def display_pareto_routes(self, routes, connections_explored):
+        """Display every route on the cost/time trade-off front."""
+        output = []
+
+        output.append("ROUTE OPTIONS FOUND\n".center(70))
+
+        output.append(f" {len(routes)} route(s) where no other is both cheaper and faster")
+
+        for number, (path, total_cost, total_time) in enumerate(routes, 1):
+            output.append(f"\nOption {number}: £{total_cost}, "
+                          f"{total_time} minutes ({total_time // 60}h {total_time % 60}m), "
+                          f"{len(path)} stations")
+            output.append(" " + " → ".join(path))
+
+        output.append(f"\n • Connections Explored: {connections_explored}")
+
+        route_text = "\n".join(output)
+        print(route_text)
+
+        self.save_route_to_file(route_text)
+
+    def display_journey(self, journey, connections_scanned):
+        """Display a timetabled journey leg by leg with its summary."""
+        output = []
+
+        output.append("JOURNEY FOUND\n".center(70))
+
+        output.append(f" Earliest Arrival: depart {format_time(journey.departure)}, "
+                      f"arrive {format_time(journey.arrival)}")
+
+        for number, leg in enumerate(journey.legs, 1):
+            output.append(f"\nLeg {number}: {leg.trip}")
+            output.append(f" {format_time(leg.departure)} {leg.stations[0]}")
+            if len(leg.stations) > 2:
+                output.append(f"       via {', '.join(leg.stations[1:-1])}")
+            output.append(f" {format_time(leg.arrival)} {leg.stations[-1]}")
+
+        total_time = journey.duration
+        output.append("\nJourney Summary:")
+        output.append(f" • Total Stations: {len(journey.path())}")
+        output.append(f" • Changes: {journey.changes}")
+        output.append(f" • Total Cost: £{journey.cost}")
+        output.append(f" • Total Time: {total_time} minutes ({total_time // 60}h {total_time % 60}m)")
+        output.append(f" • Connections Scanned: {connections_scanned}")
+
+        route_text = "\n".join(output)
+        print(route_text)
+
+        self.save_route_to_file(route_text)
+
+    def search_route(self, departure, destination, search_type):
+        """Search for the cheapest or fastest route and display it."""
+        print(f"\n Searching for {'cheapest' if search_type == 'cost' else 'fastest'} route...")
+
+        path, total_cost, total_time, connections_explored = self.searcher.find_route(
+            departure, destination, search_type, algorithm='astar'
+        )
+
+        if path is None:
+            print("\n No route found between these stations!")
+        else:
+            self.display_route(
+                path,
+                total_cost,
+                total_time,
+                search_type,
+                connections_explored
+            )
+
+    def search_pareto_routes(self, departure, destination):
+        """Search for every cost/time trade-off and display them."""
+        print("\n Searching for all cost/time trade-offs...")
+
+        routes, connections_explored = self.searcher.find_pareto_routes(departure, destination)
+
+        if not routes:
+            print("\n No route found between these stations!")
+        else:
+            self.display_pareto_routes(routes, connections_explored)
+
+    def search_timetable_route(self, departure, destination, departure_time):
+        """Search the timetable for the earliest arrival and display it."""
+        print(f"\n Searching for the earliest arrival leaving after {format_time(departure_time)}...")
+
+        journey, connections_scanned = self.router.earliest_arrival(departure, destination, departure_time)
+
+        if journey is None:
+            print("\n No journey found between these stations after that time!")
+        else:
+            self.display_journey(journey, connections_scanned)
+
     def run(self):
         """Main program loop for interacting with the user."""
         print("TRAIN TICKET SEARCH SYSTEM".center(70))
@@ -136,22 +239,12 @@ class UserInterface:
 
             search_type = self.get_search_type()
 
-            print(f"\n Searching for {'cheapest' if search_type == 'cost' else 'fastest'} route...")
-
-            path, total_cost, total_time, connections_explored = self.searcher.find_route(
-                departure, destination, search_type
-            )
-
-            if path is None:
-                print("\n No route found between these stations!")
+            if search_type == 'pareto':
+                self.search_pareto_routes(departure, destination)
+            elif search_type == 'timetable':
+                self.search_timetable_route(departure, destination, self.get_departure_time())
             else:
-                self.display_route(
-                    path,
-                    total_cost,
-                    total_time,
-                    search_type,
-                    connections_explored
-                )
+                self.search_route(departure, destination, search_type)
 
             again = input("\nSearch another route? (Y/N): ").strip().upper()
             if again != 'Y':